@@ -0,0 +1,188 @@
+# Scriptable autopilot policies for the player ship
+#
+# A policy is asked once per tick for a movement direction and an optional
+# UI action, given a read-only GameView. Set `simulation.policy` to let it
+# drive a Simulation in place of the keyboard and mouse.
+
+# Upgrade kinds and the UI actions that buy them
+UPGRADES = ("defense", "weapon", "speed", "fire_rate")
+UPGRADE_ACTIONS = {kind: f"upgrade_{kind}" for kind in UPGRADES}
+
+class GameView:
+    """Cheap read-only view of the game a policy decides from.
+
+    Values are read straight from the live game objects on access; only
+    the alien list is built, at most once per tick.
+    """
+
+    def __init__(self, simulation):
+        """Initialize a view over a simulation."""
+        self._simulation = simulation
+        self._aliens = None
+        self._aliens_tick = None
+
+    @property
+    def _game_state_manager(self):
+        return self._simulation.game_state_manager
+
+    @property
+    def tick(self):
+        return self._simulation.tick_count
+
+    @property
+    def state(self):
+        return self._game_state_manager.get_state()
+
+    @property
+    def screen_width(self):
+        return self._simulation.settings.screen_width
+
+    @property
+    def player_x(self):
+        return self._game_state_manager.player.centerx
+
+    @property
+    def player_speed(self):
+        """Pixels the ship moves per tick at its current speed level."""
+        player = self._game_state_manager.player
+        return self._simulation.settings.player_speed * (1 + (player.speed_level - 1) * 0.2)
+
+    @property
+    def gems(self):
+        return self._game_state_manager.resource_manager.gems
+
+    @property
+    def base_health(self):
+        return self._game_state_manager.base.health
+
+    @property
+    def base_max_health(self):
+        return self._game_state_manager.base.max_health
+
+    @property
+    def wave_number(self):
+        return self._game_state_manager.enemy_wave.wave_number
+
+    @property
+    def ticks_until_bottom(self):
+        """Ticks until the fleet reaches the base if no more aliens die, or None."""
+        return self._game_state_manager.enemy_wave.ticks_until_bottom()
+
+    def level(self, kind):
+        """Return the current level of an upgrade kind."""
+        game_state_manager = self._game_state_manager
+        if kind == "defense":
+            return game_state_manager.base.defense_level
+        if kind == "weapon":
+            return game_state_manager.player.weapon.level
+        if kind == "speed":
+            return game_state_manager.player.speed_level
+        if kind == "fire_rate":
+            return game_state_manager.player.fire_rate_level
+        raise ValueError(f"Unknown upgrade kind '{kind}'")
+
+    def upgrade_cost(self, kind):
+        """Return the gem cost of the next upgrade of a kind."""
+        return self._game_state_manager.resource_manager.get_upgrade_cost(self.level(kind))
+
+    @property
+    def aliens(self):
+        """Return (centerx, bottom, health) for every alien on screen this tick."""
+        if self._aliens_tick != self.tick:
+            enemy_wave = self._game_state_manager.enemy_wave
+            self._aliens = [(alien.rect.centerx, alien.rect.bottom, alien.health)
+                            for alien in enemy_wave.visible_aliens()]
+            self._aliens_tick = self.tick
+        return self._aliens
+
+class Policy:
+    """Base class for autopilot policies.
+
+    `act(view)` returns a (move, action) pair: move is -1 for left, 1 for
+    right or 0 to stand still, and action is a UI action or None.
+    """
+
+    def act(self, view):
+        """Decide this tick's movement and action."""
+        return 0, None
+
+class IdlePolicy(Policy):
+    """Stands still and never upgrades."""
+
+class TrackNearestColumnPolicy(Policy):
+    """Moves under the alien closest to the base.
+
+    Ties between aliens equally low are broken by horizontal distance, so
+    the ship clears the front of the fleet column by column.
+    """
+
+    def act(self, view):
+        aliens = view.aliens
+        if not aliens:
+            return 0, None
+        player_x = view.player_x
+        target_x = max(aliens, key=lambda alien: (alien[1], -abs(alien[0] - player_x)))[0]
+        offset = target_x - player_x
+        if abs(offset) <= view.player_speed:
+            return 0, None
+        return (1 if offset > 0 else -1), None
+
+class GreedyUpgradePolicy(Policy):
+    """Buys the cheapest affordable upgrade every `interval` ticks.
+
+    Only kinds in `priorities` below `max_level` are considered; ties in
+    cost go to the kind listed first.
+    """
+
+    def __init__(self, priorities=("weapon", "fire_rate", "defense", "speed"),
+                 max_level=8, interval=30):
+        """Initialize the policy."""
+        self.priorities = priorities
+        self.max_level = max_level
+        self.interval = interval
+
+    def act(self, view):
+        if view.tick % self.interval:
+            return 0, None
+        best = None
+        for kind in self.priorities:
+            if view.level(kind) >= self.max_level:
+                continue
+            cost = view.upgrade_cost(kind)
+            if cost <= view.gems and (best is None or cost < best[0]):
+                best = (cost, kind)
+        if best is None:
+            return 0, None
+        return 0, UPGRADE_ACTIONS[best[1]]
+
+class CompositePolicy(Policy):
+    """Combines policies: the first non-zero move and first action win."""
+
+    def __init__(self, *policies):
+        """Initialize the policy from its parts."""
+        self.policies = policies
+
+    def act(self, view):
+        move, action = 0, None
+        for policy in self.policies:
+            policy_move, policy_action = policy.act(view)
+            if not move:
+                move = policy_move
+            if action is None:
+                action = policy_action
+        return move, action
+
+# Built-in policies by name, for the command line and sweeps
+POLICIES = {
+    "idle": IdlePolicy,
+    "track": TrackNearestColumnPolicy,
+    "greedy": GreedyUpgradePolicy,
+    "track_greedy": lambda: CompositePolicy(TrackNearestColumnPolicy(), GreedyUpgradePolicy()),
+}
+
+def make_policy(name):
+    """Create a built-in policy by name."""
+    try:
+        return POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown policy '{name}'; choose from {', '.join(POLICIES)}") from None
@@ -1,12 +1,14 @@
 # Base defense mechanics
 import pygame
 
+from utils import get_screen_rect
+
 class Base:
     def __init__(self, settings, screen):
         """Initialize base attributes."""
         self.settings = settings
         self.screen = screen
-        self.screen_rect = screen.get_rect()
+        self.screen_rect = get_screen_rect(settings, screen)
         
         # Base attributes
         self.health = 100
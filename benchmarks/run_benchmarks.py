@@ -0,0 +1,293 @@
+# Scenario benchmark suite
+#
+# Runs scripted game scenarios under the SDL dummy video driver through the
+# same simulation, renderer and frame profiler calls as the game loop, reports
+# the mean milliseconds per tick for each phase and compares the results
+# against a stored JSON baseline. Exits with status 1 when any phase regresses
+# beyond the threshold.
+#
+#     python benchmarks/run_benchmarks.py
+#     python benchmarks/run_benchmarks.py --update-baseline
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from settings import Settings
+from simulation import Simulation
+from ui import UI
+from input_handler import InputHandler
+from renderer import Renderer, DirtyRectRenderer
+from profiling import FrameProfiler
+from timestep import Interpolator
+from visual_effects import Starfield
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+PHASES = ("input", "update", "collisions", "render", "ui")
+
+class Scenario:
+    """A named game setup to benchmark.
+
+    configure(settings) adjusts settings before the game is created,
+    prepare(simulation) sets up the started game and each_tick(simulation)
+    runs untimed before every measured tick.
+    """
+
+    def __init__(self, name, configure=None, prepare=None, each_tick=None):
+        """Initialize the scenario."""
+        self.name = name
+        self.configure = configure
+        self.prepare = prepare
+        self.each_tick = each_tick
+
+class _Emitter:
+    """Stands in for the player when firing beams from arbitrary positions."""
+
+    def __init__(self, player):
+        self.rect = player.rect.copy()
+        self.weapon = player.weapon
+
+def advance_to_wave(simulation, wave_number):
+    """Replace the current fleet with the fleet for `wave_number`."""
+    enemy_wave = simulation.game_state_manager.enemy_wave
+    while enemy_wave.wave_number < wave_number:
+        enemy_wave.aliens.empty()
+        enemy_wave.spawn_enemies()
+
+def pack_fleet(simulation, count, spacing=20):
+    """Replace the current fleet with `count` tightly packed aliens."""
+    enemy_wave = simulation.game_state_manager.enemy_wave
+    columns = (simulation.settings.screen_width - 80) // spacing
+    health = simulation.settings.enemy_health
+    enemy_wave.set_formation([(40 + spacing * (index % columns),
+                               40 + (spacing * 4 // 5) * (index // columns), health)
+                              for index in range(count)])
+
+def endless_fleet(simulation, count):
+    """Replace the current fleet with an endless-mode fleet of about `count` aliens."""
+    enemy_wave = simulation.game_state_manager.enemy_wave
+    enemy_wave.aliens.empty()
+    enemy_wave.max_rows = 1
+    enemy_wave.create_fleet()
+    enemy_wave.max_rows = -(-count // len(enemy_wave.aliens))
+    enemy_wave.aliens.empty()
+    enemy_wave.create_fleet()
+
+def top_up_beams(simulation, target=1000):
+    """Keep about `target` beams in flight, spread across the screen."""
+    game_state_manager = simulation.game_state_manager
+    emitter = _Emitter(game_state_manager.player)
+    missing = target - len(game_state_manager.beams)
+    # Beams live for roughly screen height / speed ticks
+    per_tick = max(1, target * simulation.settings.player_beam_speed
+                   // simulation.settings.screen_height + 1)
+    for _ in range(min(missing, per_tick)):
+        emitter.rect.centerx = random.randrange(simulation.settings.screen_width)
+        game_state_manager.beam_pool.fire(emitter)
+
+def max_upgrades(simulation):
+    """Max out the player's weapon and fire rate."""
+    player = simulation.game_state_manager.player
+    for _ in range(3):
+        player.weapon.upgrade()
+    player.fire_rate_level = 20
+    player.speed_level = 5
+
+def sweep_player(simulation):
+    """Move the player back and forth across the screen."""
+    player = simulation.game_state_manager.player
+    if player.rect.right >= player.screen_rect.right:
+        player.moving_right, player.moving_left = False, True
+    elif player.rect.left <= 0 or not (player.moving_left or player.moving_right):
+        player.moving_right, player.moving_left = True, False
+
+def particle_storm(simulation):
+    """Emit several explosions every tick."""
+    particles = simulation.game_state_manager.particles
+    for _ in range(8):
+        particles.emit_explosion(random.randrange(simulation.settings.screen_width),
+                                 random.randrange(simulation.settings.screen_height))
+
+def _configure(**overrides):
+    def configure(settings):
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+    return configure
+
+SCENARIOS = [
+    Scenario("wave_1"),
+    Scenario("wave_5", prepare=lambda simulation: advance_to_wave(simulation, 5)),
+    Scenario("aliens_2000", prepare=lambda simulation: pack_fleet(simulation, 2000)),
+    Scenario("aliens_2000_numpy", configure=_configure(fleet_backend="numpy"),
+             prepare=lambda simulation: pack_fleet(simulation, 2000)),
+    Scenario("wave_5_dirty_rects", configure=_configure(dirty_rect_rendering=True),
+             prepare=lambda simulation: advance_to_wave(simulation, 5)),
+    Scenario("endless_20000", configure=_configure(endless_mode=True),
+             prepare=lambda simulation: endless_fleet(simulation, 20000)),
+    Scenario("beams_1000", configure=_configure(beam_pool_size=1024),
+             each_tick=top_up_beams),
+    Scenario("max_fire_rate", prepare=max_upgrades, each_tick=sweep_player),
+    Scenario("particle_storm", configure=_configure(particle_budget=5000),
+             each_tick=particle_storm),
+]
+
+def run_scenario(scenario, ticks, screen):
+    """Run one scenario and return the mean ms per tick for each phase.
+
+    Each tick is one frame of the game loop: input, one simulation step,
+    the starfield and the renderer chosen by the settings, timed by a
+    FrameProfiler wired up the way the game wires it.
+    """
+    random.seed(0)
+    settings = Settings()
+    if scenario.configure:
+        scenario.configure(settings)
+    simulation = Simulation(settings, screen, seed=0)
+    game_state_manager = simulation.game_state_manager
+    ui = UI(settings, screen)
+    renderer = DirtyRectRenderer() if settings.dirty_rect_rendering else Renderer()
+    input_handler = InputHandler()
+    starfield = Starfield(settings, seed=0)
+    interpolator = Interpolator(game_state_manager) if settings.interpolate_rendering else None
+
+    simulation.step("start_game")
+    if scenario.prepare:
+        scenario.prepare(simulation)
+
+    profiler = FrameProfiler(ticks)
+    simulation.profiler = profiler
+    for _ in range(ticks):
+        if scenario.each_tick:
+            scenario.each_tick(simulation)
+
+        profiler.begin_frame()
+        action = input_handler.handle_events(game_state_manager.player, ui)
+        profiler.lap("input")
+
+        if interpolator is not None:
+            interpolator.capture()
+        simulation.step(action)
+        if game_state_manager.get_state() == "playing":
+            starfield.update()
+
+        if interpolator is not None:
+            # Draw halfway between the last two ticks
+            interpolator.apply(0.5)
+        renderer.update_screen(
+            settings, screen, game_state_manager.player, game_state_manager.base,
+            game_state_manager.enemy_wave, game_state_manager.beams, ui,
+            game_state_manager.get_state(), game_state_manager.resource_manager,
+            game_state_manager, starfield, profiler)
+        if interpolator is not None:
+            interpolator.restore()
+        profiler.end_frame()
+
+    summary = profiler.summary()
+    results = {phase: summary.get(phase, 0.0) for phase in PHASES}
+    results["total"] = sum(results[phase] for phase in PHASES)
+    return {phase: round(ms, 4) for phase, ms in results.items()}
+
+def run_benchmarks(ticks=300, names=None, repeat=1, statistic=min):
+    """Run the selected scenarios and return results keyed by scenario name.
+
+    With `repeat` above one the whole selection runs that many times and
+    `statistic` reduces each phase's runs to one value. Rounds are
+    interleaved so a slow spell on the machine cannot cover every run of
+    one scenario.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    settings = Settings()
+    screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+    scenarios = [scenario for scenario in SCENARIOS if not names or scenario.name in names]
+    runs = {scenario.name: [] for scenario in scenarios}
+    for _ in range(max(repeat, 1)):
+        for scenario in scenarios:
+            runs[scenario.name].append(run_scenario(scenario, ticks, screen))
+    return {name: {phase: round(statistic([run[phase] for run in scenario_runs]), 4)
+                   for phase in scenario_runs[0]}
+            for name, scenario_runs in runs.items()}
+
+def compare_to_baseline(results, baseline, threshold=0.25, min_delta_ms=0.05):
+    """Return a description of every phase slower than the baseline allows.
+
+    A phase regresses when it is more than `threshold` (a fraction) slower
+    than its baseline and the absolute difference exceeds `min_delta_ms`,
+    which keeps sub-microsecond phases from failing on timer noise.
+    """
+    regressions = []
+    for name, phases in results.items():
+        for phase, ms in phases.items():
+            expected = baseline.get(name, {}).get(phase)
+            if expected is None:
+                continue
+            if ms > expected * (1 + threshold) and ms - expected > min_delta_ms:
+                regressions.append(
+                    f"{name}/{phase}: {ms:.3f} ms vs baseline {expected:.3f} ms")
+    return regressions
+
+def print_results(results):
+    """Print a table of ms per tick per phase."""
+    header = f"{'scenario':<20}" + "".join(f"{phase:>12}" for phase in PHASES + ("total",))
+    print(header)
+    for name, phases in results.items():
+        print(f"{name:<20}" + "".join(f"{phases[phase]:>12.3f}" for phase in PHASES + ("total",)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scenario benchmark suite")
+    parser.add_argument("--ticks", type=int, default=300, help="ticks per scenario")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per scenario; checks use each phase's fastest run "
+                             "and baselines its median run")
+    parser.add_argument("--scenario", action="append", dest="scenarios",
+                        help="run only this scenario (repeatable)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    # A phase only regresses when even its fastest run is slower than a
+    # typical baseline run allows
+    statistic = statistics.median if args.update_baseline else min
+    results = run_benchmarks(args.ticks, args.scenarios, args.repeat, statistic)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; run with --update-baseline to create one.")
+        return 0
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if regressions:
+        print("Performance regressions:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# Offscreen frame capture with background encoding and golden-image diffs
+#
+# Plays a game under the SDL dummy video driver, draws chosen ticks with the
+# regular Renderer and hands each frame to a worker thread, which writes PNG
+# files or a raw frame dump and compares frames against golden images.
+#
+#     python capture.py --ticks 1200 --every 120 --output frames
+#     python capture.py --ticks 300 --every 150 --golden tests/golden
+#     python capture.py --ticks 300 --every 150 --golden tests/golden --update-golden
+import argparse
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from settings import Settings
+from simulation import Simulation
+from autopilot import make_policy
+from renderer import Renderer
+from ui import UI
+from visual_effects import Starfield
+
+# Header of each frame in a raw dump: magic, width, height
+RAW_FRAME = struct.Struct("<4sII")
+RAW_MAGIC = b"AIFR"
+
+def frame_to_array(data, size, pitch, shifts):
+    """Turn a copied 32-bit surface buffer into an (height, width, 3) RGB array."""
+    width, height = size
+    pixels = np.frombuffer(data, dtype=np.uint32).reshape(height, pitch // 4)[:, :width]
+    rgb = np.empty((height, width, 3), dtype=np.uint8)
+    for channel, shift in enumerate(shifts[:3]):
+        rgb[:, :, channel] = pixels >> shift
+    return rgb
+
+def surface_to_array(surface):
+    """Return a surface's pixels as an (height, width, 3) RGB array."""
+    return pygame.surfarray.array3d(surface).swapaxes(0, 1)
+
+def array_to_surface(rgb):
+    """Return a surface holding an (height, width, 3) RGB array."""
+    height, width, _ = rgb.shape
+    return pygame.image.frombuffer(np.ascontiguousarray(rgb).tobytes(), (width, height), "RGB")
+
+def diff_images(actual, expected, tolerance=8):
+    """Compare two RGB arrays pixel by pixel.
+
+    A pixel mismatches when any channel differs by more than `tolerance`,
+    which absorbs small differences in font anti-aliasing and blending.
+    Returns the mismatch mask (None if the sizes differ) and the largest
+    channel difference.
+    """
+    if actual.shape != expected.shape:
+        return None, 255
+    difference = np.abs(actual.astype(np.int16) - expected.astype(np.int16)).max(axis=2)
+    return difference > tolerance, int(difference.max())
+
+def read_raw_frames(path):
+    """Return every frame in a raw dump as an (height, width, 3) RGB array."""
+    with open(path, "rb") as raw_file:
+        data = raw_file.read()
+    frames = []
+    offset = 0
+    while offset < len(data):
+        magic, width, height = RAW_FRAME.unpack_from(data, offset)
+        if magic != RAW_MAGIC:
+            raise ValueError("Not a raw frame dump")
+        offset += RAW_FRAME.size
+        end = offset + width * height * 3
+        frames.append(np.frombuffer(data[offset:end], dtype=np.uint8).reshape(height, width, 3))
+        offset = end
+    return frames
+
+class FrameCapture:
+    """Copies frames off the game thread and encodes them on a worker thread.
+
+    `submit()` copies the surface's pixel buffer, which is a single memory
+    copy, and queues it; it never waits for the worker. When `queue_size`
+    frames are already waiting the new frame is dropped and counted. The
+    worker converts each frame to RGB, writes it as `<name>.png` or appends
+    it to `frames.raw`, and diffs it against `<name>.png` in `golden_dir`
+    (or replaces the golden when `update_golden` is set). A frame that
+    raises, say on an unreadable golden or a full disk, is recorded in
+    `errors` and as a failed diff; the worker goes on with the next one.
+    """
+
+    FORMATS = ("png", "raw")
+    CLOSE_TIMEOUT = 30.0  # Seconds close() waits for the worker
+
+    def __init__(self, output_dir=None, format="png", golden_dir=None, update_golden=False,
+                 tolerance=8, max_mismatch=0.001, queue_size=8):
+        """Start the worker thread."""
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown capture format '{format}'; choose from {', '.join(self.FORMATS)}")
+        self.output_dir = output_dir
+        self.format = format
+        self.golden_dir = golden_dir
+        self.update_golden = update_golden
+        self.tolerance = tolerance
+        self.max_mismatch = max_mismatch  # Fraction of pixels allowed to mismatch
+        for directory in (output_dir, golden_dir if update_golden else None):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+        self.submitted = 0
+        self.dropped = 0  # Frames refused because the worker was behind
+        self.written = 0
+        self.diffs = []  # One result dict per frame compared with a golden
+        self.errors = []  # Frames the worker failed to write or compare
+        self.capture_ms_total = 0.0
+        self.capture_ms_max = 0.0
+
+        self._raw_file = None
+        if output_dir and format == "raw":
+            self._raw_file = open(os.path.join(output_dir, "frames.raw"), "wb")
+        self._queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name="frame-capture", daemon=True)
+        self._thread.start()
+
+    def submit(self, surface, name):
+        """Queue a copy of the surface as frame `name`; return False if dropped."""
+        start = time.perf_counter()
+        if self._queue.full():
+            self.dropped += 1
+            return False
+        if surface.get_bitsize() == 32:
+            frame = (name, surface.get_size(), surface.get_pitch(), surface.get_shifts(),
+                     surface.get_buffer().raw)
+        else:
+            frame = (name, surface_to_array(surface))
+        self._queue.put_nowait(frame)
+        self.submitted += 1
+
+        elapsed = (time.perf_counter() - start) * 1000
+        self.capture_ms_total += elapsed
+        self.capture_ms_max = max(self.capture_ms_max, elapsed)
+        return True
+
+    def _run(self):
+        """Worker thread: convert, write and compare queued frames."""
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            name = frame[0]
+            diffs = len(self.diffs)
+            try:
+                if len(frame) == 2:
+                    rgb = frame[1]
+                else:
+                    _, size, pitch, shifts, data = frame
+                    rgb = frame_to_array(data, size, pitch, shifts)
+                self._write(name, rgb)
+                if self.golden_dir:
+                    self._compare(name, rgb)
+            except Exception as error:
+                self.errors.append({"frame": name, "error": repr(error)})
+                if self.golden_dir and not self.update_golden and len(self.diffs) == diffs:
+                    self.diffs.append({"frame": name, "passed": False, "error": repr(error)})
+
+    def _write(self, name, rgb):
+        """Write a frame in the output format."""
+        if not self.output_dir:
+            return
+        if self._raw_file is not None:
+            height, width, _ = rgb.shape
+            self._raw_file.write(RAW_FRAME.pack(RAW_MAGIC, width, height))
+            self._raw_file.write(rgb.tobytes())
+        else:
+            pygame.image.save(array_to_surface(rgb), os.path.join(self.output_dir, f"{name}.png"))
+        self.written += 1
+
+    def _compare(self, name, rgb):
+        """Diff a frame against its golden image, or store it as the golden."""
+        golden_path = os.path.join(self.golden_dir, f"{name}.png")
+        if self.update_golden:
+            pygame.image.save(array_to_surface(rgb), golden_path)
+            return
+        if not os.path.exists(golden_path):
+            self.diffs.append({"frame": name, "passed": False, "missing": True})
+            return
+        expected = surface_to_array(pygame.image.load(golden_path))
+        mask, max_difference = diff_images(rgb, expected, self.tolerance)
+        pixels = rgb.shape[0] * rgb.shape[1]
+        mismatched = pixels if mask is None else int(mask.sum())
+        fraction = mismatched / pixels
+        passed = fraction <= self.max_mismatch
+        self.diffs.append({"frame": name, "passed": passed, "mismatched": mismatched,
+                           "fraction": round(fraction, 6), "max_difference": max_difference})
+        if not passed and mask is not None and self.output_dir:
+            # Mismatched pixels in red over a dimmed copy of the frame
+            highlighted = rgb // 3
+            highlighted[mask] = (255, 0, 0)
+            pygame.image.save(array_to_surface(highlighted),
+                              os.path.join(self.output_dir, f"{name}.diff.png"))
+
+    @property
+    def failures(self):
+        """Return the golden comparisons that failed."""
+        return [diff for diff in self.diffs if not diff["passed"]]
+
+    def stats(self):
+        """Return frame counters and the capture cost on the submitting thread."""
+        return {
+            "submitted": self.submitted,
+            "written": self.written,
+            "dropped": self.dropped,
+            "errors": len(self.errors),
+            "capture_ms_mean": round(self.capture_ms_total / max(self.submitted, 1), 3),
+            "capture_ms_max": round(self.capture_ms_max, 3),
+        }
+
+    def close(self):
+        """Finish the queued frames and stop the worker."""
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=self.CLOSE_TIMEOUT)  # Waits for room
+            except queue.Full:
+                pass
+            self._thread.join(self.CLOSE_TIMEOUT)
+        if self._raw_file is not None:
+            self._raw_file.close()
+
+def run_capture(ticks, output_dir=None, every=60, format="png", golden_dir=None,
+                update_golden=False, seed=0, policy_name="track_greedy", settings=None):
+    """Play a seeded game offscreen and capture every `every`-th tick.
+
+    The menu is captured before the game starts and the game-over screen if
+    the game ends. Frames are named `<state>_<tick>`. Returns the capture
+    stats, the golden diffs and the time spent drawing and capturing.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    settings = settings or Settings()
+    screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+    simulation = Simulation(settings, screen, seed=seed)
+    if policy_name:
+        simulation.policy = make_policy(policy_name)
+    game_state_manager = simulation.game_state_manager
+    ui = UI(simulation.settings, screen)
+    starfield = Starfield(simulation.settings, seed=seed)
+    capture = FrameCapture(output_dir, format, golden_dir, update_golden)
+    draw_ms = 0.0
+
+    def draw_and_capture():
+        nonlocal draw_ms
+        state = game_state_manager.get_state()
+        ui.victory = game_state_manager.victory
+        start = time.perf_counter()
+        Renderer.update_screen(
+            simulation.settings, screen, game_state_manager.player, game_state_manager.base,
+            game_state_manager.enemy_wave, game_state_manager.beams, ui, state,
+            game_state_manager.resource_manager, game_state_manager, starfield)
+        draw_ms += (time.perf_counter() - start) * 1000
+        capture.submit(screen, f"{state}_{simulation.tick_count:06d}")
+
+    draw_and_capture()
+    simulation.step("start_game")
+    while simulation.tick_count < ticks:
+        simulation.step()
+        if game_state_manager.get_state() != "playing":
+            draw_and_capture()
+            break
+        starfield.update()
+        if simulation.tick_count % every == 0:
+            draw_and_capture()
+    capture.close()
+
+    summary = capture.stats()
+    summary["draw_ms_mean"] = round(draw_ms / max(capture.submitted + capture.dropped, 1), 3)
+    summary["diffs"] = capture.diffs
+    summary["failures"] = len(capture.failures)
+    # Frames that should have been compared but have no diff
+    compared = capture.submitted + capture.dropped if golden_dir and not update_golden else 0
+    summary["uncompared"] = max(compared - len(capture.diffs), 0)
+    return summary
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Capture offscreen frames of a seeded game")
+    parser.add_argument("--ticks", type=int, default=1200, help="ticks to play")
+    parser.add_argument("--every", type=int, default=60, help="ticks between captured frames")
+    parser.add_argument("--output", metavar="DIR", default=None, help="directory to write frames to")
+    parser.add_argument("--format", choices=FrameCapture.FORMATS, default="png",
+                        help="PNG files or one raw RGB frame dump")
+    parser.add_argument("--golden", metavar="DIR", default=None,
+                        help="compare frames against golden images in DIR")
+    parser.add_argument("--update-golden", action="store_true",
+                        help="write the frames to the golden directory instead of comparing")
+    parser.add_argument("--seed", type=int, default=0, help="game seed")
+    parser.add_argument("--policy", default="track_greedy", help="autopilot policy that plays")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    summary = run_capture(args.ticks, args.output, args.every, args.format, args.golden,
+                          args.update_golden, args.seed, args.policy)
+    print(json.dumps(summary))
+    return 1 if summary["failures"] or summary["uncompared"] or summary["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
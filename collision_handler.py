@@ -5,29 +5,53 @@ class CollisionHandler:
     """Handles collision detection and resolution in the game."""
     
     @staticmethod
-    def check_beam_alien_collisions(beams, aliens, resource_manager):
-        """Check for collisions between beams and aliens."""
-        # Check for any beams that have hit aliens
-        # If so, get rid of the beam and the alien
-        collisions = pygame.sprite.groupcollide(beams, aliens, True, True)
-        
-        # Award points for destroyed aliens
-        if collisions:
-            for aliens_hit in collisions.values():
-                for _ in aliens_hit:  # No need to check health since we're destroying them immediately
-                    # Award gems through resource manager
-                    resource_manager.earn_resources(50)  # Award gems for destroying an alien
-                        
-        return collisions
+    def check_beam_alien_collisions(beams, aliens, resource_manager, spatial_hash=None):
+        """Resolve this tick's beam hits on aliens and return the destroyed aliens.
+
+        Every beam that touches an alien is used up and deals its damage to
+        each alien it touches. Damage is summed per alien first, so each
+        alien takes one hit however many beams reached it, and only aliens
+        left with no health are killed. Their reward is credited in a single
+        earn_resources() call. When a SpatialHash is given it is used as a
+        broadphase; otherwise every beam is tested against every alien with
+        groupcollide.
+        """
+        # Beams are used up on contact; aliens survive until their damage is applied
+        if spatial_hash is not None:
+            collisions = spatial_hash.groupcollide(beams, aliens, True, False)
+        else:
+            collisions = pygame.sprite.groupcollide(beams, aliens, True, False)
+        if not collisions:
+            return []
+
+        # Sum the damage each alien took this tick
+        damage = {}
+        for beam, aliens_hit in collisions.items():
+            for alien in aliens_hit:
+                damage[alien] = damage.get(alien, 0) + beam.damage
+
+        destroyed = [alien for alien, amount in damage.items() if alien.take_damage(amount)]
+        for alien in destroyed:
+            alien.kill()
+        if destroyed:
+            resource_manager.earn_resources(
+                resource_manager.settings.enemy_points * len(destroyed))
+        return destroyed
 
     @staticmethod
-    def check_aliens_bottom(screen, aliens, base):
-        """Check if any aliens have reached the bottom of the screen."""
-        screen_rect = screen.get_rect()
-        for alien in aliens.sprites():
-            if alien.rect.bottom >= screen_rect.bottom:
-                # Alien reached the bottom, damage the base
-                base.take_damage(10)
-                alien.kill()
-                return True
-        return False 
\ No newline at end of file
+    def check_aliens_bottom(screen, enemy_wave, base):
+        """Check if any aliens have reached the bottom of the screen.
+
+        Every alien that landed this tick damages the base in one batch and
+        is removed. Without a screen surface the base's screen bounds are
+        used.
+        """
+        screen_rect = screen.get_rect() if screen is not None else base.screen_rect
+        landed = enemy_wave.landed_aliens(screen_rect.bottom)
+        if not landed:
+            return False
+        # Aliens reached the bottom, damage the base
+        base.take_damage(10 * len(landed))
+        for alien in landed:
+            alien.kill()
+        return True 
\ No newline at end of file
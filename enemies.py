@@ -1,8 +1,14 @@
 # Enemy wave logic
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+
 import pygame
 import random
 from pygame.sprite import Sprite
 
+from utils import get_screen_rect, round_half_away
+from textures import get_texture
+
 class Alien(Sprite):
     """A class to represent a single alien in the fleet."""
     
@@ -12,18 +18,19 @@ class Alien(Sprite):
         self.screen = screen
         self.settings = settings
         
-        # Load the alien image and set its rect attribute
-        self.image = pygame.Surface((40, 40))
-        self.image.fill((255, 0, 0))  # Red alien (placeholder)
+        # Use the shared alien image and set its rect attribute
+        self.image = get_texture("alien")
         self.rect = self.image.get_rect()
         
         # Start each new alien near the top left of the screen
         self.rect.x = self.rect.width
         self.rect.y = self.rect.height
         
-        # Store the alien's exact position
+        # Store the alien's exact position and its place in the fleet formation
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        self.home_x = self.rect.x
+        self.home_y = self.rect.y
         
         # Health points
         self.health = settings.enemy_health
@@ -34,7 +41,7 @@ class Alien(Sprite):
         
     def check_edges(self):
         """Return True if alien is at edge of screen."""
-        screen_rect = self.screen.get_rect()
+        screen_rect = get_screen_rect(self.settings, self.screen)
         if self.rect.right >= screen_rect.right:
             return True
         elif self.rect.left <= 0:
@@ -51,13 +58,67 @@ class Alien(Sprite):
         self.health -= damage
         return self.health <= 0  # Return True if alien is destroyed
 
+class FleetGroup(pygame.sprite.Group):
+    """Sprite group that tells its wave whenever an alien joins or leaves it."""
+    
+    def __init__(self, wave):
+        """Initialize an empty group for a wave."""
+        super().__init__()
+        self.wave = wave
+        
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.wave._track(sprite)
+        
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.wave._untrack(sprite)
+        
+    def __len__(self):
+        # pygame counts a copy of the sprite list; large fleets are tested every tick
+        return len(self.spritedict)
+        
+    def __bool__(self):
+        return bool(self.spritedict)
+
+class AlienList(list):
+    """Aliens picked out of a fleet, usable where a sprite group is expected.
+
+    `sprites()` leaves out aliens killed since the list was made, as a
+    group would.
+    """
+
+    def sprites(self):
+        return [alien for alien in self if alien.alive()]
+
 class EnemyWave:
+    """A fleet of aliens that moves as one rigid formation.
+
+    Each alien keeps its place in the formation (home_x, home_y) and the
+    whole fleet is displaced by an offset derived from three counters: the
+    net number of sideways steps, the number of down steps and the number
+    of edge bounces. Because the offset is exact at any tick, advance() can
+    move the fleet many ticks ahead at once and ticks_until_bottom() can
+    predict when it reaches the base. Alien rects follow the offset lazily
+    in sync_rects().
+
+    The formation's bounding box is kept up to date as aliens join or die,
+    from counts of aliens per left edge, right edge and bottom edge, so edge
+    and bottom checks do not scan the fleet.
+
+    Aliens are also indexed by formation row. `viewport` is the part of the
+    world shown on screen; rows outside it are culled, so visible_aliens()
+    only syncs and returns the rows in view. In endless mode the fleet can
+    reach far above the screen and only the rows near it cost anything.
+    """
+
     def __init__(self, settings, screen):
         """Initialize the enemy wave."""
         self.settings = settings
         self.screen = screen
-        self.aliens = pygame.sprite.Group()
+        self.aliens = FleetGroup(self)
         self.wave_number = 0
+        self.enemy_speed = settings.enemy_speed  # Grows each wave; settings stay untouched
         self.fleet_direction = 1  # 1 represents right; -1 represents left
         self.max_rows = 1  # Start with only one row of aliens
         
@@ -67,25 +128,69 @@ class EnemyWave:
         self.sideways_steps = 20  # Number of steps to move sideways before changing direction
         self.down_steps = 5  # Number of steps to move down before moving sideways again
         
+        # Formation offset counters
+        self.net_steps = 0  # Sideways steps to the right minus steps to the left
+        self.down_moves = 0  # Ticks spent moving down
+        self.bounces = 0  # Edge contacts, each dropping the fleet
+        self.down_dy = round_half_away(settings.enemy_drop_speed / 10)  # Slower vertical movement
+        self.bounce_dy = round_half_away(settings.enemy_drop_speed)
+        self._synced_offset = (0, 0)  # Rect offset the aliens were last moved to
+        self._row_offsets = {}  # Rows synced since, by home_y, and their offsets
+        
+        # Living aliens per formation row, and the rows' home_y in order
+        self._rows = {}
+        self._row_keys = []
+        self._row_height = 0
+        self.viewport = get_screen_rect(settings, screen)
+        
+        # Living aliens per formation edge, and the bounding box they give
+        self._lefts = Counter()
+        self._rights = Counter()
+        self._bottoms = Counter()
+        self._bounds = None  # (left, right, bottom), or None to recompute
+        
+    @property
+    def offset_x(self):
+        """Exact horizontal displacement of the formation."""
+        return self.net_steps * self.enemy_speed
+        
+    @property
+    def offset_y(self):
+        """Vertical displacement of the formation in whole pixels."""
+        return self.down_moves * self.down_dy + self.bounces * self.bounce_dy
+        
+    def rect_offset(self):
+        """Return the (x, y) pixel offset added to every alien's home position."""
+        return round_half_away(self.offset_x), self.offset_y
+        
     def create_fleet(self):
         """Create a full fleet of aliens."""
-        # Create an alien and find the number of aliens in a row
-        alien = Alien(self.settings, self.screen)
-        alien_width = alien.rect.width
+        # A new formation starts at its home position
+        self.net_steps = 0
+        self.down_moves = 0
+        self.bounces = 0
+        self._synced_offset = (0, 0)
+        self._row_offsets.clear()
+        
+        # Find the number of aliens in a row from the alien image size
+        alien_width, alien_height = get_texture("alien").get_size()
         available_space_x = self.settings.screen_width - (2 * alien_width)
         number_aliens_x = available_space_x // (2 * alien_width)
         
         # Determine the number of rows of aliens that fit on the screen
-        alien_height = alien.rect.height
         available_space_y = (self.settings.screen_height - 
                             (3 * alien_height))
         max_possible_rows = available_space_y // (2 * alien_height)
         
-        # Limit the number of rows based on the current wave
+        # Limit the number of rows based on the current wave; in endless
+        # mode the rows that do not fit are stacked above the screen
         number_rows = min(self.max_rows, max_possible_rows)
+        first_row = 0
+        if self.settings.endless_mode:
+            first_row = number_rows - self.max_rows
         
         # Create the fleet of aliens
-        for row_number in range(number_rows):
+        for row_number in range(first_row, number_rows):
             for alien_number in range(number_aliens_x):
                 self._create_alien(alien_number, row_number)
                 
@@ -93,24 +198,167 @@ class EnemyWave:
         """Create an alien and place it in the row."""
         alien = Alien(self.settings, self.screen)
         alien_width = alien.rect.width
-        alien.x = alien_width + 2 * alien_width * alien_number
-        alien.rect.x = alien.x
-        alien.rect.y = alien.rect.height + 2 * alien.rect.height * row_number
+        alien_height = alien.rect.height
+        self._place(alien, alien_width + 2 * alien_width * alien_number,
+                    alien_height + 2 * alien_height * row_number)
         # Adjust alien health based on wave number
         alien.health = self.settings.enemy_health * (1 + (self.wave_number - 1) * 0.2)
         self.aliens.add(alien)
         
+    def formation(self):
+        """Return (home_x, home_y, health) of every living alien, in fleet order."""
+        return [(alien.home_x, alien.home_y, alien.health) for alien in self.aliens.sprites()]
+        
+    def set_formation(self, formation):
+        """Replace the fleet with aliens at (home_x, home_y, health) places.
+
+        Aliens are placed at the current formation offset, so the movement
+        counters should be set first.
+        """
+        self.aliens.empty()
+        for home_x, home_y, health in formation:
+            alien = Alien(self.settings, self.screen)
+            self._place(alien, home_x, home_y)
+            alien.health = health
+            self.aliens.add(alien)
+        self._synced_offset = self.rect_offset()
+        self._row_offsets.clear()
+        
+    def _place(self, alien, home_x, home_y):
+        """Give an alien its formation position and move it there."""
+        tracked = self.aliens.has(alien)
+        if tracked:
+            self._untrack(alien)
+        alien.home_x = home_x
+        alien.home_y = home_y
+        if tracked:
+            self._track(alien)
+        alien.x = home_x + self.offset_x
+        dx, dy = self.rect_offset()
+        alien.rect.x = home_x + dx
+        alien.rect.y = home_y + dy
+        
+    def _track(self, alien):
+        """Count a living alien's edges in the formation bounding box."""
+        left = alien.home_x
+        right = left + alien.rect.width
+        bottom = alien.home_y + alien.rect.height
+        self._lefts[left] += 1
+        self._rights[right] += 1
+        self._bottoms[bottom] += 1
+        row = self._rows.get(alien.home_y)
+        if row is None:
+            row = self._rows[alien.home_y] = {}
+            insort(self._row_keys, alien.home_y)
+        row[alien] = None
+        self._row_height = max(self._row_height, alien.rect.height)
+        if self._bounds is not None:
+            bounds_left, bounds_right, bounds_bottom = self._bounds
+            self._bounds = (min(bounds_left, left), max(bounds_right, right),
+                            max(bounds_bottom, bottom))
+            
+    def _untrack(self, alien):
+        """Remove a dead alien's edges from the formation bounding box."""
+        left = alien.home_x
+        right = left + alien.rect.width
+        bottom = alien.home_y + alien.rect.height
+        row = self._rows[alien.home_y]
+        del row[alien]
+        if not row:
+            del self._rows[alien.home_y]
+            del self._row_keys[bisect_left(self._row_keys, alien.home_y)]
+            self._row_offsets.pop(alien.home_y, None)
+        for index, (counter, edge) in enumerate(
+                ((self._lefts, left), (self._rights, right), (self._bottoms, bottom))):
+            counter[edge] -= 1
+            if not counter[edge]:
+                del counter[edge]
+                # The box only shrinks when the last alien on its edge dies
+                if self._bounds is not None and self._bounds[index] == edge:
+                    self._bounds = None
+                    
+    def _formation_bounds(self):
+        """Return (left, right, bottom) of the living aliens' home positions."""
+        if self._bounds is None:
+            self._bounds = (min(self._lefts), max(self._rights), max(self._bottoms))
+        return self._bounds
+        
+    def _extents(self):
+        """Return the left and right edges of the living aliens' home positions."""
+        left, right, _ = self._formation_bounds()
+        return left, right
+        
+    def _lowest(self):
+        """Return the lowest bottom edge of the living aliens' home positions."""
+        return self._formation_bounds()[2]
+        
+    def landed_aliens(self, bottom):
+        """Return the aliens whose rects reach `bottom`.
+
+        The fleet is only scanned once its lowest row has got there.
+        """
+        if not self.aliens or self._lowest() + self.offset_y < bottom:
+            return []
+        aliens = self._aliens_in_rows(bottom - self.offset_y - self._row_height - 1, None)
+        return [alien for alien in aliens if alien.rect.bottom >= bottom]
+        
+    def visible_aliens(self):
+        """Return the aliens in rows overlapping the viewport, with synced rects.
+
+        The viewport is widened by `cull_margin` above and below, which
+        covers the small shifts of interpolated drawing. Aliens are returned
+        in fleet order, row by row.
+        """
+        margin = self.settings.cull_margin
+        dy = self.offset_y
+        return self._aliens_in_rows(self.viewport.top - margin - self._row_height - dy,
+                                    self.viewport.bottom + margin - dy)
+        
+    def _aliens_in_rows(self, top, bottom):
+        """Sync and return the aliens whose home_y lies strictly between top and bottom.
+
+        A bottom of None takes every row below top. When every row is
+        included the fleet's group is returned, otherwise an AlienList.
+        """
+        keys = self._row_keys
+        start = bisect_right(keys, top)
+        end = len(keys) if bottom is None else bisect_left(keys, bottom)
+        if start == 0 and end == len(keys):
+            # Nothing culled: the group itself is cheapest to test and draw
+            self.sync_rects()
+            return self.aliens
+        offset = self.rect_offset()
+        dx, dy = offset
+        row_offsets = self._row_offsets
+        aliens = AlienList()
+        for home_y in keys[start:end]:
+            row = self._rows[home_y]
+            if row_offsets.get(home_y, self._synced_offset) != offset:
+                for alien in row:
+                    alien.rect.x = alien.home_x + dx
+                    alien.rect.y = home_y + dy
+                row_offsets[home_y] = offset
+            aliens.extend(row)
+        return aliens
+        
+    def draw(self, screen):
+        """Draw the aliens in the viewport; culled aliens are not synced or drawn."""
+        screen.blits([(alien.image, alien.rect) for alien in self.visible_aliens()], False)
+        
+    def _touches_edge(self, left, right, net_steps):
+        """Return True if a formation spanning left..right touches a screen edge."""
+        dx = round_half_away(net_steps * self.enemy_speed)
+        return right + dx >= self.settings.screen_width or left + dx <= 0
+        
     def check_fleet_edges(self):
         """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges():
-                self._change_fleet_direction()
-                break
+        left, right = self._extents()
+        if self._touches_edge(left, right, self.net_steps):
+            self._change_fleet_direction()
                 
     def _change_fleet_direction(self):
         """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.enemy_drop_speed  # Use the new drop speed setting
+        self.bounces += 1
         self.fleet_direction *= -1
         
     def update(self):
@@ -123,11 +371,8 @@ class EnemyWave:
             # Check if aliens have reached the edge of the screen
             self.check_fleet_edges()
             
-            # Move aliens sideways
-            for alien in self.aliens.sprites():
-                alien.x += (self.settings.enemy_speed * self.fleet_direction)
-                alien.rect.x = alien.x
-                
+            # Move the formation sideways
+            self.net_steps += self.fleet_direction
             self.steps_moved += 1
             
             # Check if we should change to downward movement
@@ -136,10 +381,8 @@ class EnemyWave:
                 self.steps_moved = 0
                 
         elif self.movement_phase == 'down':
-            # Move aliens down
-            for alien in self.aliens.sprites():
-                alien.rect.y += self.settings.enemy_drop_speed / 10  # Slower vertical movement
-                
+            # Move the formation down
+            self.down_moves += 1
             self.steps_moved += 1
             
             # Check if we should change to sideways movement
@@ -149,18 +392,164 @@ class EnemyWave:
                 # Change direction after completing vertical movement
                 self.fleet_direction *= -1
                 
+    def advance(self, ticks):
+        """Move the fleet ahead exactly as `ticks` calls to update() would.
+
+        Sideways runs are skipped in one step up to the next edge contact and
+        whole swings that stay clear of the edges in O(1), so the cost
+        depends on the number of bounces, not on the ticks or the aliens.
+        """
+        if not self.aliens:
+            return
+        left, right = self._extents()
+        self._advance(ticks, left, right)
+        
+    def _advance(self, ticks, left, right):
+        """Advance the movement counters for a formation spanning left..right."""
+        cycle = self.sideways_steps + self.down_steps
+        while ticks > 0:
+            if self.movement_phase == 'sideways':
+                if (self.steps_moved == 0 and ticks >= cycle
+                        and self._swing_is_clear(left, right)):
+                    # Swing back and forth without touching an edge
+                    cycles = ticks // cycle
+                    self.down_moves += cycles * self.down_steps
+                    if cycles % 2:
+                        self.net_steps += self.fleet_direction * self.sideways_steps
+                        self.fleet_direction *= -1
+                    ticks -= cycles * cycle
+                    continue
+                    
+                run = min(ticks, self.sideways_steps - self.steps_moved)
+                contact = self._first_contact(left, right, run)
+                if contact is not None:
+                    run = contact
+                self.net_steps += self.fleet_direction * run
+                self.steps_moved += run
+                ticks -= run
+                if contact is not None:
+                    # The tick that touches an edge drops and reverses first
+                    self._change_fleet_direction()
+                    self.net_steps += self.fleet_direction
+                    self.steps_moved += 1
+                    ticks -= 1
+                if self.steps_moved >= self.sideways_steps:
+                    self.movement_phase = 'down'
+                    self.steps_moved = 0
+            else:
+                run = min(ticks, self.down_steps - self.steps_moved)
+                self.down_moves += run
+                self.steps_moved += run
+                ticks -= run
+                if self.steps_moved >= self.down_steps:
+                    self.movement_phase = 'sideways'
+                    self.steps_moved = 0
+                    self.fleet_direction *= -1
+                    
+    def _swing_is_clear(self, left, right):
+        """Return True if a full sideways swing from here touches no edge.
+
+        Edge contact is monotonic along a swing, so checking both ends of it
+        is enough.
+        """
+        end = self.net_steps + self.fleet_direction * self.sideways_steps
+        return (not self._touches_edge(left, right, self.net_steps)
+                and not self._touches_edge(left, right, end))
+        
+    def _first_contact(self, left, right, run):
+        """Return the first of the next `run` sideways steps that touches an edge, or None."""
+        net_steps = self.net_steps
+        direction = self.fleet_direction
+        if self._touches_edge(left, right, net_steps):
+            return 0
+        if not self._touches_edge(left, right, net_steps + direction * (run - 1)):
+            return None
+        # Moving toward an edge, contact stays on once it starts
+        low, high = 0, run - 1
+        while high - low > 1:
+            middle = (low + high) // 2
+            if self._touches_edge(left, right, net_steps + direction * middle):
+                high = middle
+            else:
+                low = middle
+        return high
+        
+    def ticks_until_bottom(self, limit=1000000):
+        """Return how many ticks until the lowest alien reaches the bottom.
+
+        Assumes no more aliens are destroyed. Returns None if the fleet does
+        not get there within `limit` ticks.
+        """
+        if not self.aliens:
+            return None
+        distance = self.settings.screen_height - self._lowest()
+        if self.offset_y >= distance:
+            return 0
+        left, right = self._extents()
+        state = self._motion_state()
+        
+        def reached_after(ticks):
+            self._set_motion_state(state)
+            self._advance(ticks, left, right)
+            return self.offset_y >= distance
+        
+        try:
+            if not reached_after(limit):
+                return None
+            # The fleet never moves up, so search for the first tick it arrives
+            low, high = 0, limit
+            while high - low > 1:
+                middle = (low + high) // 2
+                if reached_after(middle):
+                    high = middle
+                else:
+                    low = middle
+            return high
+        finally:
+            self._set_motion_state(state)
+        
+    def _motion_state(self):
+        """Return the counters that determine the fleet's movement."""
+        return (self.net_steps, self.down_moves, self.bounces, self.fleet_direction,
+                self.movement_phase, self.steps_moved)
+        
+    def _set_motion_state(self, state):
+        """Restore counters saved by _motion_state()."""
+        (self.net_steps, self.down_moves, self.bounces, self.fleet_direction,
+         self.movement_phase, self.steps_moved) = state
+                
+    def sync_rects(self):
+        """Bring alien rects up to date before they are tested or drawn.
+
+        Every rect is its alien's home position plus the formation offset;
+        nothing is done if the offset has not changed since the last sync.
+        This moves the whole fleet; drawing and collisions only need
+        visible_aliens().
+        """
+        offset = self.rect_offset()
+        if offset == self._synced_offset and not self._row_offsets:
+            return
+        dx, dy = offset
+        for alien in self.aliens.sprites():
+            alien.rect.x = alien.home_x + dx
+            alien.rect.y = alien.home_y + dy
+        self._synced_offset = offset
+        self._row_offsets.clear()
+        
     def spawn_enemies(self):
         """Spawn a new wave of enemies."""
         self.wave_number += 1
         
         # Increase enemy speed slightly with each wave, but cap it
-        self.settings.enemy_speed = min(
-            self.settings.enemy_speed * 1.1,  # Increase by 10% each wave
+        self.enemy_speed = min(
+            self.enemy_speed * 1.1,  # Increase by 10% each wave
             2.0  # Maximum speed cap
         )
         
         # Increase the number of rows with each wave, with a reasonable cap
-        if self.wave_number % 2 == 0:  # Add a new row every 2 waves
+        if self.settings.endless_mode:
+            self.max_rows += self.settings.endless_rows_per_wave
+        elif self.wave_number % 2 == 0:  # Add a new row every 2 waves
             self.max_rows += 1
         
         # Reset movement pattern variables
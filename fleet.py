@@ -0,0 +1,109 @@
+# NumPy struct-of-arrays fleet backend
+import numpy as np
+
+from enemies import Alien, EnemyWave
+from textures import get_texture
+
+class ArrayAlien(Alien):
+    """An alien whose formation position and health live in its wave's arrays."""
+
+    def __init__(self, settings, screen, wave, slot):
+        """Bind the alien to a slot in the wave's arrays."""
+        self.wave = wave
+        self.slot = slot
+        super().__init__(settings, screen)
+
+    @property
+    def home_x(self):
+        return int(self.wave.home_x[self.slot])
+
+    @home_x.setter
+    def home_x(self, value):
+        self.wave.home_x[self.slot] = value
+
+    @property
+    def home_y(self):
+        return int(self.wave.home_y[self.slot])
+
+    @home_y.setter
+    def home_y(self, value):
+        self.wave.home_y[self.slot] = value
+
+    @property
+    def health(self):
+        return float(self.wave.health[self.slot])
+
+    @health.setter
+    def health(self, value):
+        self.wave.health[self.slot] = value
+
+    def kill(self):
+        """Remove the alien from all groups and mark its slot as dead."""
+        if self.alive():
+            self.wave.alive[self.slot] = False
+        super().kill()
+
+class ArrayEnemyWave(EnemyWave):
+    """An enemy wave that keeps its formation in contiguous NumPy arrays.
+
+    Alien home positions, health and alive flags are stored in arrays and
+    rects are synced from the arrays in one pass. Movement and the
+    formation bounding box are shared with EnemyWave.
+    """
+
+    def __init__(self, settings, screen):
+        """Initialize the enemy wave with empty fleet arrays."""
+        super().__init__(settings, screen)
+        self._allocate(0)
+
+    def _allocate(self, count):
+        """Allocate fleet arrays for `count` aliens."""
+        self.home_x = np.zeros(count, dtype=np.int64)
+        self.home_y = np.zeros(count, dtype=np.int64)
+        self.health = np.zeros(count)
+        self.alive = np.zeros(count, dtype=bool)
+        self.slots = []
+
+    def create_fleet(self):
+        """Create a full fleet of aliens backed by arrays."""
+        self._pending = []
+        super().create_fleet()
+        pending, self._pending = self._pending, None
+
+        alien_width, alien_height = get_texture("alien").get_size()
+        health = self.settings.enemy_health * (1 + (self.wave_number - 1) * 0.2)
+        self.set_formation([(alien_width + 2 * alien_width * alien_number,
+                             alien_height + 2 * alien_height * row_number, health)
+                            for alien_number, row_number in pending])
+
+    def set_formation(self, formation):
+        """Replace the fleet with array-backed aliens at (home_x, home_y, health) places."""
+        self.aliens.empty()
+        self._allocate(len(formation))
+        for slot, (home_x, home_y, health) in enumerate(formation):
+            alien = ArrayAlien(self.settings, self.screen, self, slot)
+            self._place(alien, home_x, home_y)
+            alien.health = health
+            self.alive[slot] = True
+            self.slots.append(alien)
+            self.aliens.add(alien)
+        self._synced_offset = self.rect_offset()
+        self._row_offsets.clear()
+
+    def _create_alien(self, alien_number, row_number):
+        """Record the grid position of an alien to be created."""
+        self._pending.append((alien_number, row_number))
+
+    def sync_rects(self):
+        """Copy home positions plus the formation offset into the living aliens' rects."""
+        offset = self.rect_offset()
+        if offset == self._synced_offset and not self._row_offsets:
+            return
+        dx, dy = offset
+        live = np.flatnonzero(self.alive)
+        slots = self.slots
+        for slot, x, y in zip(live.tolist(), (self.home_x[live] + dx).tolist(),
+                              (self.home_y[live] + dy).tolist()):
+            slots[slot].rect.topleft = (x, y)
+        self._synced_offset = offset
+        self._row_offsets.clear()
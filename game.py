@@ -1,4 +1,6 @@
 # Main game loop
+import argparse
+import json
 import pygame
 import sys
 from pygame.sprite import Group
@@ -11,106 +13,269 @@ from resources import ResourceManager
 from story import Story
 from ui import UI
 from input_handler import InputHandler
-from renderer import Renderer
-from collision_handler import CollisionHandler
-from visual_effects import StarfieldGenerator
-from game_state import GameStateManager
+from renderer import Renderer, DirtyRectRenderer
+from visual_effects import Starfield
+from simulation import Simulation
+from replay import Replay, ReplayRecorder, play_replay
+from snapshot import Snapshot
+from telemetry import open_log
+from profiling import BootTimer, FrameProfiler
+from autopilot import make_policy
+from timestep import FixedTimestep, Interpolator
 
-def run_game():
-    print("Starting game initialization...")
-    # Initialize pygame, settings, and screen object
-    pygame.init()
+def init_pygame():
+    """Initialize only the pygame modules the game uses and return a Clock.
+
+    pygame.init() also starts the mixer, joystick and other modules the
+    game never touches. Creating the Clock starts SDL's timer, which
+    pygame.time.get_ticks needs.
+    """
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.time.Clock()
+
+def run_game(record_path=None, show_profiler=False, policy_name=None, render_fps=None,
+             telemetry_path=None, endless=False, upgrade_hints_path=None):
+    # Time every start-up step; the report is printed after the first frame
+    boot = BootTimer()
+    clock = init_pygame()
+    boot.lap("pygame init")
+    
+    # Create settings and the screen object
     settings = Settings()
-    print("Created settings...")
+    if render_fps is not None:
+        settings.render_fps = render_fps
+    settings.endless_mode = endless
+    boot.lap("settings")
     screen = pygame.display.set_mode(
         (settings.screen_width, settings.screen_height))
     pygame.display.set_caption("Alien Invasion")
-    print("Created display...")
+    boot.lap("display")
     
-    # Create game state manager
-    game_state_manager = GameStateManager(settings, screen)
+    # Create the simulation and its game state manager
+    simulation = Simulation(settings, screen)
+    game_state_manager = simulation.game_state_manager
+    if policy_name:
+        simulation.policy = make_policy(policy_name)
+    if upgrade_hints_path:
+        # Hints only plan over scores already in the cache; tabulating them
+        # now leaves table lookups for the game loop
+        from upgrade_optimizer import ScoreCache, UpgradeOptimizer
+        upgrade_advisor = UpgradeOptimizer(
+            settings, ScoreCache(upgrade_hints_path), scorer=None,
+            income=settings.upgrade_hint_income, waves=settings.upgrade_hint_waves)
+        upgrade_advisor.prepare()
+        game_state_manager.upgrade_advisor = upgrade_advisor
+    boot.lap("simulation")
     
-    # Create UI
+    # Create UI; each screen is built the first time it is shown
     ui = UI(settings, screen)
-    print("Created game objects...")
     
     # Create handlers
     input_handler = InputHandler()
-    renderer = Renderer()
-    collision_handler = CollisionHandler()
+    if settings.dirty_rect_rendering:
+        renderer = DirtyRectRenderer()
+    else:
+        renderer = Renderer()
+    boot.lap("ui and handlers")
     
     # Create a starfield background
-    starfield_generator = StarfieldGenerator()
-    stars = starfield_generator.create_stars(settings, screen, 100)
-    print("Created starfield...")
+    starfield = Starfield(settings)
+    boot.lap("starfield")
+    
+    # Set up the fixed-rate simulation clock; `clock` caps the render rate
+    timestep = FixedTimestep(settings.fps, settings.max_ticks_per_frame)
+    interpolator = Interpolator(game_state_manager) if settings.interpolate_rendering else None
+    
+    # Set up the frame profiler; F3 toggles the overlay, F4 dumps a CSV
+    profiler = FrameProfiler(settings.profiler_frames)
+    profiler.visible = show_profiler
+    simulation.profiler = profiler
     
-    # Set up game clock
-    clock = pygame.time.Clock()
-    print("Starting main game loop...")
+    # Record every tick's input for replay if requested
+    recorder = None
+    if record_path:
+        recorder = ReplayRecorder()
+        simulation.recorder = recorder
     
-    # Start the main game loop
-    while True:
-        # Check for events
-        action = input_handler.handle_events(game_state_manager.player, ui, game_state_manager.beams)
+    # Log game events and frame stats from a background writer if requested
+    telemetry = None
+    if telemetry_path:
+        telemetry = open_log(telemetry_path, settings.telemetry_queue_size)
+        game_state_manager.telemetry = telemetry
+    
+    try:
+        # Start the main game loop
+        pending_action = None
+        while True:
+            profiler.begin_frame()
+            
+            # Check for events
+            action = input_handler.handle_events(game_state_manager.player, ui)
+            if action == "toggle_profiler":
+                profiler.toggle()
+            elif action == "dump_profile":
+                print(f"Saved frame profile to {profiler.dump_csv()}")
+            elif action is not None:
+                pending_action = action
+            profiler.lap("input")
         
-        # Process UI actions
-        result = game_state_manager.handle_action(action)
-        if result == "exit":
-            print("Exiting game...")
-            sys.exit()
+            # Run as many fixed ticks as the elapsed time calls for; a UI
+            # action waits for the next tick if this frame runs none
+            ticks = timestep.advance()
+            for tick in range(ticks):
+                if interpolator is not None and tick == ticks - 1:
+                    interpolator.capture()
+                result = simulation.step(pending_action)
+                pending_action = None
+                if result == "exit":
+                    game_state_manager.emit("exit")
+                    sys.exit()
+                
+                if game_state_manager.get_state() == "playing":
+                    # Update stars
+                    starfield.update()
         
-        # Update based on current game state
-        current_state = game_state_manager.get_state()
+            # Update based on current game state
+            current_state = game_state_manager.get_state()
         
-        if current_state == "playing":
-            # Update game objects
-            game_state_manager.update_playing_state()
-            
-            # Update stars
-            stars = starfield_generator.update_stars(stars, settings)
-            
-            # Check for beam-alien collisions
-            collision_handler.check_beam_alien_collisions(
+            # Update the screen, drawn between the last two ticks
+            if interpolator is not None:
+                interpolator.apply(timestep.alpha)
+            renderer.update_screen(
+                settings, 
+                screen, 
+                game_state_manager.player, 
+                game_state_manager.base, 
+                game_state_manager.enemy_wave, 
                 game_state_manager.beams, 
-                game_state_manager.enemy_wave.aliens, 
-                game_state_manager.resource_manager
+                ui, 
+                current_state,
+                game_state_manager.resource_manager,
+                game_state_manager,
+                starfield,
+                profiler
             )
-            
-            # Check if aliens have reached the bottom
-            if collision_handler.check_aliens_bottom(
-                screen, 
-                game_state_manager.enemy_wave.aliens, 
-                game_state_manager.base
-            ):
-                # Check if base is destroyed
-                if game_state_manager.base.health <= 0:
-                    print("Game over - Base destroyed!")
-                    game_state_manager.end_game(victory=False)
+            if interpolator is not None:
+                interpolator.restore()
+            if boot is not None:
+                boot.lap("first frame")
+                print(boot.report())
+                boot = None
         
-        # Update the screen
-        renderer.update_screen(
-            settings, 
-            screen, 
-            game_state_manager.player, 
-            game_state_manager.base, 
-            game_state_manager.enemy_wave, 
-            game_state_manager.beams, 
-            ui, 
-            current_state,
-            game_state_manager.resource_manager,
-            game_state_manager
-        )
-        
-        # Pass victory status to UI
-        ui.victory = game_state_manager.victory
+            # Pass victory status to UI
+            ui.victory = game_state_manager.victory
+            
+            aliens = len(game_state_manager.enemy_wave.aliens)
+            beams = len(game_state_manager.beams)
+            particles = game_state_manager.particles.count
+            profiler.end_frame(aliens, beams, particles)
+            game_state_manager.emit("frame", frame_ms=round(profiler.last_frame_ms, 3), ticks=ticks,
+                                    aliens=aliens, beams=beams, particles=particles)
         
-        # Control the game speed
-        clock.tick(settings.fps)
+            # Cap the frame rate; gameplay speed is set by the timestep
+            clock.tick(settings.render_fps)
+    finally:
+        if recorder is not None:
+            recorder.finish(simulation).save(record_path)
+            print(f"Saved replay to {record_path}")
+        if telemetry is not None:
+            telemetry.close()
+            print(f"Saved telemetry to {telemetry_path} ({telemetry.stats()['dropped']} records dropped)")
+
+def run_headless(ticks, seed=None, record_path=None, policy_name=None,
+                 snapshot_path=None, save_snapshot_path=None, telemetry_path=None,
+                 endless=False):
+    """Run the game without a display and print a JSON summary.
+
+    The run continues from a saved snapshot if one is given, and the final
+    state can be saved as a snapshot for later runs to start from. Game
+    events are logged to `telemetry_path` if one is given.
+    """
+    settings = Settings().copy(endless_mode=endless)
+    if snapshot_path:
+        simulation = Snapshot.load(snapshot_path).restore(settings)
+    else:
+        simulation = Simulation(settings, seed=seed)
+    if policy_name:
+        simulation.policy = make_policy(policy_name)
+    if record_path:
+        simulation.recorder = ReplayRecorder(seed)
+    telemetry = None
+    if telemetry_path:
+        telemetry = open_log(telemetry_path, simulation.settings.telemetry_queue_size)
+        simulation.game_state_manager.telemetry = telemetry
+    summary = simulation.run(ticks)
+    if telemetry is not None:
+        telemetry.close()
+        summary["telemetry"] = telemetry.stats()
+    if record_path:
+        simulation.recorder.finish(simulation).save(record_path)
+    if save_snapshot_path:
+        Snapshot.capture(simulation).save(save_snapshot_path)
+    print(json.dumps(summary))
+    return summary
+
+def run_replay(replay_path):
+    """Replay a recording at full speed and print a JSON summary.
+
+    Exits with status 1 if the final state does not match the recording.
+    """
+    replay = Replay.load(replay_path)
+    summary = play_replay(replay)
+    print(json.dumps(summary))
+    if not summary["match"]:
+        sys.exit(1)
+    return summary
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Alien Invasion")
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a display")
+    parser.add_argument("--ticks", type=int, default=3600,
+                        help="number of ticks to simulate in headless mode")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed for headless mode")
+    parser.add_argument("--record", metavar="PATH", default=None,
+                        help="record every tick's input to a replay file")
+    parser.add_argument("--replay", metavar="PATH", default=None,
+                        help="replay a recording headlessly and verify its final state")
+    parser.add_argument("--profile", action="store_true",
+                        help="start with the frame profiler overlay shown (toggle with F3)")
+    parser.add_argument("--render-fps", type=int, default=None,
+                        help="frame rate cap for drawing, 0 for uncapped (gameplay speed is unchanged)")
+    parser.add_argument("--autopilot", metavar="POLICY", default=None,
+                        help="let a built-in policy play (idle, track, greedy, track_greedy)")
+    parser.add_argument("--snapshot", metavar="PATH", default=None,
+                        help="continue a headless run from a saved snapshot")
+    parser.add_argument("--save-snapshot", metavar="PATH", default=None,
+                        help="save the final state of a headless run as a snapshot")
+    parser.add_argument("--telemetry", metavar="PATH", default=None,
+                        help="log game events to PATH as JSON lines, or binary if it ends in .bin")
+    parser.add_argument("--endless", action="store_true",
+                        help="play waves that keep growing, with no victory")
+    parser.add_argument("--upgrade-hints", metavar="PATH", default=None,
+                        help="suggest upgrades from a score cache written by upgrade_optimizer.py")
+    args = parser.parse_args(argv)
+    if args.snapshot and args.record:
+        # Replays always start from a new game
+        parser.error("--record cannot be combined with --snapshot")
+    return args
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
+    if args.replay:
+        run_replay(args.replay)
+        return
+    if args.headless:
+        run_headless(args.ticks, args.seed, args.record, args.autopilot,
+                     args.snapshot, args.save_snapshot, args.telemetry, args.endless)
+        return
     try:
         print("Starting Alien Invasion...")
-        run_game()
+        run_game(args.record, args.profile, args.autopilot, args.render_fps, args.telemetry,
+                 args.endless, args.upgrade_hints)
     except Exception as e:
         print(f"Error occurred: {str(e)}")
         import traceback
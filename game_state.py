@@ -1,27 +1,38 @@
 # Game state manager
 import pygame
-from pygame.sprite import Group
 
 from player import Player
 from base import Base
 from enemies import EnemyWave
 from resources import ResourceManager
+from weapons import BeamPool
+from visual_effects import ParticleSystem
 
 class GameStateManager:
     """Manages game states and transitions between states."""
     
-    def __init__(self, settings, screen):
-        """Initialize the game state manager."""
+    def __init__(self, settings, screen, clock=None, seed=None):
+        """Initialize the game state manager.
+
+        clock is a zero-argument callable returning the current game time in
+        milliseconds. It defaults to pygame's wall clock; the headless
+        simulation passes a tick-based clock instead. seed makes particle
+        effects repeatable.
+        """
         self.settings = settings
         self.screen = screen
+        self.clock = clock or pygame.time.get_ticks
         self.state = "menu"  # Initial state
+        self.telemetry = None  # Optional TelemetryLog receiving game events
         
         # Game objects
         self.resource_manager = ResourceManager(settings)
         self.player = Player(settings, screen, self.resource_manager)
         self.base = Base(settings, screen)
-        self.enemy_wave = EnemyWave(settings, screen)
-        self.beams = Group()
+        self.enemy_wave = self._create_enemy_wave()
+        self.beam_pool = BeamPool(settings, screen)
+        self.beams = self.beam_pool.beams
+        self.particles = ParticleSystem(settings, seed=seed)
         
         # Game status
         self.victory = False
@@ -30,28 +41,48 @@ class GameStateManager:
         self.show_upgrade_message = False
         self.upgrade_message = ""
         self.message_timer = 0
+        
+        # Optional UpgradeOptimizer suggesting what to buy, and its suggestion
+        self.upgrade_advisor = None
+        self.upgrade_hint = None
+        self._hint_state = None
+    
+    def _create_enemy_wave(self):
+        """Create an enemy wave using the configured fleet backend."""
+        if self.settings.fleet_backend == "numpy":
+            from fleet import ArrayEnemyWave
+            return ArrayEnemyWave(self.settings, self.screen)
+        return EnemyWave(self.settings, self.screen)
     
     def get_state(self):
         """Get the current game state."""
         return self.state
     
+    def emit(self, event, **fields):
+        """Send a telemetry event stamped with the game time, if logging."""
+        if self.telemetry is not None:
+            self.telemetry.emit(event, self.clock(), **fields)
+    
     def transition_to(self, new_state):
         """Transition to a new game state."""
-        print(f"Transitioning from {self.state} to {new_state}")
+        self.emit("transition", previous=self.state, state=new_state)
         self.state = new_state
     
     def start_new_game(self):
         """Initialize a new game."""
-        print("Starting new game...")
         self.transition_to("playing")
         
         # Reset game objects
         self.resource_manager = ResourceManager(self.settings)
         self.player = Player(self.settings, self.screen, self.resource_manager)
+        self.player.last_shot_time = self.clock()
         self.base = Base(self.settings, self.screen)
-        self.enemy_wave = EnemyWave(self.settings, self.screen)
+        self.enemy_wave = self._create_enemy_wave()
         self.enemy_wave.create_fleet()
-        self.beams = Group()
+        self.emit("wave_start", wave=self.enemy_wave.wave_number,
+                  aliens=len(self.enemy_wave.aliens))
+        self.beam_pool.clear()
+        self.particles.clear()
         
         # Reset victory status
         self.victory = False
@@ -60,16 +91,23 @@ class GameStateManager:
         self.show_upgrade_message = False
         self.upgrade_message = ""
         self.message_timer = 0
+        self._hint_state = None
+        self.update_upgrade_hint()
     
     def restart_game(self):
         """Restart the game after game over."""
-        print("Restarting game...")
         self.start_new_game()
     
     def end_game(self, victory=False):
         """End the game with either victory or defeat."""
         self.transition_to("game_over")
         self.victory = victory
+        self.emit("game_over", victory=victory)
+    
+    def fire_beams(self):
+        """Fire a new beam if the player's auto-fire delay has elapsed."""
+        if self.player.should_auto_fire(self.clock()):
+            self.beam_pool.fire(self.player)
     
     def update_playing_state(self):
         """Update game objects in playing state."""
@@ -79,14 +117,15 @@ class GameStateManager:
         # Update beams
         self.beams.update()
         
-        # Remove beams that have gone off the top of the screen
-        for beam in self.beams.copy():
-            if beam.rect.bottom <= 0:
-                self.beams.remove(beam)
+        # Return beams that have gone off the top of the screen to the pool
+        self.beam_pool.retire()
         
         # Update aliens
         self.enemy_wave.update()
         
+        # Update particle effects
+        self.particles.update()
+        
         # Update upgrade message timer
         if self.show_upgrade_message:
             self.message_timer -= 1
@@ -95,21 +134,37 @@ class GameStateManager:
         
         # Check if all aliens are destroyed
         if len(self.enemy_wave.aliens) == 0:
-            print(f"Wave {self.enemy_wave.wave_number} completed!")
             # Award bonus gems for completing wave
-            self.resource_manager.earn_resources(self.enemy_wave.wave_number * 100)
+            bonus = self.enemy_wave.wave_number * 100
+            self.resource_manager.earn_resources(bonus)
+            self.emit("wave_end", wave=self.enemy_wave.wave_number, bonus=bonus)
+            self.emit("gems_earned", amount=bonus, total=self.resource_manager.gems)
             
             # Show wave completion message
             self.show_message(f"Wave {self.enemy_wave.wave_number} completed! Bonus: {self.enemy_wave.wave_number * 100} gems")
             
             # Start a new wave
-            self.beams.empty()
+            self.beam_pool.clear()
             self.enemy_wave.spawn_enemies()
+            self.emit("wave_start", wave=self.enemy_wave.wave_number,
+                      aliens=len(self.enemy_wave.aliens))
             
-            # Check for victory condition (e.g., after 5 waves)
-            if self.enemy_wave.wave_number > 5:
-                print("Victory!")
+            # Check for victory condition; endless games go on until the base falls
+            if (not self.settings.endless_mode
+                    and self.enemy_wave.wave_number > self.settings.victory_wave):
                 self.end_game(victory=True)
+    
+    def update_upgrade_hint(self):
+        """Ask the upgrade advisor what to buy, whenever the levels or the gems it plans with change."""
+        if self.upgrade_advisor is None:
+            return
+        levels = (self.base.defense_level, self.player.weapon.level,
+                  self.player.speed_level, self.player.fire_rate_level)
+        gems = self.resource_manager.gems
+        state = (levels, self.upgrade_advisor.units(gems))
+        if state != self._hint_state:
+            self._hint_state = state
+            self.upgrade_hint = self.upgrade_advisor.suggest(gems, levels)
                 
     def handle_action(self, action):
         """Handle UI actions."""
@@ -121,34 +176,51 @@ class GameStateManager:
             self.restart_game()
         elif action == "upgrade_defense":
             if self.state == "playing":
-                print("Upgrading defense...")
+                cost = self.resource_manager.get_upgrade_cost(self.base.defense_level)
                 if self.base.upgrade_defense(self.resource_manager):
+                    self.particles.emit_upgrade(*self.player.rect.midtop)
                     self.show_message(f"Base defense upgraded to level {self.base.defense_level}!")
+                    self._record_upgrade("defense", self.base.defense_level, cost)
                 else:
                     self.show_message("Not enough gems for defense upgrade!")
+                    self.emit("upgrade_failed", kind="defense", cost=cost)
         elif action == "upgrade_weapon":
             if self.state == "playing":
-                print("Upgrading weapon...")
+                cost = self.resource_manager.get_upgrade_cost(self.player.weapon.level)
                 if self.player.upgrade_weapon():
+                    self.particles.emit_upgrade(*self.player.rect.midtop)
                     self.show_message(f"Weapon upgraded to {self.player.weapon.name}!")
+                    self._record_upgrade("weapon", self.player.weapon.level, cost)
                 else:
                     self.show_message("Not enough gems for weapon upgrade!")
+                    self.emit("upgrade_failed", kind="weapon", cost=cost)
         elif action == "upgrade_speed":
             if self.state == "playing":
-                print("Upgrading speed...")
+                cost = self.resource_manager.get_upgrade_cost(self.player.speed_level)
                 if self.player.upgrade_speed():
+                    self.particles.emit_upgrade(*self.player.rect.midtop)
                     self.show_message(f"Speed upgraded to level {self.player.speed_level}!")
+                    self._record_upgrade("speed", self.player.speed_level, cost)
                 else:
                     self.show_message("Not enough gems for speed upgrade!")
+                    self.emit("upgrade_failed", kind="speed", cost=cost)
         elif action == "upgrade_fire_rate":
             if self.state == "playing":
-                print("Upgrading fire rate...")
+                cost = self.resource_manager.get_upgrade_cost(self.player.fire_rate_level)
                 if self.player.upgrade_fire_rate():
+                    self.particles.emit_upgrade(*self.player.rect.midtop)
                     self.show_message(f"Fire rate upgraded to level {self.player.fire_rate_level}!")
+                    self._record_upgrade("fire_rate", self.player.fire_rate_level, cost)
                 else:
                     self.show_message("Not enough gems for fire rate upgrade!")
+                    self.emit("upgrade_failed", kind="fire_rate", cost=cost)
         return None
         
+    def _record_upgrade(self, kind, level, cost):
+        """Send telemetry for a bought upgrade and the gems it cost."""
+        self.emit("upgrade", kind=kind, level=level, cost=cost)
+        self.emit("gems_spent", amount=cost, total=self.resource_manager.gems)
+        
     def show_message(self, message, duration=180):
         """Show a message on the screen for a duration (in frames)."""
         self.show_upgrade_message = True
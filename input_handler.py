@@ -6,25 +6,25 @@ class InputHandler:
     """Class to handle player inputs and interactions."""
     
     @staticmethod
-    def handle_events(player, ui, beams):
-        """Respond to keypresses and mouse events."""
+    def handle_events(player, ui):
+        """Respond to keypresses and mouse events.
+
+        Every queued event is handled, so key releases later in the frame
+        still apply; the first action raised is returned.
+        """
+        action = None
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
-                InputHandler._handle_keydown_events(event, player)
+                action = action or InputHandler._handle_keydown_events(event, player)
             elif event.type == pygame.KEYUP:
                 InputHandler._handle_keyup_events(event, player)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            elif event.type == pygame.MOUSEBUTTONDOWN and action is None:
                 mouse_pos = pygame.mouse.get_pos()
-                return ui.check_button(mouse_pos)
-        
-        # Check for auto-firing
-        if player.should_auto_fire():
-            new_beam = player.fire_beam()
-            beams.add(new_beam)
+                action = ui.check_button(mouse_pos)
             
-        return None
+        return action
 
     @staticmethod
     def _handle_keydown_events(event, player):
@@ -35,6 +35,11 @@ class InputHandler:
             player.moving_left = True
         elif event.key == pygame.K_q:
             sys.exit()
+        elif event.key == pygame.K_F3:
+            return "toggle_profiler"
+        elif event.key == pygame.K_F4:
+            return "dump_profile"
+        return None
 
     @staticmethod
     def _handle_keyup_events(event, player):
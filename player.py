@@ -1,18 +1,19 @@
 # Manages player attributes and actions
 import pygame
 from weapons import Weapon
+from utils import get_screen_rect
+from textures import get_texture
 
 class Player:
     def __init__(self, settings, screen, resource_manager=None):
         """Initialize the player and set its starting position."""
         self.settings = settings
         self.screen = screen
-        self.screen_rect = screen.get_rect()
+        self.screen_rect = get_screen_rect(settings, screen)
         self.resource_manager = resource_manager
         
-        # Load the player ship image and get its rect
-        self.image = pygame.Surface((50, 50))
-        self.image.fill((0, 0, 255))  # Blue ship (placeholder)
+        # Use the shared player ship image and get its rect
+        self.image = get_texture("player")
         self.rect = self.image.get_rect()
         
         # Start each new player at the bottom center of the screen
@@ -59,9 +60,10 @@ class Player:
         from weapons import Beam
         return Beam(self.settings, self.screen, self)
         
-    def should_auto_fire(self):
+    def should_auto_fire(self, current_time=None):
         """Check if enough time has passed to fire another shot."""
-        current_time = pygame.time.get_ticks()
+        if current_time is None:
+            current_time = pygame.time.get_ticks()
         # Reduced delay based on fire rate level
         adjusted_delay = self.settings.auto_fire_delay / (1 + (self.fire_rate_level - 1) * 0.2)
         if current_time - self.last_shot_time > adjusted_delay:
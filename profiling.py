@@ -0,0 +1,171 @@
+# Boot timing and the frame profiler overlay
+import csv
+import time
+
+import numpy as np
+import pygame
+
+from ui_components.fonts import get_font
+from ui_components.text_cache import TextCache
+
+class BootTimer:
+    """Records how long each start-up step takes before the first frame.
+
+    Call `lap(step)` after each step; the time since the previous mark is
+    charged to it and `report()` lists the steps in order.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        """Start timing the boot."""
+        self.clock = clock
+        self.steps = []  # (step, ms) in the order they ran
+        self._mark = clock()
+
+    def lap(self, step):
+        """Charge the time since the last mark to `step`."""
+        now = self.clock()
+        self.steps.append((step, (now - self._mark) * 1000))
+        self._mark = now
+
+    @property
+    def total_ms(self):
+        return sum(ms for _, ms in self.steps)
+
+    def report(self):
+        """Return a printable table of the boot steps and their total."""
+        width = max([len(step) for step, _ in self.steps] + [len("total")])
+        lines = [f"  {step:<{width}} {ms:8.2f} ms" for step, ms in self.steps]
+        lines.append(f"  {'total':<{width}} {self.total_ms:8.2f} ms")
+        return "Boot time before the first frame:\n" + "\n".join(lines)
+
+class FrameProfiler:
+    """Frame-time profiler with a fixed-size ring buffer and an overlay.
+
+    Every frame records the time spent in each phase, the wall time since
+    the previous frame and the number of aliens, beams and particles. The
+    buffer always records; `visible` only controls the on-screen overlay.
+    """
+
+    PHASES = ("input", "update", "collisions", "render", "ui")
+    COUNTS = ("aliens", "beams", "particles")
+    PHASE_COLORS = ((200, 200, 200), (0, 200, 255), (255, 0, 255),
+                    (0, 255, 0), (255, 215, 0))
+
+    def __init__(self, capacity=600):
+        """Allocate the ring buffer."""
+        self.capacity = capacity
+        self.phase_ms = np.zeros((capacity, len(self.PHASES)))
+        self.frame_ms = np.zeros(capacity)
+        self.counts = np.zeros((capacity, len(self.COUNTS)), dtype=np.int64)
+        self.frames = 0  # Frames recorded so far
+        self.visible = False
+
+        self._phase_index = {phase: i for i, phase in enumerate(self.PHASES)}
+        self._current = np.zeros(len(self.PHASES))
+        self._frame_start = None
+        self._frame_elapsed = 0.0
+        self._mark = time.perf_counter()
+
+        # Overlay layout
+        self.rect = pygame.Rect(10, 0, 360, 190)
+        self._text_cache = None
+        self._text_lines = []
+
+    def begin_frame(self):
+        """Start timing a new frame."""
+        now = time.perf_counter()
+        self._frame_elapsed = (now - self._frame_start) * 1000 if self._frame_start else 0.0
+        self._frame_start = now
+        self._mark = now
+        self._current[:] = 0.0
+
+    def lap(self, phase):
+        """Charge the time since the last mark to `phase`."""
+        now = time.perf_counter()
+        self._current[self._phase_index[phase]] += (now - self._mark) * 1000
+        self._mark = now
+
+    def end_frame(self, aliens=0, beams=0, particles=0):
+        """Store the finished frame in the ring buffer."""
+        slot = self.frames % self.capacity
+        self.phase_ms[slot] = self._current
+        self.frame_ms[slot] = self._frame_elapsed
+        self.counts[slot] = (aliens, beams, particles)
+        self.frames += 1
+
+    @property
+    def last_frame_ms(self):
+        """Wall time between the two most recent frames."""
+        return self._frame_elapsed
+
+    def toggle(self):
+        """Show or hide the overlay."""
+        self.visible = not self.visible
+
+    def _ordered(self, array):
+        """Return buffer rows oldest first."""
+        if self.frames < self.capacity:
+            return array[:self.frames]
+        start = self.frames % self.capacity
+        return np.concatenate((array[start:], array[:start]))
+
+    def summary(self):
+        """Return mean ms per phase and latest entity counts over the buffer."""
+        if not self.frames:
+            return {}
+        phase_ms = self._ordered(self.phase_ms)
+        summary = {phase: float(ms) for phase, ms in zip(self.PHASES, phase_ms.mean(axis=0))}
+        summary["frame"] = float(self._ordered(self.frame_ms).mean())
+        latest = self.counts[(self.frames - 1) % self.capacity]
+        summary.update({name: int(count) for name, count in zip(self.COUNTS, latest)})
+        return summary
+
+    def dump_csv(self, path="frame_profile.csv"):
+        """Write the buffered frames to a CSV file, oldest first."""
+        first_frame = max(0, self.frames - self.capacity)
+        rows = zip(range(first_frame, self.frames),
+                   self._ordered(self.frame_ms).tolist(),
+                   self._ordered(self.phase_ms).tolist(),
+                   self._ordered(self.counts).tolist())
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(("frame", "frame_ms") + self.PHASES + self.COUNTS)
+            for frame, frame_ms, phase_ms, counts in rows:
+                writer.writerow([frame, round(frame_ms, 4)]
+                                + [round(ms, 4) for ms in phase_ms] + counts)
+        return path
+
+    def draw(self, screen):
+        """Draw the overlay: a stacked per-phase graph and the averages."""
+        screen_rect = screen.get_rect()
+        self.rect.bottom = screen_rect.bottom - 30
+        panel = self.rect
+        screen.fill((20, 20, 20), panel)
+
+        # Graph of the most recent frames, one stacked line per phase
+        graph = pygame.Rect(panel.x + 5, panel.y + 5, panel.width - 10, 90)
+        ms_scale = graph.height / 33.3  # Two 60 FPS frames fill the graph
+        budget_y = graph.bottom - int(16.7 * ms_scale)
+        pygame.draw.line(screen, (255, 0, 0), (graph.left, budget_y), (graph.right, budget_y))
+        recent = self._ordered(self.phase_ms)[-graph.width:]
+        if len(recent) > 1:
+            xs = graph.left + np.arange(len(recent))
+            stacked = np.minimum(np.cumsum(recent, axis=1) * ms_scale, graph.height)
+            for i, color in enumerate(self.PHASE_COLORS):
+                ys = graph.bottom - stacked[:, i].astype(int)
+                pygame.draw.lines(screen, color, False, np.column_stack((xs, ys)).tolist())
+
+        # Averages, refreshed twice a second to keep text rendering cheap
+        if self._text_cache is None:
+            self._text_cache = TextCache(get_font(20), (255, 255, 255))
+        if self.frames % 30 == 1 or not self._text_lines:
+            summary = self.summary()
+            self._text_lines = [
+                "  ".join(f"{phase} {summary.get(phase, 0):.2f}" for phase in self.PHASES[:3]),
+                "  ".join(f"{phase} {summary.get(phase, 0):.2f}" for phase in self.PHASES[3:])
+                + f"  frame {summary.get('frame', 0):.1f} ms",
+                "  ".join(f"{name} {summary.get(name, 0)}" for name in self.COUNTS),
+            ]
+        for i, line in enumerate(self._text_lines):
+            text = self._text_cache.render(i, line)
+            screen.blit(text, (panel.x + 5, graph.bottom + 8 + i * 22))
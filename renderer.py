@@ -1,37 +1,203 @@
 # Renderer for the game
+import numpy as np
 import pygame
 
 class Renderer:
     """Handles rendering of game elements to the screen."""
-    
+
     @staticmethod
-    def update_screen(settings, screen, player, base, enemy_wave, beams, ui, game_state, resource_manager=None, game_state_manager=None):
+    def update_screen(settings, screen, player, base, enemy_wave, beams, ui, game_state, resource_manager=None, game_state_manager=None, starfield=None, profiler=None):
         """Update images on the screen and flip to the new screen."""
-        # Fill the screen with the background color
-        screen.fill(settings.bg_color)
-        
+        particles = game_state_manager.particles if game_state_manager else None
+        Renderer.draw_world(settings, screen, player, base, enemy_wave, beams, game_state, starfield, particles)
+        if profiler is not None:
+            profiler.lap("render")
+
+        # Draw the UI with resource manager and game state manager
+        ui.display(game_state, player, base, enemy_wave.wave_number, resource_manager, game_state_manager)
+        if profiler is not None:
+            profiler.lap("ui")
+            if profiler.visible:
+                profiler.draw(screen)
+
+        # Make the most recently drawn screen visible
+        pygame.display.flip()
+        if profiler is not None:
+            profiler.lap("render")
+
+    @staticmethod
+    def draw_world(settings, screen, player, base, enemy_wave, beams, game_state, starfield=None, particles=None):
+        """Draw the background and game objects, without the UI."""
+        # Draw the starfield, or fill the screen with the background color
+        if starfield is not None:
+            starfield.draw(screen)
+        else:
+            screen.fill(settings.bg_color)
+
         # Draw the base
         base.draw()
-        
+
         # Draw the player
         if game_state == "playing":
             player.blitme()
-            
+
             # Draw all beams
             for beam in beams.sprites():
                 beam.draw_beam()
-                
-            # Draw all aliens
-            enemy_wave.aliens.draw(screen)
-        
-        # Draw the UI with resource manager and game state manager
+
+            # Draw the aliens in view
+            enemy_wave.draw(screen)
+
+            # Draw particle effects on top
+            if particles is not None:
+                particles.draw(screen)
+
+def cluster_rects(left, top, right, bottom, cell=64):
+    """Return one rect per `cell`-sized grid square bounding the boxes whose top-left lies in it.
+
+    Boxes are given as arrays of edges. Nearby sprites share a rect, while
+    sprites far apart never pull empty screen between them into one.
+    """
+    if not len(left):
+        return []
+    keys = (np.asarray(top) // cell) * 65536 + np.asarray(left) // cell
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    lefts = np.minimum.reduceat(np.asarray(left)[order], starts).tolist()
+    tops = np.minimum.reduceat(np.asarray(top)[order], starts).tolist()
+    rights = np.maximum.reduceat(np.asarray(right)[order], starts).tolist()
+    bottoms = np.maximum.reduceat(np.asarray(bottom)[order], starts).tolist()
+    return [pygame.Rect(x, y, x2 - x, y2 - y) for x, y, x2, y2 in zip(lefts, tops, rights, bottoms)]
+
+class DirtyRectRenderer(Renderer):
+    """Renderer that only redraws and presents the parts of the screen that changed.
+
+    Gameplay frames erase the previous frame's sprite areas by restoring the
+    background (the starfield, or the fill color) inside them, redraw the
+    sprites and the HUD, and push just the dirty areas with
+    pygame.display.update(). Moving sprites lie inside the dirty areas by
+    construction; the static base is only redrawn when one touches it. The
+    dirty areas are the player, one rect per cluster of nearby beams, aliens
+    or particles, the stars that moved or twinkled, and the HUD regions when
+    their values change. The whole frame is drawn and flipped only after a
+    static screen, or when the changed stars would cover most of the screen.
+    The static menu and game-over screens are only drawn and presented once.
+    """
+
+    def __init__(self):
+        """Initialize the renderer with nothing presented yet."""
+        self.static_screen = None  # Key of the static screen on display
+        self.previous_rects = []  # Sprite areas presented last frame
+        self.hud_key = None  # HUD values presented last frame
+
+    def update_screen(self, settings, screen, player, base, enemy_wave, beams, ui, game_state, resource_manager=None, game_state_manager=None, starfield=None, profiler=None):
+        """Redraw and present only the dirty areas of a gameplay frame."""
+        if game_state != "playing" and not (profiler is not None and profiler.visible):
+            self._update_static_screen(settings, screen, player, base, enemy_wave, beams, ui, game_state, starfield)
+            return
+
+        particles = game_state_manager.particles if game_state_manager else None
+        sprite_rects = self._sprite_rects(player, enemy_wave, beams, particles)
+        star_rects = starfield.dirty_rects() if starfield is not None else []
+        hud_key = self._hud_key(player, base, enemy_wave, resource_manager, game_state_manager)
+
+        full_frame = self.hud_key is None or star_rects is None
+        if full_frame:
+            # First playing frame, or one after a static screen or with a
+            # starfield that changed most of the screen: draw everything
+            self.draw_world(settings, screen, player, base, enemy_wave, beams, game_state, starfield, particles)
+        else:
+            dirty_rects = self.previous_rects + sprite_rects + star_rects
+            if hud_key != self.hud_key:
+                dirty_rects.extend(ui.gameplay_screen.get_hud_rects())
+                dirty_rects.append(base.rect.copy())
+            self._restore_background(settings, screen, starfield, dirty_rects)
+            self._draw_sprites(screen, player, base, enemy_wave, beams, particles, dirty_rects)
+        if profiler is not None:
+            profiler.lap("render")
         ui.display(game_state, player, base, enemy_wave.wave_number, resource_manager, game_state_manager)
-        
-        # Make the most recently drawn screen visible
+        if profiler is not None:
+            profiler.lap("ui")
+            if profiler.visible:
+                profiler.draw(screen)
+                # Restored under next frame, like a sprite
+                sprite_rects.append(profiler.rect.copy())
+                if not full_frame:
+                    dirty_rects.append(profiler.rect.copy())
+
+        if full_frame:
+            pygame.display.flip()
+            self.static_screen = None
+        else:
+            pygame.display.update(dirty_rects)
+
+        self.previous_rects = sprite_rects
+        self.hud_key = hud_key
+        if profiler is not None:
+            profiler.lap("render")
+
+    @staticmethod
+    def _restore_background(settings, screen, starfield, rects):
+        """Redraw the background inside the given areas only."""
+        if starfield is not None:
+            starfield.draw(screen, rects)
+        else:
+            bg_color = settings.bg_color
+            for rect in rects:
+                screen.fill(bg_color, rect)
+
+    @staticmethod
+    def _draw_sprites(screen, player, base, enemy_wave, beams, particles, rects):
+        """Draw the game objects over restored areas, in draw_world's order."""
+        if base.rect.collidelist(rects) != -1:
+            base.draw()
+        player.blitme()
+        for beam in beams.sprites():
+            beam.draw_beam()
+        enemy_wave.draw(screen)
+        if particles is not None:
+            particles.draw(screen)
+
+    def _update_static_screen(self, settings, screen, player, base, enemy_wave, beams, ui, game_state, starfield=None):
+        """Draw and present a static screen only when it changes."""
+        static_screen = (game_state, ui.victory)
+        if static_screen == self.static_screen:
+            return
+
+        self.draw_world(settings, screen, player, base, enemy_wave, beams, game_state, starfield)
+        ui.display(game_state)
         pygame.display.flip()
-        
+        self.static_screen = static_screen
+        self.previous_rects = []
+        self.hud_key = None
+
+    @staticmethod
+    def _sprite_rects(player, enemy_wave, beams, particles=None):
+        """Return the player's rect and one rect per cluster of beams, aliens and particles."""
+        rects = [player.rect.copy()]
+        for sprites in (beams.sprites(), enemy_wave.visible_aliens().sprites()):
+            if sprites:
+                boxes = np.array([(rect.left, rect.top, rect.right, rect.bottom)
+                                  for rect in [sprite.rect for sprite in sprites]])
+                rects.extend(cluster_rects(*boxes.T))
+        if particles is not None and particles.count:
+            rects.extend(cluster_rects(*particles.boxes()))
+        return rects
+
     @staticmethod
-    def draw_stars(screen, stars):
-        """Draw stars on the screen."""
-        for x, y, size, color in stars:
-            pygame.draw.circle(screen, color, (x, y), size) 
\ No newline at end of file
+    def _hud_key(player, base, enemy_wave, resource_manager, game_state_manager):
+        """Return the values shown on the HUD, to detect when it must be redrawn."""
+        return (
+            enemy_wave.wave_number,
+            player.health,
+            resource_manager.gems if resource_manager else None,
+            base.defense_level,
+            base.health,
+            player.weapon.level,
+            player.speed_level,
+            player.fire_rate_level,
+            game_state_manager.show_upgrade_message if game_state_manager else False,
+            game_state_manager.upgrade_message if game_state_manager else "",
+            game_state_manager.upgrade_hint if game_state_manager else None,
+        )
@@ -0,0 +1,123 @@
+# Deterministic input recording and replay
+import struct
+import time
+
+from simulation import Simulation
+
+# UI actions are stored as small integer codes
+ACTIONS = (None, "start_game", "exit_game", "restart_game", "upgrade_defense",
+           "upgrade_weapon", "upgrade_speed", "upgrade_fire_rate")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+# Input mask bits
+MOVE_LEFT = 1
+MOVE_RIGHT = 2
+
+def input_mask(player):
+    """Pack the player's movement flags into an input mask."""
+    return (MOVE_LEFT if player.moving_left else 0) | (MOVE_RIGHT if player.moving_right else 0)
+
+class Replay:
+    """A recorded run: the seed, the input changes per tick and the final state.
+
+    Only ticks where the input mask changes or a UI action happens are
+    stored, so a long run with little input stays a few kilobytes.
+    """
+
+    MAGIC = b"AIRP"
+    VERSION = 1
+    # Magic, version, has seed, seed, tick count, event count, state hash
+    HEADER = struct.Struct("<4sBBqII20s")
+    # Tick, input mask, action code
+    EVENT = struct.Struct("<IBB")
+
+    def __init__(self, seed=None, events=None, ticks=0, state_hash=bytes(20)):
+        """Initialize a replay."""
+        self.seed = seed
+        self.events = events if events is not None else []
+        self.ticks = ticks
+        self.state_hash = state_hash
+
+    def to_bytes(self):
+        """Serialize the replay to its binary format."""
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, self.seed is not None, self.seed or 0,
+            self.ticks, len(self.events), self.state_hash)
+        pack = self.EVENT.pack
+        return header + b"".join(pack(*event) for event in self.events)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a replay from its binary format."""
+        magic, version, has_seed, seed, ticks, count, state_hash = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError("Not a supported replay file")
+        start = cls.HEADER.size
+        end = start + count * cls.EVENT.size
+        events = list(cls.EVENT.iter_unpack(data[start:end]))
+        return cls(seed if has_seed else None, events, ticks, state_hash)
+
+    def save(self, path):
+        """Write the replay to a file."""
+        with open(path, "wb") as replay_file:
+            replay_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay from a file."""
+        with open(path, "rb") as replay_file:
+            return cls.from_bytes(replay_file.read())
+
+class ReplayRecorder:
+    """Records the inputs a Simulation receives, one call per tick."""
+
+    def __init__(self, seed=None):
+        """Initialize an empty recording."""
+        self.replay = Replay(seed)
+        self._mask = 0
+
+    def record(self, tick, player, action):
+        """Record the player's input flags and the UI action for a tick."""
+        mask = input_mask(player)
+        if mask != self._mask or action is not None:
+            self.replay.events.append((tick, mask, ACTION_CODES.get(action, 0)))
+            self._mask = mask
+
+    def finish(self, simulation):
+        """Stamp the final tick count and state hash and return the replay."""
+        self.replay.ticks = simulation.tick_count
+        self.replay.state_hash = simulation.state_hash()
+        return self.replay
+
+def play_replay(replay, settings=None):
+    """Replay a recording headlessly at full speed and check the final state.
+
+    Returns the simulation summary with the expected and actual hashes and
+    whether they match.
+    """
+    simulation = Simulation(settings, seed=replay.seed)
+    events = replay.events
+    next_event = 0
+    mask = 0
+
+    start_time = time.perf_counter()
+    for tick in range(replay.ticks):
+        action = None
+        if next_event < len(events) and events[next_event][0] == tick:
+            _, mask, code = events[next_event]
+            action = ACTIONS[code]
+            next_event += 1
+
+        player = simulation.game_state_manager.player
+        player.moving_left = bool(mask & MOVE_LEFT)
+        player.moving_right = bool(mask & MOVE_RIGHT)
+        simulation.step(action)
+
+    elapsed = time.perf_counter() - start_time
+
+    summary = simulation.summary(replay.ticks, elapsed)
+    state_hash = simulation.state_hash()
+    summary["expected_hash"] = replay.state_hash.hex()
+    summary["state_hash"] = state_hash.hex()
+    summary["match"] = state_hash == replay.state_hash
+    return summary
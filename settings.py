@@ -1,10 +1,19 @@
 # Stores game configurations
+import copy
+
 class Settings:
     def __init__(self):
         # Screen settings
         self.screen_width = 1200
         self.screen_height = 800
         self.bg_color = (0, 0, 0)  # Black background
+        self.dirty_rect_rendering = False  # Present only changed screen areas
+        
+        # Starfield settings
+        self.star_count = 100
+        self.starfield_layers = 3  # Parallax layers, back to front
+        self.star_speed = 1  # Scroll speed of the nearest layer in pixels per frame
+        self.star_twinkle_chance = 0.05  # Chance per frame that a star twinkles
         
         # Player settings
         self.player_speed = 5
@@ -13,6 +22,7 @@ class Settings:
         self.player_beam_width = 3
         self.player_beam_color = (0, 255, 0)  # Green beam
         self.auto_fire_delay = 100  # Delay between auto-shots in milliseconds
+        self.beam_pool_size = 128  # Maximum number of beams in flight
         
         # Enemy settings
         self.enemy_speed = 1  # Reduced from 2 to 1
@@ -21,11 +31,45 @@ class Settings:
         self.enemy_points = 50  # Points earned for destroying an enemy
         self.wave_increment = 5  # Number of additional enemies per wave
         self.fleet_direction = 1  # 1 represents right; -1 represents left
+        self.fleet_backend = "sprites"  # 'sprites' or 'numpy' (struct-of-arrays)
+        self.endless_mode = False  # Waves keep growing past the screen and never end in victory
+        self.endless_rows_per_wave = 2  # Rows added to the fleet each wave in endless mode
+        self.cull_margin = 20  # Pixels beyond the screen where aliens still count as visible
+        
+        # Particle settings
+        self.particle_budget = 2000  # Maximum live particles across all effects
+        self.particle_gravity = 0.1
+        self.explosion_particles = 12  # Particles emitted per destroyed alien
+        
+        # Collision settings
+        self.use_spatial_hash = True  # False falls back to groupcollide
+        self.collision_cell_size = 64  # Spatial hash cell size in pixels
         
         # Resource settings
         self.initial_gems = 100
         self.upgrade_cost = 50
+        self.upgrade_hint_income = 600  # Gems per wave the in-game upgrade hint plans with
+        self.upgrade_hint_waves = 2  # Waves the in-game upgrade hint plans ahead
         
         # Game settings
-        self.fps = 60
-        self.difficulty_scale = 1.2  # Multiplier for difficulty increase per wave 
\ No newline at end of file
+        self.fps = 60  # Simulation ticks per second
+        self.render_fps = 60  # Frame rate cap for drawing; 0 draws uncapped
+        self.max_ticks_per_frame = 5  # Ticks run before drawing under load
+        self.interpolate_rendering = True  # Draw between the last two ticks
+        self.profiler_frames = 600  # Frames kept by the frame profiler
+        self.telemetry_queue_size = 4096  # Telemetry records buffered before new ones drop
+        self.victory_wave = 5  # Waves to clear for a victory outside endless mode
+        self.difficulty_scale = 1.2  # Multiplier for difficulty increase per wave
+        
+    def copy(self, **overrides):
+        """Return an independent snapshot of these settings.
+        
+        Keyword arguments override fields in the copy; unknown field names
+        raise AttributeError so typos are not silently ignored.
+        """
+        snapshot = copy.copy(self)
+        for name, value in overrides.items():
+            if not hasattr(snapshot, name):
+                raise AttributeError(f"Settings has no field '{name}'")
+            setattr(snapshot, name, value)
+        return snapshot
@@ -0,0 +1,187 @@
+# Headless fixed-timestep simulation engine
+import hashlib
+import time
+
+from settings import Settings
+from collision_handler import CollisionHandler
+from game_state import GameStateManager
+from spatial_hash import SpatialHash
+from autopilot import GameView
+
+class Simulation:
+    """Advances the game one logical tick at a time without a display.
+
+    Game time is derived from the tick count rather than the wall clock, so
+    a run is reproducible and can go as fast as the CPU allows. The live
+    game loop drives the same object once per frame.
+
+    Each simulation works on its own snapshot of the settings, and without
+    a screen it allocates no surface at all, so many can run side by side
+    in one process.
+    """
+
+    def __init__(self, settings=None, screen=None, seed=None):
+        """Initialize the simulation around a fresh game state manager."""
+        self.settings = settings.copy() if settings is not None else Settings()
+        self.screen = screen  # None runs without any surface
+        self.seed = seed  # Seeds this game's own generators; global state is left alone
+
+        self.tick_count = 0
+        self.recorder = None  # Optional ReplayRecorder fed with every tick's input
+        self.profiler = None  # Optional FrameProfiler timing update and collisions
+        self.policy = None  # Optional autopilot Policy driving the player
+        self.view = GameView(self)
+        self.game_state_manager = GameStateManager(
+            self.settings, self.screen, clock=self.get_time, seed=seed)
+        self.collision_handler = CollisionHandler()
+        self.spatial_hash = None
+        if self.settings.use_spatial_hash:
+            self.spatial_hash = SpatialHash(self.settings.collision_cell_size)
+
+    def get_time(self):
+        """Return the game time in milliseconds for the current tick."""
+        return self.tick_count * 1000 // self.settings.fps
+
+    def step(self, action=None):
+        """Advance the game by a single tick, applying an optional UI action."""
+        game_state_manager = self.game_state_manager
+        if self.policy is not None and game_state_manager.get_state() == "playing":
+            policy_action = self.apply_policy()
+            if action is None:
+                action = policy_action
+        if self.recorder is not None:
+            self.recorder.record(self.tick_count, game_state_manager.player, action)
+        result = game_state_manager.handle_action(action)
+
+        if game_state_manager.get_state() == "playing":
+            game_state_manager.fire_beams()
+            self.update()
+            # After collisions, so the hint matches the gems shown this tick
+            game_state_manager.update_upgrade_hint()
+
+        self.tick_count += 1
+        return result
+
+    def apply_policy(self):
+        """Set the player's movement from the policy and return its action."""
+        move, action = self.policy.act(self.view)
+        player = self.game_state_manager.player
+        player.moving_left = move < 0
+        player.moving_right = move > 0
+        return action
+
+    def update(self):
+        """Update game objects, collisions and the base for one tick."""
+        profiler = self.profiler
+        self.game_state_manager.update_playing_state()
+        if profiler is not None:
+            profiler.lap("update")
+        if self.game_state_manager.get_state() == "playing":
+            self.check_collisions()
+        if profiler is not None:
+            profiler.lap("collisions")
+
+    def check_collisions(self):
+        """Resolve beam hits and aliens reaching the base."""
+        game_state_manager = self.game_state_manager
+
+        # Check for beam-alien collisions; beams never leave the screen,
+        # so culled aliens cannot be hit
+        gems = game_state_manager.resource_manager.gems
+        destroyed = self.collision_handler.check_beam_alien_collisions(
+            game_state_manager.beams,
+            game_state_manager.enemy_wave.visible_aliens(),
+            game_state_manager.resource_manager,
+            self.spatial_hash
+        )
+        
+        # Burst each destroyed alien into debris
+        for alien in destroyed:
+            game_state_manager.particles.emit_explosion(*alien.rect.center)
+        kills = len(destroyed)
+        if kills:
+            total = game_state_manager.resource_manager.gems
+            game_state_manager.emit("kills", count=kills, gems=total - gems)
+            game_state_manager.emit("gems_earned", amount=total - gems, total=total)
+
+        # Check if aliens have reached the bottom
+        base = game_state_manager.base
+        health = base.health
+        if self.collision_handler.check_aliens_bottom(
+            self.screen,
+            game_state_manager.enemy_wave,
+            base
+        ):
+            game_state_manager.emit("base_damage", damage=health - base.health, health=base.health)
+            # Check if base is destroyed
+            if base.health <= 0:
+                game_state_manager.end_game(victory=False)
+
+    def run(self, ticks):
+        """Run up to `ticks` ticks as fast as possible and return a summary.
+
+        A new game is started if the simulation is still on the menu, and
+        the run stops early once the game is over.
+        """
+        if self.game_state_manager.get_state() == "menu":
+            self.step("start_game")
+            ticks -= 1
+
+        start_tick = self.tick_count
+        start_time = time.perf_counter()
+        for _ in range(ticks):
+            if self.game_state_manager.get_state() != "playing":
+                break
+            self.step()
+        elapsed = time.perf_counter() - start_time
+
+        return self.summary(self.tick_count - start_tick, elapsed)
+
+    def state_hash(self):
+        """Return a SHA-1 digest of the gameplay state.
+
+        Covers everything that affects how the game plays out: resources,
+        upgrades, base health, the player, fleet movement and every alien
+        and beam. Visual-only state such as particles is left out.
+        """
+        game_state_manager = self.game_state_manager
+        player = game_state_manager.player
+        base = game_state_manager.base
+        enemy_wave = game_state_manager.enemy_wave
+        enemy_wave.sync_rects()
+        state = (
+            self.tick_count,
+            game_state_manager.get_state(),
+            game_state_manager.victory,
+            game_state_manager.resource_manager.gems,
+            base.health, base.max_health, base.defense_level,
+            player.centerx, player.weapon.level, player.speed_level,
+            player.fire_rate_level, player.last_shot_time,
+            enemy_wave.wave_number, enemy_wave.movement_phase,
+            enemy_wave.steps_moved, enemy_wave.fleet_direction,
+            enemy_wave.enemy_speed,
+            sorted((alien.rect.x, alien.rect.y, alien.health) for alien in enemy_wave.aliens),
+            sorted((beam.rect.x, beam.y, beam.damage) for beam in game_state_manager.beams),
+        )
+        return hashlib.sha1(repr(state).encode()).digest()
+
+    def summary(self, ticks_run=None, elapsed=None):
+        """Return a JSON-serializable summary of the current game."""
+        game_state_manager = self.game_state_manager
+        summary = {
+            "ticks": self.tick_count,
+            "seed": self.seed,
+            "state": game_state_manager.get_state(),
+            "victory": game_state_manager.victory,
+            # The wave number only advances once the previous wave is cleared
+            "waves_cleared": game_state_manager.enemy_wave.wave_number,
+            "gems": game_state_manager.resource_manager.gems,
+            "base_health": game_state_manager.base.health,
+            "aliens_remaining": len(game_state_manager.enemy_wave.aliens),
+            "beam_pool_high_water": game_state_manager.beam_pool.high_water,
+        }
+        if elapsed is not None:
+            summary["elapsed_s"] = round(elapsed, 4)
+            summary["ticks_per_sec"] = (
+                round(ticks_run / elapsed, 1) if elapsed > 0 else None)
+        return summary
@@ -0,0 +1,237 @@
+# Compact binary game-state snapshots
+#
+# A snapshot holds everything that decides how a game plays on from a tick:
+# the simulation clock, resources, player and base upgrades, the enemy wave's
+# movement counters, every alien and every beam. Restoring it gives a fresh
+# headless Simulation that continues exactly as the original would, so runs
+# can be checkpointed and forked into many continuations.
+#
+#     snapshot = Snapshot.capture(simulation)
+#     snapshot.save("wave4.aisn")
+#     forks = Snapshot.load("wave4.aisn").fork(100)
+import struct
+import sys
+from array import array
+
+from simulation import Simulation
+
+# Game states and fleet movement phases are stored as small integer codes
+STATES = ("menu", "playing", "game_over")
+PHASES = ("sideways", "down")
+
+# Bits of the player input flags
+MOVING_LEFT = 1
+MOVING_RIGHT = 2
+
+# Bits marking numbers that were ints; they are stored as doubles
+BASE_HEALTH_INT = 1
+PLAYER_X_INT = 2
+ENEMY_SPEED_INT = 4
+
+def _int_flag(value, flag):
+    """Return `flag` if value is an int, so a restore can give back its type."""
+    return flag if isinstance(value, int) else 0
+
+def _number(value, flags, flag):
+    """Turn a stored double back into an int if it was one."""
+    return int(value) if flags & flag else value
+
+def _pack_array(typecode, values):
+    """Return values as little-endian array bytes."""
+    values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+def _unpack_array(typecode, data, offset, count):
+    """Read `count` little-endian values at `offset`; return them and the new offset."""
+    values = array(typecode)
+    end = offset + count * values.itemsize
+    values.frombytes(data[offset:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values, end
+
+class Snapshot:
+    """The serialized gameplay state of one Simulation at one tick.
+
+    The fixed-size state is one struct; aliens and beams follow as
+    columns of typed arrays, so saving and loading a full fleet costs a
+    few array copies rather than a call per sprite. Settings are not part
+    of the snapshot: a restore uses the settings it is given, which lets a
+    sweep start many setting variations from the same position. Particles
+    and the starfield are visual only and start empty.
+    """
+
+    MAGIC = b"AISN"
+    VERSION = 1
+    HEADER = struct.Struct("<4sB")
+    STATE = struct.Struct(
+        "<"
+        "?qqB"  # Has seed, seed, tick count, game state
+        "??iH"  # Victory, message shown, message timer, message length
+        "qdqiB"  # Gems, base health, base max health, defense level, int flags
+        "dBiiiq"  # Player x, input flags, weapon, speed and fire rate levels, last shot
+        "idbiBiiiqqq"  # Wave number, speed, direction, rows, phase, steps, movement counters
+        "IIII"  # Beam pool high water and recycled, alien count, beam count
+    )
+
+    def __init__(self, data):
+        """Wrap serialized snapshot bytes."""
+        magic, version = self.HEADER.unpack_from(data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Not a supported snapshot file")
+        self.data = bytes(data)
+
+    @classmethod
+    def capture(cls, simulation):
+        """Snapshot a simulation's current state."""
+        game_state_manager = simulation.game_state_manager
+        player = game_state_manager.player
+        base = game_state_manager.base
+        enemy_wave = game_state_manager.enemy_wave
+        beam_pool = game_state_manager.beam_pool
+        formation = enemy_wave.formation()
+        beams = beam_pool.active_beams()
+        message = game_state_manager.upgrade_message.encode("utf-8")
+
+        flags = (_int_flag(base.health, BASE_HEALTH_INT)
+                 | _int_flag(player.centerx, PLAYER_X_INT)
+                 | _int_flag(enemy_wave.enemy_speed, ENEMY_SPEED_INT))
+        state = cls.STATE.pack(
+            simulation.seed is not None, simulation.seed or 0, simulation.tick_count,
+            STATES.index(game_state_manager.state),
+            game_state_manager.victory, game_state_manager.show_upgrade_message,
+            game_state_manager.message_timer, len(message),
+            game_state_manager.resource_manager.gems,
+            base.health, base.max_health, base.defense_level, flags,
+            player.centerx,
+            (MOVING_LEFT if player.moving_left else 0) | (MOVING_RIGHT if player.moving_right else 0),
+            player.weapon.level, player.speed_level, player.fire_rate_level,
+            player.last_shot_time,
+            enemy_wave.wave_number, enemy_wave.enemy_speed, enemy_wave.fleet_direction,
+            enemy_wave.max_rows, PHASES.index(enemy_wave.movement_phase),
+            enemy_wave.steps_moved, enemy_wave.sideways_steps, enemy_wave.down_steps,
+            enemy_wave.net_steps, enemy_wave.down_moves, enemy_wave.bounces,
+            beam_pool.high_water, beam_pool.recycled, len(formation), len(beams),
+        )
+        parts = [cls.HEADER.pack(cls.MAGIC, cls.VERSION), state, message]
+        if formation:
+            home_x, home_y, health = zip(*formation)
+            parts += [_pack_array("i", home_x), _pack_array("i", home_y),
+                      _pack_array("d", health)]
+        if beams:
+            parts += [
+                _pack_array("i", [beam.rect.x for beam in beams]),
+                _pack_array("d", [beam.y for beam in beams]),
+                _pack_array("i", [beam.damage for beam in beams]),
+                _pack_array("B", [channel for beam in beams for channel in beam.color]),
+                _pack_array("B", [beam.alive() for beam in beams]),
+            ]
+        return cls(b"".join(parts))
+
+    def to_bytes(self):
+        """Return the serialized snapshot."""
+        return self.data
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a snapshot."""
+        return cls(data)
+
+    def save(self, path):
+        """Write the snapshot to a file."""
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(self.data)
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot from a file."""
+        with open(path, "rb") as snapshot_file:
+            return cls(snapshot_file.read())
+
+    @property
+    def tick_count(self):
+        return self.STATE.unpack_from(self.data, self.HEADER.size)[2]
+
+    def restore(self, settings=None):
+        """Return a new headless Simulation in the snapshot's state."""
+        data = self.data
+        (has_seed, seed, tick_count, state, victory, show_message, message_timer,
+         message_length, gems, base_health, base_max_health, defense_level, flags,
+         player_x, input_flags, weapon_level, speed_level, fire_rate_level, last_shot_time,
+         wave_number, enemy_speed, fleet_direction, max_rows, phase, steps_moved,
+         sideways_steps, down_steps, net_steps, down_moves, bounces,
+         high_water, recycled, alien_count, beam_count) = self.STATE.unpack_from(
+            data, self.HEADER.size)
+        offset = self.HEADER.size + self.STATE.size
+        message = data[offset:offset + message_length].decode("utf-8")
+        offset += message_length
+
+        simulation = Simulation(settings)
+        simulation.seed = seed if has_seed else None
+        simulation.tick_count = tick_count
+        game_state_manager = simulation.game_state_manager
+        game_state_manager.state = STATES[state]
+        game_state_manager.victory = victory
+        game_state_manager.show_upgrade_message = show_message
+        game_state_manager.upgrade_message = message
+        game_state_manager.message_timer = message_timer
+        game_state_manager.resource_manager.gems = gems
+
+        base = game_state_manager.base
+        base.health = _number(base_health, flags, BASE_HEALTH_INT)
+        base.max_health = base_max_health
+        base.defense_level = defense_level
+
+        player = game_state_manager.player
+        player.centerx = _number(player_x, flags, PLAYER_X_INT)
+        player.rect.centerx = player.centerx
+        player.moving_left = bool(input_flags & MOVING_LEFT)
+        player.moving_right = bool(input_flags & MOVING_RIGHT)
+        for _ in range(weapon_level - 1):
+            player.weapon.upgrade()
+        player.speed_level = speed_level
+        player.fire_rate_level = fire_rate_level
+        player.last_shot_time = last_shot_time
+
+        # Movement counters come first so aliens are placed at the offset
+        enemy_wave = game_state_manager.enemy_wave
+        enemy_wave.wave_number = wave_number
+        enemy_wave.enemy_speed = _number(enemy_speed, flags, ENEMY_SPEED_INT)
+        enemy_wave.fleet_direction = fleet_direction
+        enemy_wave.max_rows = max_rows
+        enemy_wave.movement_phase = PHASES[phase]
+        enemy_wave.steps_moved = steps_moved
+        enemy_wave.sideways_steps = sideways_steps
+        enemy_wave.down_steps = down_steps
+        enemy_wave.net_steps = net_steps
+        enemy_wave.down_moves = down_moves
+        enemy_wave.bounces = bounces
+        home_x, offset = _unpack_array("i", data, offset, alien_count)
+        home_y, offset = _unpack_array("i", data, offset, alien_count)
+        health, offset = _unpack_array("d", data, offset, alien_count)
+        enemy_wave.set_formation(list(zip(home_x, home_y, health)))
+
+        beam_x, offset = _unpack_array("i", data, offset, beam_count)
+        beam_y, offset = _unpack_array("d", data, offset, beam_count)
+        damage, offset = _unpack_array("i", data, offset, beam_count)
+        colors, offset = _unpack_array("B", data, offset, beam_count * 3)
+        alive, offset = _unpack_array("B", data, offset, beam_count)
+        colors = [tuple(colors[i:i + 3]) for i in range(0, len(colors), 3)]
+        beam_pool = game_state_manager.beam_pool
+        beam_pool.restore(zip(beam_x, beam_y, damage, colors, map(bool, alive)))
+        beam_pool.high_water = high_water
+        beam_pool.recycled = recycled
+        return simulation
+
+    def fork(self, count, settings=None, policy_factory=None):
+        """Return `count` independent simulations continuing from the snapshot.
+
+        Each fork gets its own policy from `policy_factory` if one is given.
+        """
+        simulations = [self.restore(settings) for _ in range(count)]
+        if policy_factory is not None:
+            for simulation in simulations:
+                simulation.policy = policy_factory()
+        return simulations
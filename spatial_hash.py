@@ -0,0 +1,89 @@
+# Uniform-grid spatial hash broadphase
+from collections import defaultdict
+
+import pygame
+
+class SpatialHash:
+    """Buckets sprites by grid cell so rect tests only touch nearby sprites.
+
+    `groupcollide()` is a drop-in replacement for `pygame.sprite.groupcollide`
+    with rect collision: it returns the same dict, with the hit lists in the
+    same group order, and honours the same kill flags. Below `min_pairs`
+    candidate pairs the brute-force test is cheaper than bucketing, so it
+    defers to pygame.
+    """
+
+    def __init__(self, cell_size=64, min_pairs=1024):
+        """Initialize an empty grid with square cells of `cell_size` pixels."""
+        self.cell_size = cell_size
+        self.min_pairs = min_pairs
+        self.buckets = defaultdict(list)
+
+    def _cells(self, rect):
+        """Return the range of cell columns and rows a rect overlaps."""
+        cell_size = self.cell_size
+        left = rect.left // cell_size
+        right = max(rect.right - 1, rect.left) // cell_size
+        top = rect.top // cell_size
+        bottom = max(rect.bottom - 1, rect.top) // cell_size
+        return range(left, right + 1), range(top, bottom + 1)
+
+    def build(self, sprites):
+        """Bucket sprites by the cells their rects overlap."""
+        buckets = self.buckets
+        buckets.clear()
+        for index, sprite in enumerate(sprites):
+            columns, rows = self._cells(sprite.rect)
+            for column in columns:
+                for row in rows:
+                    buckets[(column, row)].append((index, sprite))
+
+    def query(self, rect):
+        """Return the bucketed sprites whose rects collide with `rect`.
+
+        Sprites are returned in the order they were passed to `build()`.
+        """
+        buckets = self.buckets
+        columns, rows = self._cells(rect)
+        if len(columns) == 1 and len(rows) == 1:
+            # Single cell: bucket order is already build order, no duplicates
+            bucket = buckets.get((columns[0], rows[0]))
+            if not bucket:
+                return []
+            return [sprite for _, sprite in bucket if rect.colliderect(sprite.rect)]
+
+        hits = {}
+        for column in columns:
+            for row in rows:
+                bucket = buckets.get((column, row))
+                if not bucket:
+                    continue
+                for index, sprite in bucket:
+                    if index not in hits and rect.colliderect(sprite.rect):
+                        hits[index] = sprite
+        return [hits[index] for index in sorted(hits)]
+
+    def groupcollide(self, groupa, groupb, dokilla, dokillb):
+        """Find all sprites in groupa that collide with sprites in groupb."""
+        crashed = {}
+        if not groupa or not groupb:
+            return crashed
+        if len(groupa) * len(groupb) < self.min_pairs:
+            return pygame.sprite.groupcollide(groupa, groupb, dokilla, dokillb)
+
+        self.build(groupb.sprites())
+        killed = set()
+        for sprite in groupa.sprites():
+            hits = self.query(sprite.rect)
+            if killed:
+                hits = [other for other in hits if other not in killed]
+            if not hits:
+                continue
+            if dokillb:
+                for other in hits:
+                    other.kill()
+                killed.update(hits)
+            crashed[sprite] = hits
+            if dokilla:
+                sprite.kill()
+        return crashed
@@ -0,0 +1,218 @@
+# Parameter sweep runner over Settings
+#
+# Runs many headless games for each point of a grid or random sample of
+# Settings overrides, spread across all CPU cores, and writes the aggregated
+# outcomes to a JSON results file.
+#
+#     python sweep.py --grid enemy_speed=1,1.5,2 auto_fire_delay=80,100 --games 16
+#     python sweep.py --sample 20 --range enemy_speed=0.5:2 upgrade_cost=25:100
+#     python sweep.py --grid upgrade_cost=25,50 --snapshot wave4.aisn
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from settings import Settings
+from simulation import Simulation
+from autopilot import make_policy
+from snapshot import Snapshot
+
+def grid(space):
+    """Return every combination of the values in `space`.
+
+    `space` maps a Settings field name to a list of values.
+    """
+    names = sorted(space)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(space[name] for name in names))]
+
+def random_sample(space, count, seed=None):
+    """Return `count` random points from `space`.
+
+    A list value is sampled by choice; a (low, high) tuple is sampled
+    uniformly, as integers when both ends are integers.
+    """
+    rng = random.Random(seed)
+    points = []
+    for _ in range(count):
+        point = {}
+        for name in sorted(space):
+            values = space[name]
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    point[name] = rng.randint(low, high)
+                else:
+                    point[name] = rng.uniform(low, high)
+            else:
+                point[name] = rng.choice(values)
+        points.append(point)
+    return points
+
+def make_settings(overrides):
+    """Build a Settings snapshot with `overrides` applied."""
+    return Settings().copy(**overrides)
+
+def play_game(overrides, seed, ticks, sample_every=600, policy_name=None, snapshot=None):
+    """Play one headless game and return its summary and gems curve.
+
+    The gems curve holds the gem count every `sample_every` ticks. The game
+    is played by the named autopilot policy, or by nobody if none is given.
+    Given snapshot bytes, the game continues from the snapshot for up to
+    `ticks` more ticks instead of starting from the menu.
+    """
+    settings = make_settings(overrides)
+    if snapshot is not None:
+        simulation = Snapshot.from_bytes(snapshot).restore(settings)
+    else:
+        simulation = Simulation(settings, seed=seed)
+    if policy_name:
+        simulation.policy = make_policy(policy_name)
+    end_tick = simulation.tick_count + ticks
+    gems_curve = []
+    start_time = time.perf_counter()
+    if simulation.game_state_manager.get_state() != "playing":
+        simulation.step("start_game")
+    resource_manager = simulation.game_state_manager.resource_manager
+    while (simulation.tick_count < end_tick
+           and simulation.game_state_manager.get_state() == "playing"):
+        simulation.step()
+        if simulation.tick_count % sample_every == 0:
+            gems_curve.append(resource_manager.gems)
+    elapsed = time.perf_counter() - start_time
+    summary = simulation.summary(simulation.tick_count, elapsed)
+    summary["gems_curve"] = gems_curve
+    return summary
+
+def _play_game_job(job):
+    """Process pool entry point: play one game of one sweep point."""
+    point_index, overrides, seed, ticks, sample_every, policy_name, snapshot = job
+    return point_index, play_game(overrides, seed, ticks, sample_every, policy_name, snapshot)
+
+def aggregate(overrides, games):
+    """Combine the summaries of one point's games into its outcome."""
+    count = len(games)
+    curve_length = max(len(game["gems_curve"]) for game in games)
+    gems_curve = []
+    for sample in range(curve_length):
+        # Games that ended early keep their final gem count
+        values = [game["gems_curve"][sample] if sample < len(game["gems_curve"])
+                  else game["gems"] for game in games]
+        gems_curve.append(round(sum(values) / count, 1))
+    total_ticks = sum(game["ticks"] for game in games)
+    total_elapsed = sum(game["elapsed_s"] for game in games)
+    return {
+        "overrides": overrides,
+        "games": count,
+        "win_rate": sum(1 for game in games if game["victory"]) / count,
+        "loss_rate": sum(1 for game in games
+                         if game["state"] == "game_over" and not game["victory"]) / count,
+        "mean_wave": sum(game["waves_cleared"] for game in games) / count,
+        "max_wave": max(game["waves_cleared"] for game in games),
+        "mean_ticks": total_ticks / count,
+        "mean_gems": sum(game["gems"] for game in games) / count,
+        "gems_curve": gems_curve,
+        "ticks_per_sec": round(total_ticks / total_elapsed, 1) if total_elapsed > 0 else None,
+    }
+
+def run_sweep(points, games=8, ticks=3600, seed=0, workers=None, sample_every=600,
+              policy_name=None, snapshot=None):
+    """Play `games` games for every point and return one outcome per point.
+
+    Game `n` of every point uses seed `seed + n`, so points are compared on
+    the same set of seeds. Games are spread across `workers` processes
+    (all CPU cores by default). With snapshot bytes every game continues
+    from the snapshot rather than starting a new game.
+    """
+    jobs = [(point_index, overrides, seed + game, ticks, sample_every, policy_name, snapshot)
+            for point_index, overrides in enumerate(points)
+            for game in range(games)]
+    summaries = [[] for _ in points]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for point_index, summary in executor.map(_play_game_job, jobs, chunksize=max(1, games // 2)):
+            summaries[point_index].append(summary)
+    return [aggregate(overrides, point_games)
+            for overrides, point_games in zip(points, summaries)]
+
+def _parse_value(text):
+    """Parse a number if possible, otherwise keep the text."""
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+def _parse_space(items, separator):
+    """Parse NAME=VALUES command line items into a sweep space."""
+    space = {}
+    for item in items or []:
+        name, _, values = item.partition("=")
+        if not values:
+            raise argparse.ArgumentTypeError(f"Expected NAME=VALUES, got '{item}'")
+        parsed = [_parse_value(value) for value in values.split(separator)]
+        space[name] = tuple(parsed) if separator == ":" else parsed
+    return space
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Sweep Settings overrides over headless games")
+    parser.add_argument("--grid", nargs="+", metavar="NAME=V1,V2",
+                        help="values to try for a Settings field; every combination is run")
+    parser.add_argument("--range", nargs="+", metavar="NAME=LOW:HIGH",
+                        help="range to sample a Settings field from (with --sample)")
+    parser.add_argument("--sample", type=int, default=0,
+                        help="sample this many random points instead of a full grid")
+    parser.add_argument("--games", type=int, default=8, help="games per point")
+    parser.add_argument("--ticks", type=int, default=3600, help="maximum ticks per game")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all CPU cores)")
+    parser.add_argument("--sample-every", type=int, default=600,
+                        help="ticks between gems curve samples")
+    parser.add_argument("--policy", default="track_greedy",
+                        help="autopilot policy that plays every game")
+    parser.add_argument("--snapshot", metavar="PATH", default=None,
+                        help="continue every game from a saved snapshot")
+    parser.add_argument("--output", default="sweep_results.json", help="results JSON file")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    space = _parse_space(args.grid, ",")
+    space.update(_parse_space(args.range, ":"))
+    if args.sample:
+        points = random_sample(space, args.sample, args.seed)
+    else:
+        if any(isinstance(values, tuple) for values in space.values()):
+            print("--range needs --sample", file=sys.stderr)
+            return 2
+        points = grid(space)
+
+    snapshot = Snapshot.load(args.snapshot).to_bytes() if args.snapshot else None
+    start_time = time.perf_counter()
+    outcomes = run_sweep(points, args.games, args.ticks, args.seed,
+                         args.workers, args.sample_every, args.policy, snapshot)
+    elapsed = time.perf_counter() - start_time
+
+    with open(args.output, "w") as results_file:
+        json.dump({"games": args.games, "ticks": args.ticks, "seed": args.seed,
+                   "policy": args.policy, "snapshot": args.snapshot,
+                   "elapsed_s": round(elapsed, 2), "points": outcomes},
+                  results_file, indent=2)
+
+    for outcome in outcomes:
+        print(f"{json.dumps(outcome['overrides'])}: win {outcome['win_rate']:.0%}, "
+              f"wave {outcome['mean_wave']:.1f}, gems {outcome['mean_gems']:.0f}")
+    print(f"Ran {len(points) * args.games} games in {elapsed:.1f}s; "
+          f"results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
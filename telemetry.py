@@ -0,0 +1,215 @@
+# Structured telemetry event log written by a background thread
+#
+# The game emits small records (state transitions, waves, kills, gems, upgrades,
+# base damage, frame stats) into a bounded in-memory queue; a writer thread
+# drains it in batches into an append-only file. Emitting never blocks: when
+# the queue is full the record is dropped and counted instead.
+#
+# Two file formats are supported: JSON lines, and a compact binary variant
+# where each record is a fixed struct chosen by its event type.
+import json
+import queue
+import struct
+import threading
+
+# Names stored as small integer codes in the binary format
+STATE_NAMES = ("menu", "playing", "game_over")
+UPGRADE_KINDS = ("defense", "weapon", "speed", "fire_rate")
+
+# Event name -> fields as (name, struct format, names for coded strings)
+EVENTS = {
+    "transition": (("previous", "B", STATE_NAMES), ("state", "B", STATE_NAMES)),
+    "wave_start": (("wave", "H", None), ("aliens", "I", None)),
+    "wave_end": (("wave", "H", None), ("bonus", "I", None)),
+    "kills": (("count", "I", None), ("gems", "I", None)),
+    "gems_earned": (("amount", "i", None), ("total", "q", None)),
+    "gems_spent": (("amount", "i", None), ("total", "q", None)),
+    "upgrade": (("kind", "B", UPGRADE_KINDS), ("level", "H", None), ("cost", "I", None)),
+    "upgrade_failed": (("kind", "B", UPGRADE_KINDS), ("cost", "I", None)),
+    "base_damage": (("damage", "f", None), ("health", "f", None)),
+    "game_over": (("victory", "?", None),),
+    "frame": (("frame_ms", "f", None), ("ticks", "H", None), ("aliens", "I", None),
+              ("beams", "H", None), ("particles", "I", None)),
+    "exit": (),
+}
+EVENT_CODES = {event: code for code, event in enumerate(EVENTS)}
+
+class BinaryEncoder:
+    """Encodes records as an event code, the game time and the event's fields.
+
+    Every record of one event type has the same size, so a reader walks the
+    file by looking up the struct for each record's leading code.
+    """
+
+    MAGIC = b"AITL\x01"
+
+    def __init__(self):
+        """Build one struct per event type."""
+        self.structs = {}
+        self.vocabularies = {}
+        for event, fields in EVENTS.items():
+            self.structs[event] = struct.Struct(
+                "<BI" + "".join(field_format for _, field_format, _ in fields))
+            self.vocabularies[event] = [
+                (name, {value: code for code, value in enumerate(names)} if names else None)
+                for name, _, names in fields]
+
+    def header(self):
+        return self.MAGIC
+
+    def encode(self, record):
+        event, time_ms, fields = record
+        values = [vocabulary[fields[name]] if vocabulary else fields[name]
+                  for name, vocabulary in self.vocabularies[event]]
+        return self.structs[event].pack(EVENT_CODES[event], time_ms, *values)
+
+    @classmethod
+    def decode(cls, data):
+        """Return the records in a binary telemetry file's contents as dicts."""
+        if not data.startswith(cls.MAGIC):
+            raise ValueError("Not a binary telemetry file")
+        encoder = cls()
+        events = list(EVENTS)
+        records = []
+        offset = len(cls.MAGIC)
+        while offset < len(data):
+            event = events[data[offset]]
+            record_struct = encoder.structs[event]
+            _, time_ms, *values = record_struct.unpack_from(data, offset)
+            offset += record_struct.size
+            record = {"event": event, "time": time_ms}
+            for (name, _, names), value in zip(EVENTS[event], values):
+                record[name] = names[value] if names else value
+            records.append(record)
+        return records
+
+class JsonEncoder:
+    """Encodes records as one JSON object per line."""
+
+    def header(self):
+        return b""
+
+    def encode(self, record):
+        event, time_ms, fields = record
+        return (json.dumps({"event": event, "time": time_ms, **fields},
+                           separators=(",", ":")) + "\n").encode()
+
+    @staticmethod
+    def decode(data):
+        """Return the records in a JSON lines telemetry file's contents."""
+        return [json.loads(line) for line in data.decode().splitlines() if line]
+
+ENCODERS = {"jsonl": JsonEncoder, "binary": BinaryEncoder}
+
+class TelemetryLog:
+    """Bounded, non-blocking event log flushed to disk by a writer thread.
+
+    `emit()` only appends a tuple to a queue of at most `queue_size`
+    records; when the writer falls behind, new records are dropped and
+    counted in `dropped`. The writer takes whatever is queued in one batch,
+    encodes it and appends it to the file with a single write, then waits
+    `flush_interval` seconds so the next batch is larger. Records the writer
+    cannot encode or write are counted in `failed` and reported as drops,
+    so a bad record never stops the writer.
+    """
+
+    CLOSE_TIMEOUT = 5.0  # Seconds close() waits for the writer
+
+    def __init__(self, path, format="jsonl", queue_size=4096, flush_interval=0.25):
+        """Open the log file for appending and start the writer thread."""
+        if format not in ENCODERS:
+            raise ValueError(f"Unknown telemetry format '{format}'; choose from {', '.join(ENCODERS)}")
+        self.path = path
+        self.format = format
+        self.flush_interval = flush_interval
+        self.emitted = 0
+        self.dropped = 0  # Records refused because the queue was full
+        self.failed = 0  # Records the writer could not encode or write
+        self.written = 0
+        self._encoder = ENCODERS[format]()
+        self._queue = queue.Queue(queue_size)
+        self._closed = False
+        self._closing = threading.Event()
+
+        self._file = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(self._encoder.header())
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+
+    def emit(self, event, time_ms, **fields):
+        """Queue a record without blocking; return False if it was dropped."""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown telemetry event '{event}'")
+        if self._closed:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((event, time_ms, fields))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.emitted += 1
+        return True
+
+    def _run(self):
+        """Writer thread: append queued records to the file in batches."""
+        records = self._queue
+        encode = self._encoder.encode
+        running = True
+        while running:
+            batch = [records.get()]
+            # Take everything already queued in the same write
+            while True:
+                try:
+                    batch.append(records.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()
+                running = False
+            encoded = []
+            for record in batch:
+                try:
+                    encoded.append(encode(record))
+                except Exception:  # Bad field values; drop the record, keep the writer
+                    self.failed += 1
+            try:
+                self._file.write(b"".join(encoded))
+                self._file.flush()
+                self.written += len(encoded)
+            except (OSError, ValueError):  # Full disk or closed file
+                self.failed += len(encoded)
+            # Let records collect into the next batch unless closing
+            self._closing.wait(self.flush_interval)
+
+    def stats(self):
+        """Return the log's record counters."""
+        return {"emitted": self.emitted, "written": self.written,
+                "dropped": self.dropped + self.failed, "failed": self.failed}
+
+    def close(self):
+        """Write out the queued records, stop the writer and close the file."""
+        if self._closed:
+            return
+        self._closed = True
+        self._closing.set()
+        if self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=self.CLOSE_TIMEOUT)  # Waits for room
+            except queue.Full:
+                pass
+            self._thread.join(self.CLOSE_TIMEOUT)
+        self._file.close()
+
+def read_log(path):
+    """Return every record in a telemetry file as a dict, in either format."""
+    with open(path, "rb") as log_file:
+        data = log_file.read()
+    if data.startswith(BinaryEncoder.MAGIC):
+        return BinaryEncoder.decode(data)
+    return JsonEncoder.decode(data)
+
+def open_log(path, queue_size=4096):
+    """Open a telemetry log, in the binary format if the path ends in .bin."""
+    return TelemetryLog(path, "binary" if path.endswith(".bin") else "jsonl", queue_size)
@@ -0,0 +1,61 @@
+import unittest
+import contextlib
+import io
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from simulation import Simulation
+from autopilot import (TrackNearestColumnPolicy, GreedyUpgradePolicy,
+                       CompositePolicy, make_policy)
+
+class TestAutopilot(unittest.TestCase):
+    def setUp(self):
+        self.simulation = Simulation(seed=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.simulation.step("start_game")
+
+    def test_view_reads_live_game(self):
+        """Test that the view reflects the current game objects."""
+        view = self.simulation.view
+        game_state_manager = self.simulation.game_state_manager
+        self.assertEqual(view.gems, game_state_manager.resource_manager.gems)
+        self.assertEqual(len(view.aliens), len(game_state_manager.enemy_wave.aliens))
+        self.assertEqual(view.upgrade_cost("weapon"), self.simulation.settings.upgrade_cost)
+
+    def test_tracker_moves_toward_lowest_alien(self):
+        """Test that the tracker steers under the alien closest to the base."""
+        alien = max(self.simulation.game_state_manager.enemy_wave.aliens,
+                    key=lambda alien: alien.rect.bottom)
+        alien.rect.centerx = 10
+        alien.rect.y += 100
+        move, action = TrackNearestColumnPolicy().act(self.simulation.view)
+        self.assertEqual((move, action), (-1, None))
+
+    def test_greedy_buys_cheapest_affordable_upgrade(self):
+        """Test that the greedy upgrader picks the cheapest upgrade it can afford."""
+        self.simulation.game_state_manager.player.weapon.upgrade()
+        move, action = GreedyUpgradePolicy(interval=1).act(self.simulation.view)
+        self.assertEqual(action, "upgrade_fire_rate")
+        self.simulation.game_state_manager.resource_manager.gems = 0
+        self.assertEqual(GreedyUpgradePolicy(interval=1).act(self.simulation.view), (0, None))
+
+    def test_composite_policy_plays_through_simulation(self):
+        """Test that a policy drives the player and buys upgrades in a run."""
+        self.simulation.policy = CompositePolicy(TrackNearestColumnPolicy(),
+                                                 GreedyUpgradePolicy())
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = self.simulation.run(3000)
+        self.assertGreater(summary["waves_cleared"], 0)
+        player = self.simulation.game_state_manager.player
+        self.assertGreater(player.weapon.level + player.fire_rate_level, 2)
+
+    def test_unknown_policy_name_is_rejected(self):
+        """Test that make_policy rejects names it does not know."""
+        with self.assertRaises(ValueError):
+            make_policy("cheat")
+
+if __name__ == '__main__':
+    unittest.main()
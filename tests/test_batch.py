@@ -0,0 +1,74 @@
+import unittest
+import contextlib
+import io
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from settings import Settings
+from simulation import Simulation
+from batch import SimulationBatch
+from autopilot import TrackNearestColumnPolicy
+
+class TestIsolation(unittest.TestCase):
+    def test_waves_do_not_change_settings(self):
+        """Test that spawning waves leaves the caller's settings untouched."""
+        settings = Settings()
+        simulation = Simulation(settings)
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulation.step("start_game")
+            for _ in range(3):
+                simulation.game_state_manager.enemy_wave.spawn_enemies()
+        self.assertEqual(settings.enemy_speed, 1)
+        self.assertEqual(simulation.settings.enemy_speed, 1)
+        self.assertGreater(simulation.game_state_manager.enemy_wave.enemy_speed, 1)
+
+    def test_settings_are_snapshotted(self):
+        """Test that changing settings after creation does not affect a simulation."""
+        settings = Settings()
+        simulation = Simulation(settings)
+        settings.enemy_health = 1
+        self.assertEqual(simulation.settings.enemy_health, 20)
+
+    def test_runs_without_a_surface(self):
+        """Test that a simulation needs no screen surface."""
+        simulation = Simulation(seed=1)
+        simulation.policy = TrackNearestColumnPolicy()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = simulation.run(2000)
+        self.assertIsNone(simulation.screen)
+        self.assertGreater(summary["waves_cleared"], 0)
+
+class TestSimulationBatch(unittest.TestCase):
+    def test_lockstep_games_match_solo_games(self):
+        """Test that games stepped together end exactly as when run alone."""
+        fast = Settings().copy(enemy_speed=2, enemy_drop_speed=20)
+        solo = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for settings in (Settings(), fast):
+                simulation = Simulation(settings)
+                simulation.policy = TrackNearestColumnPolicy()
+                simulation.run(1500)
+                solo.append(simulation.state_hash())
+
+            batch = SimulationBatch(2, policy_factory=TrackNearestColumnPolicy)
+            batch.simulations[1] = Simulation(fast)
+            batch.simulations[1].policy = TrackNearestColumnPolicy()
+            summaries = batch.run(1500)
+        self.assertEqual(len(summaries), 2)
+        self.assertEqual([simulation.state_hash() for simulation in batch.simulations], solo)
+
+    def test_finished_games_stop_stepping(self):
+        """Test that games that end are dropped from the active list."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            batch = SimulationBatch(3)
+            summaries = batch.run(6000)
+        self.assertEqual(batch.active, [])
+        for summary in summaries:
+            self.assertEqual(summary["state"], "game_over")
+            self.assertLess(summary["ticks"], 6000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.run_benchmarks import compare_to_baseline, pack_fleet, run_benchmarks, PHASES
+from settings import Settings
+from simulation import Simulation
+
+class TestBenchmarks(unittest.TestCase):
+    def test_regressions_beyond_threshold_are_reported(self):
+        """Test that only phases slower than threshold and noise floor fail."""
+        baseline = {"wave_1": {"update": 1.0, "ui": 0.01}}
+        results = {"wave_1": {"update": 1.3, "ui": 0.03}}
+        regressions = compare_to_baseline(results, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("wave_1/update"))
+
+    def test_scenario_reports_every_phase(self):
+        """Test that a short scenario run reports all phases."""
+        results = run_benchmarks(ticks=5, names=["wave_1"])
+        self.assertEqual(set(results["wave_1"]), set(PHASES) | {"total"})
+
+    def test_packed_fleet_is_built_on_both_backends(self):
+        """Test that the packed fleet scenario fills the sprite and NumPy fleets alike."""
+        pygame.init()
+        try:
+            for backend in ("sprites", "numpy"):
+                settings = Settings()
+                settings.fleet_backend = backend
+                screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+                simulation = Simulation(settings, screen, seed=0)
+                simulation.step("start_game")
+                pack_fleet(simulation, 500)
+                self.assertEqual(len(simulation.game_state_manager.enemy_wave.aliens), 500, backend)
+        finally:
+            pygame.quit()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pygame
+
+from capture import (FrameCapture, diff_images, frame_to_array, read_raw_frames, run_capture,
+                     surface_to_array)
+from textures import clear_textures
+from ui_components.fonts import clear_fonts
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+
+class TestImageDiff(unittest.TestCase):
+    def test_small_differences_are_tolerated(self):
+        """Test that channel differences within the tolerance do not count."""
+        expected = np.full((10, 10, 3), 100, dtype=np.uint8)
+        actual = expected.copy()
+        actual[:, :, 0] += 5
+        mask, max_difference = diff_images(actual, expected, tolerance=8)
+        self.assertEqual(int(mask.sum()), 0)
+        self.assertEqual(max_difference, 5)
+
+    def test_changed_pixels_are_counted(self):
+        """Test that pixels beyond the tolerance are marked as mismatched."""
+        expected = np.zeros((10, 10, 3), dtype=np.uint8)
+        actual = expected.copy()
+        actual[2:4, 2:5] = (0, 255, 0)
+        mask, max_difference = diff_images(actual, expected)
+        self.assertEqual(int(mask.sum()), 6)
+        self.assertEqual(max_difference, 255)
+
+    def test_size_change_mismatches_everything(self):
+        """Test that frames of different sizes never match."""
+        mask, _ = diff_images(np.zeros((4, 4, 3), np.uint8), np.zeros((4, 5, 3), np.uint8))
+        self.assertIsNone(mask)
+
+class TestFrameCapture(unittest.TestCase):
+    def tearDown(self):
+        """Tear down test fixtures."""
+        clear_fonts()
+        clear_textures()
+        pygame.quit()
+
+    def test_buffer_copy_matches_surface_pixels(self):
+        """Test that a copied display buffer converts to the surface's RGB pixels."""
+        pygame.display.init()
+        screen = pygame.display.set_mode((64, 48))
+        screen.fill((10, 20, 30))
+        screen.fill((200, 100, 50), pygame.Rect(5, 5, 10, 10))
+        rgb = frame_to_array(screen.get_buffer().raw, screen.get_size(),
+                             screen.get_pitch(), screen.get_shifts())
+        np.testing.assert_array_equal(rgb, surface_to_array(screen))
+
+    def test_frames_match_golden_images(self):
+        """Test that the menu and gameplay frames match the stored goldens."""
+        summary = run_capture(300, every=150, golden_dir=GOLDEN_DIR)
+        self.assertEqual([diff["frame"] for diff in summary["diffs"]],
+                         ["menu_000000", "playing_000150", "playing_000300"])
+        self.assertEqual(summary["failures"], 0, summary["diffs"])
+        self.assertEqual(summary["uncompared"], 0)
+
+    def test_bad_golden_fails_its_frame_only(self):
+        """Test that a frame whose golden cannot be read fails and later frames are still compared."""
+        surface = pygame.Surface((16, 12))
+        surface.fill((40, 80, 120))
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "broken.png"), "wb") as golden_file:
+                golden_file.write(b"not a png")
+            pygame.image.save(surface, os.path.join(directory, "good.png"))
+            capture = FrameCapture(golden_dir=directory)
+            capture.submit(surface, "broken")
+            capture.submit(surface, "good")
+            capture.close()
+        self.assertEqual([diff["frame"] for diff in capture.diffs], ["broken", "good"])
+        self.assertFalse(capture.diffs[0]["passed"])
+        self.assertIn("error", capture.diffs[0])
+        self.assertTrue(capture.diffs[1]["passed"])
+        self.assertEqual(capture.stats()["errors"], 1)
+
+    def test_raw_dump_holds_every_frame(self):
+        """Test that the raw dump reads back one RGB array per captured frame."""
+        with tempfile.TemporaryDirectory() as directory:
+            summary = run_capture(300, directory, every=150, format="raw")
+            frames = read_raw_frames(os.path.join(directory, "frames.raw"))
+        self.assertEqual(len(frames), summary["written"])
+        self.assertEqual(frames[0].shape, (800, 1200, 3))
+        golden = surface_to_array(pygame.image.load(os.path.join(GOLDEN_DIR, "menu_000000.png")))
+        mask, _ = diff_images(frames[0], golden)
+        self.assertEqual(int(mask.sum()), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import random
+import pygame
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from pygame.sprite import Group, Sprite
+from collision_handler import CollisionHandler
+from enemies import Alien
+from resources import ResourceManager
+from settings import Settings
+from spatial_hash import SpatialHash
+
+def make_group(rng, count, width, height):
+    group = Group()
+    for _ in range(count):
+        sprite = Sprite()
+        sprite.rect = pygame.Rect(rng.randint(-20, 1200), rng.randint(-20, 800),
+                                  width, height)
+        group.add(sprite)
+    return group
+
+def as_indices(collisions, beams, aliens):
+    beam_index = {beam: i for i, beam in enumerate(beams)}
+    alien_index = {alien: i for i, alien in enumerate(aliens)}
+    return [(beam_index[beam], [alien_index[alien] for alien in hit])
+            for beam, hit in collisions.items()]
+
+class TestSpatialHash(unittest.TestCase):
+    def test_matches_groupcollide(self):
+        """Test that the grid broadphase returns the same dict as groupcollide."""
+        for seed in range(5):
+            for dokill in (False, True):
+                results = []
+                for collide in (pygame.sprite.groupcollide, SpatialHash(64, min_pairs=0).groupcollide):
+                    # Build identical groups for each run since kills mutate them
+                    rng = random.Random(seed)
+                    beams = make_group(rng, 300, 3, 15)
+                    aliens = make_group(rng, 400, 40, 40)
+                    beam_list, alien_list = beams.sprites(), aliens.sprites()
+                    collisions = collide(beams, aliens, dokill, dokill)
+                    results.append(as_indices(collisions, beam_list, alien_list))
+                expected, actual = results
+                self.assertTrue(expected)
+                self.assertEqual(expected, actual)
+
+    def test_empty_groups(self):
+        """Test that empty groups produce no collisions."""
+        rng = random.Random(0)
+        self.assertEqual(SpatialHash().groupcollide(Group(), make_group(rng, 5, 40, 40), True, True), {})
+
+class CountingResourceManager(ResourceManager):
+    def __init__(self, settings):
+        super().__init__(settings)
+        self.credits = []
+
+    def earn_resources(self, points):
+        self.credits.append(points)
+        return super().earn_resources(points)
+
+class TestBeamDamage(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = Settings()
+        self.resource_manager = CountingResourceManager(self.settings)
+        self.aliens = Group()
+
+    def add_alien(self, x, health):
+        alien = Alien(self.settings, None)
+        alien.rect.topleft = (x, 100)
+        alien.health = health
+        self.aliens.add(alien)
+        return alien
+
+    def fire(self, *hits):
+        """Return a group of beams, one per (alien, damage) pair, touching its alien."""
+        beams = Group()
+        for alien, damage in hits:
+            beam = Sprite()
+            beam.rect = pygame.Rect(alien.rect.centerx, alien.rect.bottom - 5, 3, 15)
+            beam.damage = damage
+            beams.add(beam)
+        return beams
+
+    def resolve(self, beams, spatial_hash=None):
+        return CollisionHandler.check_beam_alien_collisions(
+            beams, self.aliens, self.resource_manager, spatial_hash)
+
+    def test_damage_accumulates_until_health_runs_out(self):
+        """Test that beams wear an alien down and only a lethal total kills it."""
+        alien = self.add_alien(100, 30)
+        beams = self.fire((alien, 10), (alien, 10))
+        self.assertEqual(self.resolve(beams), [])
+        self.assertEqual(len(beams), 0)
+        self.assertTrue(alien.alive())
+        self.assertEqual(alien.health, 10)
+        self.assertEqual(self.resource_manager.credits, [])
+
+        self.assertEqual(self.resolve(self.fire((alien, 10))), [alien])
+        self.assertFalse(alien.alive())
+        self.assertEqual(self.resource_manager.credits, [self.settings.enemy_points])
+
+    def test_kills_are_credited_once_per_tick(self):
+        """Test that every alien destroyed in one pass earns one summed reward."""
+        for spatial_hash in (None, SpatialHash(64, min_pairs=0)):
+            self.aliens.empty()
+            self.resource_manager.credits = []
+            aliens = [self.add_alien(100 + 100 * i, 20) for i in range(4)]
+            beams = self.fire(*[(alien, 20) for alien in aliens[:3]], (aliens[3], 10))
+            destroyed = self.resolve(beams, spatial_hash)
+            self.assertEqual(destroyed, aliens[:3])
+            self.assertEqual(self.resource_manager.credits, [3 * self.settings.enemy_points])
+            self.assertEqual(self.aliens.sprites(), aliens[3:])
+
+if __name__ == '__main__':
+    unittest.main()
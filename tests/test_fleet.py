@@ -0,0 +1,203 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from settings import Settings
+from simulation import Simulation
+from base import Base
+from collision_handler import CollisionHandler
+
+def make_simulation(backend, **overrides):
+    settings = Settings()
+    settings.fleet_backend = backend
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    return Simulation(settings, seed=0)
+
+def fleet_positions(simulation):
+    enemy_wave = simulation.game_state_manager.enemy_wave
+    enemy_wave.sync_rects()
+    return sorted((alien.rect.x, alien.rect.y) for alien in enemy_wave.aliens)
+
+class TestArrayFleet(unittest.TestCase):
+    def assert_backends_match(self, ticks, **overrides):
+        sprites = make_simulation("sprites", **overrides)
+        arrays = make_simulation("numpy", **overrides)
+        sprites.step("start_game")
+        arrays.step("start_game")
+        for tick in range(ticks):
+            sprites.step()
+            arrays.step()
+            self.assertEqual(fleet_positions(sprites), fleet_positions(arrays),
+                             f"fleets diverged at tick {tick}")
+        self.assertEqual(sprites.summary(), arrays.summary())
+
+    def test_matches_sprite_backend(self):
+        """Test that the array fleet moves exactly like the sprite fleet."""
+        self.assert_backends_match(600)
+
+    def test_matches_sprite_backend_with_edge_bounces(self):
+        """Test that edge contact drops and reverses the fleet the same way."""
+        self.assert_backends_match(400, enemy_speed=7.3)
+
+    def test_killed_aliens_leave_the_arrays(self):
+        """Test that killing an alien clears its alive flag."""
+        simulation = make_simulation("numpy")
+        simulation.step("start_game")
+        enemy_wave = simulation.game_state_manager.enemy_wave
+        alien = enemy_wave.slots[3]
+        alien.kill()
+        self.assertFalse(enemy_wave.alive[3])
+        self.assertEqual(int(enemy_wave.alive.sum()), len(enemy_wave.aliens))
+
+class TestFleetTrajectory(unittest.TestCase):
+    def make_waves(self, backend, **overrides):
+        waves = []
+        for _ in range(2):
+            simulation = make_simulation(backend, **overrides)
+            simulation.step("start_game")
+            enemy_wave = simulation.game_state_manager.enemy_wave
+            # Remove a column so the fleet is no longer symmetric
+            for alien in list(enemy_wave.aliens)[:1]:
+                alien.kill()
+            waves.append(enemy_wave)
+        return waves
+
+    def test_advance_matches_stepping(self):
+        """Test that jumping ahead lands exactly where stepping one tick at a time does."""
+        for backend in ("sprites", "numpy"):
+            for enemy_speed in (1, 1.1, 7.3):
+                stepped, jumped = self.make_waves(backend, enemy_speed=enemy_speed)
+                for ticks in (1, 19, 26, 500, 2345):
+                    for _ in range(ticks):
+                        stepped.update()
+                    jumped.advance(ticks)
+                    self.assertEqual(stepped._motion_state(), jumped._motion_state())
+                    stepped.sync_rects()
+                    jumped.sync_rects()
+                    self.assertEqual(sorted(alien.rect.topleft for alien in stepped.aliens),
+                                     sorted(alien.rect.topleft for alien in jumped.aliens))
+
+    def test_predicts_time_to_bottom(self):
+        """Test that the predicted ticks until the fleet reaches the bottom are exact."""
+        for enemy_speed in (1, 7.3):
+            enemy_wave, _ = self.make_waves("sprites", enemy_speed=enemy_speed)
+            predicted = enemy_wave.ticks_until_bottom()
+            ticks = 0
+            enemy_wave.sync_rects()
+            while max(alien.rect.bottom for alien in enemy_wave.aliens) < 800:
+                enemy_wave.update()
+                enemy_wave.sync_rects()
+                ticks += 1
+            self.assertEqual(predicted, ticks)
+
+    def test_prediction_leaves_fleet_in_place(self):
+        """Test that predicting does not move the fleet."""
+        enemy_wave, _ = self.make_waves("numpy")
+        state = enemy_wave._motion_state()
+        enemy_wave.ticks_until_bottom()
+        self.assertEqual(enemy_wave._motion_state(), state)
+
+class TestFormationBounds(unittest.TestCase):
+    def make_wave(self, backend):
+        simulation = make_simulation(backend)
+        simulation.step("start_game")
+        enemy_wave = simulation.game_state_manager.enemy_wave
+        enemy_wave.max_rows = 3
+        enemy_wave.aliens.empty()
+        enemy_wave.create_fleet()
+        return enemy_wave
+
+    def scanned_bounds(self, enemy_wave):
+        aliens = enemy_wave.aliens.sprites()
+        return (min(alien.home_x for alien in aliens),
+                max(alien.home_x + alien.rect.width for alien in aliens),
+                max(alien.home_y + alien.rect.height for alien in aliens))
+
+    def test_bounds_follow_kills(self):
+        """Test that the tracked bounding box matches a full scan as aliens die."""
+        for backend in ("sprites", "numpy"):
+            enemy_wave = self.make_wave(backend)
+            # Kill from the outside in so every edge shrinks at some point
+            aliens = sorted(enemy_wave.aliens, key=lambda alien: (
+                -abs(alien.home_x - 600), -alien.home_y))
+            for alien in aliens[:-1]:
+                alien.kill()
+                self.assertEqual(enemy_wave._formation_bounds(),
+                                 self.scanned_bounds(enemy_wave))
+
+    def test_landed_aliens_damage_base_in_one_batch(self):
+        """Test that every alien reaching the bottom is resolved in the same tick."""
+        enemy_wave = self.make_wave("sprites")
+        settings = enemy_wave.settings
+        base = Base(settings, None)
+        base.health = base.max_health = 1000
+        enemy_wave.down_moves = settings.screen_height - enemy_wave._lowest()
+        bottom_row = [alien for alien in enemy_wave.aliens
+                      if alien.home_y + alien.rect.height == enemy_wave._lowest()]
+        remaining = len(enemy_wave.aliens) - len(bottom_row)
+
+        self.assertTrue(CollisionHandler.check_aliens_bottom(None, enemy_wave, base))
+        self.assertEqual(base.health, 1000 - 10 * len(bottom_row))
+        self.assertEqual(len(enemy_wave.aliens), remaining)
+        self.assertFalse(CollisionHandler.check_aliens_bottom(None, enemy_wave, base))
+
+class TestEndlessFleet(unittest.TestCase):
+    def make_wave(self, backend, rows=40):
+        simulation = make_simulation(backend, endless_mode=True)
+        simulation.step("start_game")
+        enemy_wave = simulation.game_state_manager.enemy_wave
+        enemy_wave.max_rows = rows
+        enemy_wave.aliens.empty()
+        enemy_wave.create_fleet()
+        return simulation, enemy_wave
+
+    def test_rows_beyond_the_screen_stack_above_it(self):
+        """Test that an endless fleet keeps every row, reaching above the screen."""
+        for backend in ("sprites", "numpy"):
+            _, enemy_wave = self.make_wave(backend)
+            home_ys = sorted({alien.home_y for alien in enemy_wave.aliens})
+            self.assertEqual(len(home_ys), 40)
+            self.assertLess(home_ys[0], 0)
+            self.assertEqual(enemy_wave._lowest(), 640)
+
+    def test_only_rows_in_view_are_synced(self):
+        """Test that visible aliens are synced and culled aliens are left alone."""
+        for backend in ("sprites", "numpy"):
+            simulation, enemy_wave = self.make_wave(backend)
+            culled = min(enemy_wave.aliens, key=lambda alien: alien.home_y)
+            culled.rect.topleft = (-999, -999)
+            for _ in range(120):
+                simulation.step()
+            visible = enemy_wave.visible_aliens()
+            self.assertNotIn(culled, visible)
+            self.assertEqual(culled.rect.topleft, (-999, -999))
+            dx, dy = enemy_wave.rect_offset()
+            for alien in visible:
+                self.assertEqual(alien.rect.topleft, (alien.home_x + dx, alien.home_y + dy))
+                self.assertTrue(alien.rect.bottom > -enemy_wave.settings.cull_margin)
+            self.assertEqual(len({alien.home_y for alien in visible}), 9)
+
+            enemy_wave.sync_rects()
+            self.assertEqual(culled.rect.topleft, (culled.home_x + dx, culled.home_y + dy))
+
+    def test_waves_keep_coming_without_victory(self):
+        """Test that clearing waves past the victory wave keeps the game going."""
+        simulation = make_simulation("sprites", endless_mode=True)
+        simulation.step("start_game")
+        game_state_manager = simulation.game_state_manager
+        settings = game_state_manager.settings
+        rows = game_state_manager.enemy_wave.max_rows
+        for wave in range(settings.victory_wave + 2):
+            game_state_manager.enemy_wave.aliens.empty()
+            simulation.step()
+        self.assertEqual(game_state_manager.get_state(), "playing")
+        self.assertFalse(game_state_manager.victory)
+        self.assertEqual(game_state_manager.enemy_wave.max_rows,
+                         rows + settings.endless_rows_per_wave * (settings.victory_wave + 2))
+
+if __name__ == '__main__':
+    unittest.main()
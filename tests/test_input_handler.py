@@ -0,0 +1,35 @@
+import unittest
+import os
+import sys
+from types import SimpleNamespace
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from input_handler import InputHandler
+
+class TestInputHandler(unittest.TestCase):
+    def setUp(self):
+        """Set up a dummy display for the event queue."""
+        pygame.display.init()
+        pygame.display.set_mode((64, 48))
+        pygame.event.clear()
+        self.player = SimpleNamespace(moving_left=True, moving_right=False)
+
+    def tearDown(self):
+        pygame.display.quit()
+
+    def test_events_after_an_action_are_handled(self):
+        """Test that a key release queued after F3 still stops the player."""
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_F3))
+        pygame.event.post(pygame.event.Event(pygame.KEYUP, key=pygame.K_LEFT))
+        self.assertEqual(InputHandler.handle_events(self.player, None), "toggle_profiler")
+        self.assertFalse(self.player.moving_left)
+        self.assertEqual(pygame.event.get(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import csv
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from profiling import BootTimer, FrameProfiler
+from ui_components.fonts import clear_fonts
+
+class TestFrameProfiler(unittest.TestCase):
+    def record_frames(self, profiler, count):
+        for frame in range(count):
+            profiler.begin_frame()
+            for phase in FrameProfiler.PHASES:
+                profiler.lap(phase)
+            profiler.end_frame(aliens=frame, beams=2 * frame, particles=0)
+
+    def test_ring_buffer_keeps_latest_frames(self):
+        """Test that the buffer wraps and keeps the most recent frames."""
+        profiler = FrameProfiler(capacity=4)
+        self.record_frames(profiler, 10)
+        self.assertEqual(profiler.frames, 10)
+        self.assertEqual(profiler._ordered(profiler.counts)[:, 0].tolist(), [6, 7, 8, 9])
+        self.assertEqual(profiler.summary()["aliens"], 9)
+
+    def test_dump_csv_writes_buffered_frames(self):
+        """Test that the CSV export holds one row per buffered frame, oldest first."""
+        profiler = FrameProfiler(capacity=4)
+        self.record_frames(profiler, 6)
+        with tempfile.TemporaryDirectory() as directory:
+            path = profiler.dump_csv(os.path.join(directory, "profile.csv"))
+            with open(path, newline="") as csv_file:
+                rows = list(csv.DictReader(csv_file))
+        self.assertEqual([row["frame"] for row in rows], ["2", "3", "4", "5"])
+        self.assertEqual(rows[-1]["beams"], "10")
+        self.assertEqual(set(FrameProfiler.PHASES) - set(rows[0]), set())
+
+    def test_overlay_draws_inside_screen(self):
+        """Test that the overlay draws within the screen."""
+        pygame.init()
+        clear_fonts()
+        screen = pygame.display.set_mode((800, 600))
+        profiler = FrameProfiler(capacity=8)
+        self.record_frames(profiler, 8)
+        profiler.draw(screen)
+        self.assertTrue(screen.get_rect().contains(profiler.rect))
+        clear_fonts()
+        pygame.quit()
+
+class TestBootTimer(unittest.TestCase):
+    def test_steps_are_timed_in_order(self):
+        """Test that each lap is charged the time since the previous mark."""
+        times = iter([0.0, 0.002, 0.003, 0.0105])
+        boot = BootTimer(clock=lambda: next(times))
+        for step in ("pygame init", "display", "first frame"):
+            boot.lap(step)
+        self.assertEqual([step for step, _ in boot.steps], ["pygame init", "display", "first frame"])
+        self.assertAlmostEqual(boot.steps[2][1], 7.5)
+        self.assertAlmostEqual(boot.total_ms, 10.5)
+        self.assertIn("total", boot.report().splitlines()[-1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import sys
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from autopilot import make_policy
+from renderer import DirtyRectRenderer, Renderer, cluster_rects
+from settings import Settings
+from simulation import Simulation
+from ui import UI
+from ui_components.fonts import clear_fonts
+from visual_effects import Starfield
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    def setUp(self):
+        """Set up a started game on a dummy display."""
+        pygame.init()
+        clear_fonts()
+        self.settings = Settings()
+        self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
+        self.simulation = Simulation(self.settings, self.screen, seed=0)
+        self.ui = UI(self.simulation.settings, self.screen)
+        self.starfield = Starfield(self.simulation.settings, seed=0)
+        self.renderer = DirtyRectRenderer()
+        self.simulation.step("start_game")
+
+    def tearDown(self):
+        clear_fonts()
+        pygame.quit()
+
+    def render(self):
+        game_state_manager = self.simulation.game_state_manager
+        self.renderer.update_screen(
+            self.simulation.settings, self.screen, game_state_manager.player,
+            game_state_manager.base, game_state_manager.enemy_wave, game_state_manager.beams,
+            self.ui, game_state_manager.get_state(), game_state_manager.resource_manager,
+            game_state_manager, self.starfield)
+
+    def test_playing_frame_with_starfield_updates_dirty_rects(self):
+        """Test that a gameplay frame over a scrolling starfield is not flipped in full."""
+        self.render()
+        for _ in range(2):
+            self.simulation.step()
+            self.starfield.update()
+        with mock.patch.object(pygame.display, "flip") as flip, \
+                mock.patch.object(pygame.display, "update") as update:
+            self.render()
+        flip.assert_not_called()
+        update.assert_called_once()
+        rects = update.call_args[0][0]
+        player_rect = self.simulation.game_state_manager.player.rect
+        self.assertTrue(any(rect.contains(player_rect) for rect in rects))
+        self.assertLess(sum(rect.width * rect.height for rect in rects),
+                        self.screen.get_width() * self.screen.get_height())
+
+    def test_presented_frames_match_a_full_redraw(self):
+        """Test that what dirty-rect frames present always equals a fully redrawn frame."""
+        self.simulation.policy = make_policy("track_greedy")
+        presented = self.screen.copy()
+
+        def flip():
+            presented.blit(self.screen, (0, 0))
+
+        def update(rects):
+            for rect in rects:
+                presented.blit(self.screen, rect, rect)
+
+        game_state_manager = self.simulation.game_state_manager
+        areas = []
+        with mock.patch.object(pygame.display, "flip", flip), \
+                mock.patch.object(pygame.display, "update", update):
+            for tick in range(240):
+                self.simulation.step()
+                self.starfield.update()
+                self.render()
+                areas.append(sum(rect.width * rect.height for rect in self.renderer.previous_rects))
+                if tick % 20:
+                    continue
+                # Redraw everything on the screen and compare with what was presented
+                state = game_state_manager.get_state()
+                Renderer.draw_world(
+                    self.simulation.settings, self.screen, game_state_manager.player,
+                    game_state_manager.base, game_state_manager.enemy_wave,
+                    game_state_manager.beams, state, self.starfield, game_state_manager.particles)
+                self.ui.display(state, game_state_manager.player, game_state_manager.base,
+                                game_state_manager.enemy_wave.wave_number,
+                                game_state_manager.resource_manager, game_state_manager)
+                mismatched = (pygame.surfarray.array3d(self.screen)
+                              != pygame.surfarray.array3d(presented)).any(axis=2)
+                self.assertEqual(int(mismatched.sum()), 0, f"tick {tick}")
+        screen_area = self.screen.get_width() * self.screen.get_height()
+        self.assertLess(sum(areas) / len(areas), screen_area * 0.1)
+
+class TestClusterRects(unittest.TestCase):
+    def test_boxes_are_grouped_by_grid_cell(self):
+        """Test that nearby boxes share a rect and distant ones do not."""
+        rects = cluster_rects([0, 10, 300], [0, 5, 300], [8, 20, 310], [8, 15, 305], cell=64)
+        self.assertEqual(rects, [pygame.Rect(0, 0, 20, 15), pygame.Rect(300, 300, 10, 5)])
+
+if __name__ == '__main__':
+    unittest.main()
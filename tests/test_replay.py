@@ -0,0 +1,59 @@
+import unittest
+import contextlib
+import io
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from replay import Replay, ReplayRecorder, play_replay
+from simulation import Simulation
+
+def record_scripted_run(ticks=1500):
+    """Play a short scripted game and return its recording."""
+    simulation = Simulation(seed=7)
+    simulation.recorder = ReplayRecorder(seed=7)
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.step("start_game")
+        for tick in range(ticks):
+            player = simulation.game_state_manager.player
+            player.moving_right = (tick // 200) % 2 == 0
+            player.moving_left = not player.moving_right
+            action = "upgrade_fire_rate" if tick == 300 else None
+            simulation.step(action)
+    return simulation.recorder.finish(simulation)
+
+class TestReplay(unittest.TestCase):
+    def test_replay_reproduces_final_state(self):
+        """Test that replaying a recording ends in the recorded state."""
+        replay = record_scripted_run()
+        with contextlib.redirect_stdout(io.StringIO()):
+            summary = play_replay(replay)
+        self.assertTrue(summary["match"])
+        self.assertEqual(summary["ticks"], replay.ticks)
+
+    def test_only_input_changes_are_stored(self):
+        """Test that the recording holds one event per input change or action."""
+        replay = record_scripted_run()
+        # start, 8 direction changes and 1 upgrade
+        self.assertEqual(len(replay.events), 10)
+
+    def test_binary_round_trip(self):
+        """Test that a replay survives serialization unchanged."""
+        replay = record_scripted_run(300)
+        loaded = Replay.from_bytes(replay.to_bytes())
+        self.assertEqual(loaded.seed, replay.seed)
+        self.assertEqual(loaded.ticks, replay.ticks)
+        self.assertEqual(loaded.events, replay.events)
+        self.assertEqual(loaded.state_hash, replay.state_hash)
+
+    def test_tampered_replay_does_not_match(self):
+        """Test that changed inputs are detected by the state hash."""
+        replay = record_scripted_run()
+        replay.events = replay.events[:-1]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(play_replay(replay)["match"])
+
+if __name__ == '__main__':
+    unittest.main()
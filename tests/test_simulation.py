@@ -0,0 +1,33 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from simulation import Simulation
+
+class TestSimulation(unittest.TestCase):
+    def test_run_starts_game_and_advances_ticks(self):
+        """Test that a headless run starts a game and advances the tick count."""
+        simulation = Simulation(seed=1)
+        summary = simulation.run(100)
+        self.assertEqual(summary["ticks"], 100)
+        self.assertEqual(summary["state"], "playing")
+        self.assertGreater(len(simulation.game_state_manager.beams), 0)
+
+    def test_time_is_derived_from_ticks(self):
+        """Test that game time follows the tick count, not the wall clock."""
+        simulation = Simulation()
+        simulation.run(61)
+        self.assertEqual(simulation.get_time(), 1016)
+
+    def test_runs_are_reproducible(self):
+        """Test that two runs with the same seed end in the same state."""
+        first = Simulation(seed=3).run(2000)
+        second = Simulation(seed=3).run(2000)
+        for key in ("ticks", "state", "waves_cleared", "gems", "base_health"):
+            self.assertEqual(first[key], second[key])
+
+if __name__ == '__main__':
+    unittest.main()
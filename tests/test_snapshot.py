@@ -0,0 +1,92 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autopilot import make_policy
+from batch import SimulationBatch
+from settings import Settings
+from simulation import Simulation
+from snapshot import Snapshot
+
+def play(simulation, ticks):
+    """Step a simulation quietly for `ticks` ticks."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(ticks):
+            simulation.step()
+
+def started_game(settings=None, ticks=1500):
+    """Return an autopilot game that has been playing for `ticks` ticks."""
+    simulation = Simulation(settings, seed=5)
+    simulation.policy = make_policy("track_greedy")
+    with contextlib.redirect_stdout(io.StringIO()):
+        simulation.step("start_game")
+    play(simulation, ticks)
+    return simulation
+
+class TestSnapshot(unittest.TestCase):
+    def assert_fork_matches(self, settings):
+        simulation = started_game(settings)
+        snapshot = Snapshot.from_bytes(Snapshot.capture(simulation).to_bytes())
+        fork = snapshot.restore(settings)
+        fork.policy = make_policy("track_greedy")
+        self.assertEqual(fork.state_hash(), simulation.state_hash())
+        play(simulation, 2000)
+        play(fork, 2000)
+        self.assertEqual(fork.state_hash(), simulation.state_hash())
+
+    def test_fork_continues_like_the_original(self):
+        """Test that a restored game plays on exactly like the one captured."""
+        self.assert_fork_matches(Settings())
+
+    def test_fork_continues_like_the_original_numpy(self):
+        """Test the same with the NumPy fleet backend."""
+        self.assert_fork_matches(Settings().copy(fleet_backend="numpy"))
+
+    def test_save_and_load(self):
+        """Test that a snapshot survives a round trip through a file."""
+        simulation = started_game()
+        snapshot = Snapshot.capture(simulation)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.aisn")
+            snapshot.save(path)
+            loaded = Snapshot.load(path)
+        self.assertEqual(loaded.to_bytes(), snapshot.to_bytes())
+        self.assertEqual(loaded.tick_count, simulation.tick_count)
+
+    def test_rejects_other_files(self):
+        """Test that data without the snapshot header is refused."""
+        with self.assertRaises(ValueError):
+            Snapshot.from_bytes(b"AIRP" + bytes(64))
+
+    def test_forks_are_independent(self):
+        """Test that forks of one snapshot share no game objects."""
+        snapshot = Snapshot.capture(started_game())
+        first, second = snapshot.fork(2)
+        first.game_state_manager.resource_manager.gems += 1000
+        self.assertNotEqual(first.game_state_manager.resource_manager.gems,
+                            second.game_state_manager.resource_manager.gems)
+        self.assertIsNot(first.game_state_manager.enemy_wave.aliens,
+                         second.game_state_manager.enemy_wave.aliens)
+
+    def test_batch_continues_from_snapshot(self):
+        """Test that a batch forked from a snapshot carries on from its tick."""
+        simulation = started_game()
+        batch = SimulationBatch.from_snapshot(Snapshot.capture(simulation), 3,
+                                              policy_factory=lambda: make_policy("track_greedy"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            summaries = batch.run(100)
+        play(simulation, 100)
+        self.assertEqual([summary["ticks"] for summary in summaries],
+                         [simulation.tick_count] * 3)
+        self.assertEqual(batch.simulations[0].state_hash(), simulation.state_hash())
+
+if __name__ == '__main__':
+    unittest.main()
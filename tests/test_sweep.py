@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sweep import grid, random_sample, make_settings, run_sweep
+
+class TestSweep(unittest.TestCase):
+    def test_grid_covers_every_combination(self):
+        """Test that a grid yields one point per combination of values."""
+        points = grid({"enemy_speed": [1, 2], "upgrade_cost": [25, 50, 75]})
+        self.assertEqual(len(points), 6)
+        self.assertIn({"enemy_speed": 2, "upgrade_cost": 75}, points)
+
+    def test_random_sample_respects_ranges(self):
+        """Test that sampled values stay within their ranges and types."""
+        points = random_sample({"wave_increment": (1, 10), "enemy_speed": (0.5, 2.0)}, 20, seed=1)
+        self.assertEqual(len(points), 20)
+        for point in points:
+            self.assertIsInstance(point["wave_increment"], int)
+            self.assertTrue(1 <= point["wave_increment"] <= 10)
+            self.assertTrue(0.5 <= point["enemy_speed"] <= 2.0)
+
+    def test_unknown_setting_is_rejected(self):
+        """Test that a misspelled Settings field raises instead of being ignored."""
+        with self.assertRaises(AttributeError):
+            make_settings({"enemy_sped": 2})
+
+    def test_sweep_aggregates_each_point(self):
+        """Test that a sweep returns one aggregated outcome per point."""
+        outcomes = run_sweep([{"enemy_speed": 1}, {"enemy_speed": 2}],
+                             games=2, ticks=300, workers=2, sample_every=100)
+        self.assertEqual(len(outcomes), 2)
+        for outcome in outcomes:
+            self.assertEqual(outcome["games"], 2)
+            self.assertEqual(len(outcome["gems_curve"]), 3)
+            self.assertTrue(0 <= outcome["win_rate"] <= 1)
+        self.assertEqual(outcomes[1]["overrides"], {"enemy_speed": 2})
+
+if __name__ == '__main__':
+    unittest.main()
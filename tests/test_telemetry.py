@@ -0,0 +1,94 @@
+import unittest
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autopilot import make_policy
+from simulation import Simulation
+from telemetry import TelemetryLog, open_log, read_log
+
+class TestTelemetryLog(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_formats_hold_the_same_records(self):
+        """Test that the JSON lines and binary logs read back the same records."""
+        records = []
+        for name in ("log.jsonl", "log.bin"):
+            log = open_log(self.path(name))
+            log.emit("transition", 0, previous="menu", state="playing")
+            log.emit("upgrade", 500, kind="weapon", level=2, cost=50)
+            log.emit("frame", 516, frame_ms=16.5, ticks=1, aliens=14, beams=3, particles=0)
+            log.close()
+            records.append(read_log(self.path(name)))
+        self.assertEqual(records[0], records[1])
+        self.assertEqual(records[0][1], {"event": "upgrade", "time": 500, "kind": "weapon",
+                                         "level": 2, "cost": 50})
+        self.assertLess(os.path.getsize(self.path("log.bin")),
+                        os.path.getsize(self.path("log.jsonl")))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that records beyond the queue size are counted and dropped."""
+        # The writer takes one batch, then waits until the log is closed
+        log = TelemetryLog(self.path("log.jsonl"), queue_size=3, flush_interval=60)
+        for tick in range(10):
+            log.emit("kills", tick, count=1, gems=50)
+        log.close()
+        self.assertEqual(log.emitted + log.dropped, 10)
+        self.assertGreaterEqual(log.dropped, 4)
+        self.assertEqual(log.written, log.emitted)
+        self.assertEqual(len(read_log(self.path("log.jsonl"))), log.emitted)
+
+    def test_bad_records_are_dropped_by_the_writer(self):
+        """Test that records failing to encode are counted and later records still written."""
+        for name in ("log.jsonl", "log.bin"):
+            log = open_log(self.path(name))
+            log.emit("kills", 0, count=1, gems=object())  # Neither JSON nor a struct field
+            log.emit("kills", 10, count=-1, gems=50)  # Negative unsigned count
+            log.emit("kills", 20, count=1, gems=50)
+            log.close()
+            self.assertFalse(log._thread.is_alive())
+            records = read_log(self.path(name))
+            self.assertEqual(records[-1], {"event": "kills", "time": 20, "count": 1, "gems": 50})
+            self.assertEqual(log.written, len(records))
+            self.assertEqual(log.stats()["dropped"], log.failed)
+            self.assertEqual(log.written + log.failed, 3)
+
+    def test_unknown_event_is_rejected(self):
+        """Test that only events with a schema can be emitted."""
+        log = open_log(self.path("log.bin"))
+        with self.assertRaises(ValueError):
+            log.emit("teleport", 0)
+        log.close()
+
+    def test_game_events_are_logged(self):
+        """Test that a game logs its waves, kills and upgrades."""
+        simulation = Simulation(seed=1)
+        simulation.policy = make_policy("track_greedy")
+        log = open_log(self.path("game.jsonl"))
+        simulation.game_state_manager.telemetry = log
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            simulation.run(2000)
+        log.close()
+        self.assertEqual(output.getvalue(), "")
+        events = {record["event"] for record in read_log(self.path("game.jsonl"))}
+        self.assertTrue({"transition", "wave_start", "wave_end", "kills",
+                         "gems_earned", "upgrade", "gems_spent"} <= events)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pygame
+
+from settings import Settings
+from enemies import EnemyWave
+from player import Player
+from textures import TextureAtlas, get_atlas, get_texture, clear_textures
+
+class TestTextures(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        clear_textures()
+        self.settings = Settings()
+        self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
+
+    def tearDown(self):
+        clear_textures()
+        pygame.quit()
+
+    def test_aliens_share_one_image(self):
+        """Test that every alien in a fleet uses the same shared image."""
+        enemy_wave = EnemyWave(self.settings, self.screen)
+        enemy_wave.max_rows = 3
+        enemy_wave.create_fleet()
+        images = {id(alien.image) for alien in enemy_wave.aliens}
+        self.assertEqual(images, {id(get_texture("alien"))})
+
+    def test_atlas_matches_display_format(self):
+        """Test that the atlas is converted to the display's pixel format."""
+        atlas = get_atlas()
+        self.assertIs(atlas.display, pygame.display.get_surface())
+        self.assertEqual(atlas.surface.get_bitsize(), self.screen.get_bitsize())
+        player = Player(self.settings, self.screen)
+        self.assertEqual(player.image.get_parent(), atlas.surface)
+        self.assertEqual(player.image.get_at((0, 0))[:3], (0, 0, 255))
+
+    def test_frames_are_packed_without_overlap(self):
+        """Test that animation frames get separate sub-rects of the atlas."""
+        atlas = TextureAtlas({"blink": ((8, 8), [(255, 0, 0), (0, 255, 0)]),
+                              "dot": ((4, 4), [(0, 0, 255)])})
+        self.assertEqual(atlas.frame_count("blink"), 2)
+        rects = atlas.rects["blink"] + atlas.rects["dot"]
+        for index, rect in enumerate(rects):
+            self.assertEqual(rect.collidelist(rects[index + 1:]), -1)
+        self.assertEqual(atlas.frame("blink", 1).get_at((0, 0))[:3], (0, 255, 0))
+
+if __name__ == '__main__':
+    unittest.main()
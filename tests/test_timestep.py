@@ -0,0 +1,71 @@
+import unittest
+import contextlib
+import io
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from simulation import Simulation
+from timestep import FixedTimestep, Interpolator
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestFixedTimestep(unittest.TestCase):
+    def test_tick_rate_is_independent_of_frame_rate(self):
+        """Test that the same wall time yields the same ticks at any frame rate."""
+        for frame_ms in (4, 16.7, 33.3, 50):
+            clock = FakeClock()
+            timestep = FixedTimestep(60, max_ticks_per_frame=5, clock=clock)
+            ticks = timestep.advance()
+            while clock.now < 10:
+                clock.now += frame_ms / 1000
+                ticks += timestep.advance()
+            self.assertAlmostEqual(ticks, 10 * 60 + 1, delta=1)
+            self.assertEqual(timestep.dropped_ms, 0)
+
+    def test_slow_frames_skip_rendering_then_drop_backlog(self):
+        """Test that slow frames run several ticks, up to the per-frame limit."""
+        clock = FakeClock()
+        timestep = FixedTimestep(60, max_ticks_per_frame=5, clock=clock)
+        timestep.advance()
+        clock.now += 0.051
+        self.assertEqual(timestep.advance(), 3)
+        self.assertEqual(timestep.skipped_frames, 2)
+        clock.now += 1.0
+        self.assertEqual(timestep.advance(), 5)
+        self.assertGreater(timestep.dropped_ms, 900)
+        self.assertTrue(0 <= timestep.alpha < 1)
+
+class TestInterpolator(unittest.TestCase):
+    def test_draws_between_ticks_and_restores(self):
+        """Test that rects are shifted back toward the previous tick and then restored."""
+        simulation = Simulation(seed=1)
+        game_state_manager = simulation.game_state_manager
+        with contextlib.redirect_stdout(io.StringIO()):
+            simulation.step("start_game")
+            for _ in range(10):
+                simulation.step()
+        game_state_manager.player.moving_right = True
+        interpolator = Interpolator(game_state_manager)
+        interpolator.capture()
+        simulation.step()
+
+        player = game_state_manager.player
+        beam = game_state_manager.beams.sprites()[0]
+        simulated = (player.rect.x, beam.rect.y)
+        interpolator.apply(0.5)
+        # Half of a 5 pixel step, rounded like a Rect
+        self.assertEqual(player.rect.x, simulated[0] - 3)
+        self.assertEqual(beam.rect.y, simulated[1] + beam.speed_factor // 2)
+        interpolator.restore()
+        self.assertEqual((player.rect.x, beam.rect.y), simulated)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ui_components.fonts import get_font, clear_fonts
+from ui_components.text_cache import TextCache, DigitAtlas
+from settings import Settings
+from ui import UI
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        pygame.font.init()
+        # Fonts cached by earlier tests may belong to a quit font module
+        clear_fonts()
+        self.font = get_font(36)
+        self.screen = pygame.Surface((400, 100))
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        clear_fonts()
+        pygame.font.quit()
+
+    def test_fonts_are_shared(self):
+        """Test that the registry returns the same font object."""
+        self.assertIs(get_font(36), self.font)
+        self.assertIsNot(get_font(48), self.font)
+
+    def test_text_is_rendered_only_when_it_changes(self):
+        """Test that unchanged text reuses the cached surface."""
+        cache = TextCache(self.font, (255, 255, 255))
+        first = cache.render("label", "Weapon: Basic Laser")
+        self.assertIs(cache.render("label", "Weapon: Basic Laser"), first)
+        self.assertIsNot(cache.render("label", "Weapon: Dual Laser"), first)
+
+    def test_digit_atlas_width(self):
+        """Test that a number is drawn as the sum of its glyph widths."""
+        atlas = DigitAtlas(self.font, (255, 255, 255))
+        width = atlas.draw(self.screen, 1050, 0, 0)
+        self.assertEqual(width, sum(atlas.widths[char] for char in "1050"))
+
+class TestUIScreens(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        pygame.font.init()
+        clear_fonts()
+        self.ui = UI(Settings(), pygame.Surface((1200, 800)))
+
+    def tearDown(self):
+        """Tear down test fixtures."""
+        clear_fonts()
+        pygame.font.quit()
+
+    def test_screens_are_built_on_first_use(self):
+        """Test that only the screen shown is constructed, and only once."""
+        self.ui.display("menu")
+        self.assertIsNotNone(self.ui._main_menu_screen)
+        self.assertIsNone(self.ui._gameplay_screen)
+        self.assertIsNone(self.ui._game_over_screen)
+        self.assertIs(self.ui.main_menu_screen, self.ui._main_menu_screen)
+
+    def test_screens_share_registry_fonts(self):
+        """Test that screens and buttons take their fonts from the registry."""
+        menu = self.ui.main_menu_screen
+        game_over = self.ui.game_over_screen
+        self.assertIs(menu.title_font, game_over.title_font)
+        self.assertIs(menu.start_button.font, get_font(48))
+        self.assertIs(menu.exit_button.font, game_over.restart_button.font)
+
+if __name__ == '__main__':
+    unittest.main()
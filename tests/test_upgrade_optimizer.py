@@ -0,0 +1,156 @@
+import unittest
+import itertools
+import os
+import sys
+import tempfile
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from autopilot import make_policy
+from simulation import Simulation
+from upgrade_optimizer import ScoreCache, UpgradeOptimizer, apply_levels, score_levels
+
+def weapon_first(levels):
+    """Synthetic score: weapon levels matter most, speed not at all."""
+    defense, weapon, speed, fire_rate = levels
+    return 3 * weapon + fire_rate + 0.5 * defense
+
+class CountingScorer:
+    def __init__(self, score):
+        self.score = score
+        self.calls = []
+
+    def __call__(self, levels):
+        self.calls.append(levels)
+        return self.score(levels)
+
+class TestUpgradeOptimizer(unittest.TestCase):
+    def test_plan_beats_every_fixed_order(self):
+        """Test that the planned purchases score at least as well as any single-kind order."""
+        optimizer = UpgradeOptimizer(scorer=weapon_first, income=300, waves=3)
+        plan = optimizer.plan(100)
+        self.assertEqual(plan["purchases"][0], ["weapon", "fire_rate"])
+        self.assertNotIn("speed", sum(plan["purchases"], []))
+        self.assertGreaterEqual(plan["gems_left"], 0)
+
+        # Brute force: always buy one kind as soon as it is affordable
+        for kind in range(4):
+            levels, gems, value = [1, 1, 1, 1], 100, 0
+            for wave in range(3):
+                while levels[kind] < 8 and optimizer.cost(levels[kind]) <= gems:
+                    gems -= optimizer.cost(levels[kind])
+                    levels[kind] += 1
+                value += weapon_first(levels)
+                gems += 300
+            self.assertGreaterEqual(plan["value"], value)
+
+    def test_scores_are_memoized(self):
+        """Test that each set of levels is scored once across queries."""
+        scorer = CountingScorer(weapon_first)
+        optimizer = UpgradeOptimizer(scorer=scorer, income=200, waves=2)
+        optimizer.plan(150)
+        calls = len(scorer.calls)
+        self.assertEqual(len(set(scorer.calls)), calls)
+        self.assertEqual(optimizer.suggest(150, (1, 1, 1, 1)), "weapon")
+        self.assertEqual(len(scorer.calls), calls)
+
+    def test_cache_only_plans_within_the_cache(self):
+        """Test that without a scorer only cached levels are planned for."""
+        cache = ScoreCache()
+        for levels in ((1, 1, 1, 1), (1, 1, 1, 2), (1, 2, 1, 1)):
+            cache.set(levels, weapon_first(levels))
+        cache.set((1, 2, 1, 1), 0)
+        optimizer = UpgradeOptimizer(cache=cache, scorer=None, income=0, waves=1)
+        self.assertEqual(optimizer.suggest(100, (1, 1, 1, 1)), "fire_rate")
+        self.assertIsNone(optimizer.suggest(100, (2, 1, 1, 1)))
+        self.assertIsNone(optimizer.plan(100, (2, 1, 1, 1))["value"])
+
+    def test_reachable_levels_fit_the_budget(self):
+        """Test that every reachable set of levels is affordable over the plan."""
+        optimizer = UpgradeOptimizer(scorer=weapon_first, income=100, waves=2)
+        reachable = optimizer.reachable(100)
+        budget = 100 + 100
+        for levels in itertools.product(range(1, 5), repeat=4):
+            spent = sum(optimizer.cost(level) for kind in levels for level in range(1, kind))
+            self.assertEqual(levels in reachable, spent <= budget, levels)
+
+class TestScoreCache(unittest.TestCase):
+    def test_scores_persist(self):
+        """Test that saved scores load back only under the same scoring params."""
+        params = {"games": 1, "ticks": 100, "seed": 0, "policy_name": "track"}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scores.json")
+            cache = ScoreCache(path, params)
+            cache.set((1, 2, 1, 3), 4.5)
+            cache.save()
+            self.assertEqual(ScoreCache(path, params).get((1, 2, 1, 3)), 4.5)
+            self.assertEqual(ScoreCache(path).params, params)
+            self.assertEqual(len(ScoreCache(path, dict(params, ticks=200))), 0)
+
+class TestLevelScoring(unittest.TestCase):
+    def test_levels_are_bought_without_spending_gems(self):
+        """Test that a scoring game starts with the levels and its own gems."""
+        simulation = Simulation(seed=0)
+        simulation.step("start_game")
+        apply_levels(simulation, (2, 3, 1, 2))
+        game_state_manager = simulation.game_state_manager
+        self.assertEqual(game_state_manager.base.defense_level, 2)
+        self.assertEqual(game_state_manager.player.weapon.level, 3)
+        self.assertEqual(game_state_manager.player.fire_rate_level, 2)
+        self.assertEqual(game_state_manager.resource_manager.gems,
+                         game_state_manager.settings.initial_gems)
+
+    def test_score_is_repeatable(self):
+        """Test that scoring the same levels twice gives the same score."""
+        self.assertEqual(score_levels((1, 2, 1, 1), ticks=600),
+                         score_levels((1, 2, 1, 1), ticks=600))
+
+class TestUpgradeHint(unittest.TestCase):
+    def test_hint_follows_gems_and_levels(self):
+        """Test that the game asks its advisor again when gems or levels change."""
+        scorer = CountingScorer(weapon_first)
+        simulation = Simulation(seed=0)
+        game_state_manager = simulation.game_state_manager
+        game_state_manager.upgrade_advisor = UpgradeOptimizer(scorer=scorer, income=0, waves=1)
+        simulation.step("start_game")
+        self.assertEqual(game_state_manager.upgrade_hint, "weapon")
+        simulation.step("upgrade_weapon")
+        self.assertEqual(game_state_manager.player.weapon.level, 2)
+        self.assertEqual(game_state_manager.upgrade_hint, "fire_rate")
+        calls = len(scorer.calls)
+        simulation.step()
+        self.assertEqual(len(scorer.calls), calls)
+
+    def test_hint_matches_the_exact_gems(self):
+        """Test that the shown hint is always the advisor's answer for the current gems and levels."""
+        cache = ScoreCache()
+        for levels in itertools.product(range(1, 9), repeat=4):
+            cache.set(levels, weapon_first(levels))
+        advisor = UpgradeOptimizer(cache=cache, scorer=None, income=600, waves=2)
+        queries = []
+        suggest = advisor.suggest
+
+        def counted_suggest(gems, levels):
+            queries.append((gems, levels))
+            return suggest(gems, levels)
+
+        advisor.suggest = counted_suggest
+        simulation = Simulation(seed=0)
+        simulation.policy = make_policy("track_greedy")
+        game_state_manager = simulation.game_state_manager
+        game_state_manager.upgrade_advisor = advisor
+        simulation.step("start_game")
+        states = set()
+        for _ in range(900):
+            simulation.step()
+            state = game_state_manager._hint_state
+            states.add(state)
+            self.assertEqual(game_state_manager.upgrade_hint, suggest(*queries[-1]))
+            self.assertEqual(queries[-1], (game_state_manager.resource_manager.gems, state[0]))
+        # Asked again only when the gems or levels moved, not every tick
+        self.assertLessEqual(len(queries), len(states) + 1)
+        self.assertLess(len(queries), 900)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from settings import Settings
+from visual_effects import Starfield, ParticleSystem
+
+class TestStarfield(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = Settings()
+        self.screen = pygame.Surface((self.settings.screen_width, self.settings.screen_height))
+
+    def test_stars_are_baked_into_layers(self):
+        """Test that every star's pixel is painted with its brightness."""
+        starfield = Starfield(self.settings, num_stars=200, seed=1)
+        for i in range(200):
+            layer = starfield.layers[starfield.layer[i]]
+            color = layer.get_at((int(starfield.x[i]), int(starfield.y[i])))
+            self.assertGreaterEqual(color.r, 150)
+
+    def test_layers_wrap_around(self):
+        """Test that layer offsets stay within the screen height."""
+        starfield = Starfield(self.settings, num_stars=10, seed=1)
+        for _ in range(self.settings.screen_height * 2):
+            starfield.update()
+        for offset in starfield.offsets:
+            self.assertTrue(0 <= offset < self.settings.screen_height)
+        starfield.draw(self.screen)
+
+    def test_dirty_rects_cover_changed_pixels(self):
+        """Test that every pixel the starfield changes between frames is in a dirty rect."""
+        starfield = Starfield(self.settings, num_stars=300, seed=1)
+        self.assertIsNone(starfield.dirty_rects())
+        before = self.screen.copy()
+        starfield.draw(before)
+        for _ in range(3):
+            starfield.update()
+        starfield.draw(self.screen)
+        rects = starfield.dirty_rects()
+        changed = pygame.surfarray.array3d(before) != pygame.surfarray.array3d(self.screen)
+        xs, ys = changed.any(axis=2).nonzero()
+        self.assertTrue(xs.size)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            self.assertTrue(any(rect.collidepoint(x, y) for rect in rects), (x, y))
+        self.assertEqual(starfield.dirty_rects(), [])
+
+    def test_dense_starfield_asks_for_a_full_frame(self):
+        """Test that stars covering most of the screen fall back to a full frame."""
+        starfield = Starfield(self.settings, num_stars=60000, seed=1)
+        starfield.dirty_rects()
+        for _ in range(3):
+            starfield.update()
+        self.assertIsNone(starfield.dirty_rects())
+
+    def test_drawing_areas_matches_a_full_draw(self):
+        """Test that redrawing some areas gives the same pixels there as a full draw."""
+        starfield = Starfield(self.settings, num_stars=3000, seed=1)
+        for _ in range(37):
+            starfield.update()
+        full = self.screen.copy()
+        starfield.draw(full)
+        width, height = self.settings.screen_width, self.settings.screen_height
+        rects = [pygame.Rect(x, y, 90, 70) for x in range(0, width, 150) for y in range(0, height, 120)]
+        # Thin strips along the left and top edges hold stars wrapped from the other side
+        rects += [pygame.Rect(0, y, 2, 8) for y in range(0, height, 8)]
+        rects += [pygame.Rect(x, 0, 8, 2) for x in range(0, width, 8)]
+        self.screen.fill((255, 0, 0))
+        starfield.draw(self.screen, rects)
+        for rect in rects:
+            self.assertEqual(pygame.image.tostring(self.screen.subsurface(rect), "RGB"),
+                             pygame.image.tostring(full.subsurface(rect), "RGB"))
+
+class TestParticleSystem(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = Settings()
+        self.screen = pygame.Surface((self.settings.screen_width, self.settings.screen_height))
+        self.particles = ParticleSystem(self.settings, budget=100, seed=1)
+
+    def test_budget_is_enforced(self):
+        """Test that emitting past the budget drops the excess particles."""
+        self.assertEqual(self.particles.emit(10, 10, 80, (255, 0, 0)), 80)
+        self.assertEqual(self.particles.emit(10, 10, 80, (255, 0, 0)), 20)
+        self.assertEqual(self.particles.count, 100)
+        self.assertEqual(self.particles.dropped, 60)
+
+    def test_dead_particles_are_compacted(self):
+        """Test that only live particles remain in the leading slots."""
+        self.particles.emit(10, 10, 20, (255, 0, 0), lifetime=(5, 5))
+        self.particles.emit(10, 10, 20, (0, 255, 0), lifetime=(50, 50))
+        for _ in range(5):
+            self.particles.update()
+        self.assertEqual(self.particles.count, 20)
+        self.assertTrue((self.particles.life[:20] == 45).all())
+        self.assertTrue((self.particles.color[:20] == 1).all())
+
+    def test_draw_uses_baked_sprites(self):
+        """Test that drawing bakes one sprite set per size and color."""
+        self.particles.emit_upgrade(600, 400)
+        self.particles.draw(self.screen)
+        sizes = set(self.particles.size[:self.particles.count].tolist())
+        self.assertEqual(len(self.particles._sprites), len(sizes))
+        self.assertIsNotNone(self.particles.bounding_rect())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import pygame
+import sys
+import os
+
+# Add the parent directory to the path so we can import the game modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from player import Player
+from settings import Settings
+from weapons import BeamPool
+
+class TestBeamPool(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures."""
+        self.settings = Settings()
+        self.screen = pygame.Surface((self.settings.screen_width, self.settings.screen_height))
+        self.player = Player(self.settings, self.screen)
+        self.pool = BeamPool(self.settings, self.screen, capacity=4)
+
+    def test_fire_reuses_beams(self):
+        """Test that retired beams are handed out again instead of new ones."""
+        first = self.pool.fire(self.player)
+        first.kill()
+        self.pool.retire()
+        self.assertIs(self.pool.fire(self.player), first)
+        self.assertEqual(self.pool.high_water, 1)
+
+    def test_offscreen_beams_are_retired(self):
+        """Test that beams leaving the top of the screen return to the pool."""
+        beam = self.pool.fire(self.player)
+        while beam.rect.bottom > 0:
+            self.pool.beams.update()
+        self.pool.retire()
+        self.assertEqual(len(self.pool.beams), 0)
+        self.assertEqual(self.pool.stats()["active"], 0)
+
+    def test_exhausted_pool_recycles_oldest_beam(self):
+        """Test that firing from a full pool reuses the oldest beam."""
+        beams = [self.pool.fire(self.player) for _ in range(4)]
+        self.assertIs(self.pool.fire(self.player), beams[0])
+        self.assertEqual(self.pool.recycled, 1)
+        self.assertEqual(len(self.pool.beams), 4)
+
+    def test_exhausted_pool_reuses_beam_destroyed_mid_flight(self):
+        """Test that a full pool hands out a beam killed behind live ones instead of recycling."""
+        beams = [self.pool.fire(self.player) for _ in range(4)]
+        beams[2].kill()
+        self.pool.retire()
+        self.assertIs(self.pool.fire(self.player), beams[2])
+        self.assertEqual(self.pool.recycled, 0)
+        self.assertTrue(beams[0].alive())
+        self.assertEqual(self.pool.stats()["active"], 4)
+        self.assertEqual(self.pool.high_water, 4)
+        self.assertEqual(self.pool.active_beams(), [beams[0], beams[1], beams[3], beams[2]])
+
+    def test_zero_capacity_pool_fires_nothing(self):
+        """Test that an explicit capacity of zero is kept rather than read from settings."""
+        pool = BeamPool(self.settings, self.screen, capacity=0)
+        self.assertEqual(pool.capacity, 0)
+        self.assertIsNone(pool.fire(self.player))
+        self.assertEqual(len(pool.beams), 0)
+
+    def test_beam_takes_weapon_stats(self):
+        """Test that a pooled beam picks up the current weapon's damage and color."""
+        self.player.weapon.upgrade()
+        beam = self.pool.fire(self.player)
+        self.assertEqual(beam.damage, self.player.weapon.damage)
+        self.assertEqual(beam.color, (0, 200, 255))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# Shared sprite textures packed into a runtime atlas
+import pygame
+
+# Sprite name -> (frame size, fill color of each animation frame)
+SPRITES = {
+    "alien": ((40, 40), [(255, 0, 0)]),  # Red alien (placeholder)
+    "player": ((50, 50), [(0, 0, 255)]),  # Blue ship (placeholder)
+}
+
+class TextureAtlas:
+    """Every sprite frame drawn once and packed into a single surface.
+
+    Each sprite gets one row of the atlas with its animation frames side by
+    side. Entities receive subsurfaces of the atlas, so all aliens share one
+    image instead of allocating and filling their own. When a display is
+    set the atlas is converted to its pixel format, so blits need no
+    per-pixel format conversion.
+    """
+
+    PADDING = 1  # Gap between frames, so filtering never bleeds across
+
+    def __init__(self, sprites=SPRITES):
+        """Draw and pack all sprite frames."""
+        padding = self.PADDING
+        width = max(size[0] * len(colors) + padding * (len(colors) - 1)
+                    for size, colors in sprites.values())
+        height = sum(size[1] for size, _ in sprites.values()) + padding * (len(sprites) - 1)
+
+        self.display = pygame.display.get_surface()
+        self.surface = pygame.Surface((width, height))
+        if self.display is not None:
+            self.surface = self.surface.convert()
+
+        self.rects = {}  # Sprite name -> frame rects within the atlas
+        self.frames = {}  # Sprite name -> frame subsurfaces
+        y = 0
+        for name, ((frame_width, frame_height), colors) in sprites.items():
+            rects = []
+            for index, color in enumerate(colors):
+                rect = pygame.Rect(index * (frame_width + padding), y, frame_width, frame_height)
+                self.surface.fill(color, rect)
+                rects.append(rect)
+            self.rects[name] = rects
+            self.frames[name] = [self.surface.subsurface(rect) for rect in rects]
+            y += frame_height + padding
+
+    def frame(self, name, index=0):
+        """Return a shared frame of a sprite."""
+        return self.frames[name][index]
+
+    def frame_count(self, name):
+        """Return the number of animation frames of a sprite."""
+        return len(self.frames[name])
+
+_atlas = None
+
+def get_atlas():
+    """Return the shared atlas, building it on first use.
+
+    The atlas is rebuilt once if a display has been set since it was built,
+    so it always matches the display's pixel format.
+    """
+    global _atlas
+    if _atlas is None or _atlas.display is not pygame.display.get_surface():
+        _atlas = TextureAtlas()
+    return _atlas
+
+def get_texture(name, frame=0):
+    """Return the shared image for a sprite frame."""
+    return get_atlas().frame(name, frame)
+
+def clear_textures():
+    """Forget the shared atlas, e.g. after pygame.display.quit()."""
+    global _atlas
+    _atlas = None
@@ -0,0 +1,119 @@
+# Fixed-rate simulation clock and render interpolation
+import time
+
+from utils import round_half_away
+
+class FixedTimestep:
+    """Accumulator that turns elapsed wall time into whole simulation ticks.
+
+    Each rendered frame adds the real time since the previous frame and
+    runs as many fixed ticks as fit, so gameplay speed does not depend on
+    how fast frames are drawn. Under load several ticks run before a frame
+    is drawn (frames are skipped); beyond `max_ticks_per_frame` the backlog
+    is dropped so a stall cannot snowball into ever longer catch-ups.
+    """
+
+    def __init__(self, rate, max_ticks_per_frame=5, clock=time.perf_counter):
+        """Initialize the timestep for `rate` ticks per second."""
+        self.tick_ms = 1000 / rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.clock = clock
+        self.accumulator = 0.0
+        self.previous = None
+        self.frames = 0
+        self.skipped_frames = 0  # Extra ticks run before drawing a frame
+        self.dropped_ms = 0.0  # Wall time discarded because ticks could not keep up
+
+    def advance(self):
+        """Add the time since the last frame and return how many ticks to run."""
+        now = self.clock()
+        if self.previous is None:
+            # The first frame runs one tick
+            self.previous = now - self.tick_ms / 1000
+        self.accumulator += (now - self.previous) * 1000
+        self.previous = now
+        self.frames += 1
+
+        ticks = int(self.accumulator // self.tick_ms)
+        if ticks > self.max_ticks_per_frame:
+            dropped_ms = (ticks - self.max_ticks_per_frame) * self.tick_ms
+            self.dropped_ms += dropped_ms
+            self.accumulator -= dropped_ms
+            ticks = self.max_ticks_per_frame
+        self.accumulator -= ticks * self.tick_ms
+        if ticks > 1:
+            self.skipped_frames += ticks - 1
+        return ticks
+
+    @property
+    def alpha(self):
+        """Fraction of a tick elapsed since the last tick, for interpolation."""
+        return min(self.accumulator / self.tick_ms, 1.0)
+
+class Interpolator:
+    """Draws moving objects between their previous and current tick positions.
+
+    `capture()` records positions before the last tick of a frame;
+    `apply(alpha)` then shifts the rects of the player, the fleet and the
+    beams back toward those positions by (1 - alpha) of a tick, and
+    `restore()` puts them back once the frame is drawn. The player and the
+    fleet move as units and all beams at one speed, so every group shifts
+    by a single offset.
+    """
+
+    def __init__(self, game_state_manager):
+        """Initialize the interpolator for a game."""
+        self.game_state_manager = game_state_manager
+        self._previous = None
+        self._shifts = None
+
+    def capture(self):
+        """Record the positions the next tick will move away from."""
+        game_state_manager = self.game_state_manager
+        enemy_wave = game_state_manager.enemy_wave
+        self._previous = (game_state_manager.player, game_state_manager.player.centerx,
+                          enemy_wave, enemy_wave.wave_number,
+                          enemy_wave.offset_x, enemy_wave.offset_y)
+
+    def apply(self, alpha):
+        """Shift rects to their interpolated positions for drawing."""
+        game_state_manager = self.game_state_manager
+        if self._previous is None or alpha >= 1:
+            return
+        player, player_x, enemy_wave, wave_number, offset_x, offset_y = self._previous
+        back = 1 - alpha
+        shifts = []
+
+        # Skip objects replaced since the capture, such as a new game or wave
+        if player is game_state_manager.player:
+            dx = round_half_away((player_x - player.centerx) * back)
+            if dx:
+                shifts.append(([player.rect], dx, 0))
+
+        if (enemy_wave is game_state_manager.enemy_wave and enemy_wave.aliens
+                and wave_number == enemy_wave.wave_number):
+            dx = round_half_away((offset_x - enemy_wave.offset_x) * back)
+            dy = round_half_away((offset_y - enemy_wave.offset_y) * back)
+            if dx or dy:
+                # Only the aliens that will be drawn
+                aliens = enemy_wave.visible_aliens()
+                shifts.append(([alien.rect for alien in aliens], dx, dy))
+
+        beams = game_state_manager.beams.sprites()
+        if beams:
+            dy = round_half_away(beams[0].speed_factor * back)
+            if dy:
+                shifts.append(([beam.rect for beam in beams], 0, dy))
+
+        for rects, dx, dy in shifts:
+            for rect in rects:
+                rect.move_ip(dx, dy)
+        self._shifts = shifts
+
+    def restore(self):
+        """Move shifted rects back to their simulated positions."""
+        if self._shifts:
+            for rects, dx, dy in self._shifts:
+                for rect in rects:
+                    rect.move_ip(-dx, -dy)
+        self._shifts = None
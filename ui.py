@@ -14,10 +14,29 @@ class UI:
         self.show_game_over_screen = False
         self.victory = False
         
-        # Initialize screen components
-        self.main_menu_screen = MainMenuScreen(settings, screen)
-        self.gameplay_screen = GameplayScreen(settings, screen)
-        self.game_over_screen = GameOverScreen(settings, screen)
+        # Screen components are built on first use, so start-up only pays
+        # for the screen shown first
+        self._main_menu_screen = None
+        self._gameplay_screen = None
+        self._game_over_screen = None
+    
+    @property
+    def main_menu_screen(self):
+        if self._main_menu_screen is None:
+            self._main_menu_screen = MainMenuScreen(self.settings, self.screen)
+        return self._main_menu_screen
+    
+    @property
+    def gameplay_screen(self):
+        if self._gameplay_screen is None:
+            self._gameplay_screen = GameplayScreen(self.settings, self.screen)
+        return self._gameplay_screen
+    
+    @property
+    def game_over_screen(self):
+        if self._game_over_screen is None:
+            self._game_over_screen = GameOverScreen(self.settings, self.screen)
+        return self._game_over_screen
     
     def check_button(self, mouse_pos):
         """Check if buttons are clicked."""
@@ -1,5 +1,6 @@
 # Button component for UI interfaces
 import pygame
+from ui_components.fonts import get_font
 
 class Button:
     def __init__(self, screen, msg, x, y, width=200, height=50):
@@ -11,7 +12,7 @@ class Button:
         self.width, self.height = width, height
         self.button_color = (0, 135, 0)
         self.text_color = (255, 255, 255)
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = get_font(48)
         
         # Build the button's rect object and center it
         self.rect = pygame.Rect(0, 0, self.width, self.height)
@@ -0,0 +1,21 @@
+# Shared font registry
+import pygame
+
+_fonts = {}
+
+def get_font(size, name=None):
+    """Return a shared font, creating it on first use.
+
+    pygame.font.SysFont performs a system font lookup, so every font is
+    created once per (name, size) and reused by all UI components.
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+def clear_fonts():
+    """Forget all cached fonts, e.g. after pygame.font.quit()."""
+    _fonts.clear()
@@ -0,0 +1,54 @@
+# Cached text rendering for the HUD
+class TextCache:
+    """Caches rendered text surfaces and re-renders only when text changes."""
+
+    def __init__(self, font, color):
+        """Initialize an empty cache for one font and color."""
+        self.font = font
+        self.color = color
+        self._entries = {}  # key -> (text, surface)
+
+    def render(self, key, text):
+        """Return the surface for `text`, reusing the last render for `key`."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != text:
+            entry = (text, self.font.render(text, True, self.color))
+            self._entries[key] = entry
+        return entry[1]
+
+class DigitAtlas:
+    """Pre-rendered glyphs for drawing numbers without calling font.render."""
+
+    GLYPHS = "0123456789-."
+
+    def __init__(self, font, color):
+        """Render each glyph once."""
+        self.glyphs = {char: font.render(char, True, color) for char in self.GLYPHS}
+        self.widths = {char: glyph.get_width() for char, glyph in self.glyphs.items()}
+
+    def draw(self, screen, value, x, y):
+        """Draw a number at (x, y) and return the drawn width."""
+        glyphs = self.glyphs
+        widths = self.widths
+        blits = []
+        start_x = x
+        for char in str(value):
+            blits.append((glyphs[char], (x, y)))
+            x += widths[char]
+        screen.blits(blits, doreturn=False)
+        return x - start_x
+
+class CounterLabel:
+    """A fixed text prefix followed by a number drawn from a DigitAtlas."""
+
+    def __init__(self, font, color, prefix, atlas):
+        """Render the prefix once."""
+        self.prefix = font.render(prefix, True, color)
+        self.prefix_width = self.prefix.get_width()
+        self.atlas = atlas
+
+    def draw(self, screen, value, position):
+        """Draw the prefix and the value at `position`."""
+        x, y = position
+        screen.blit(self.prefix, position)
+        self.atlas.draw(screen, value, x + self.prefix_width, y)
@@ -1,6 +1,8 @@
 # UI screens for different game states
 import pygame
 from ui_components.button import Button
+from ui_components.fonts import get_font
+from ui_components.text_cache import TextCache, DigitAtlas, CounterLabel
 
 class MainMenuScreen:
     """Handles the main menu screen display and interactions."""
@@ -12,7 +14,7 @@ class MainMenuScreen:
         self.screen_rect = screen.get_rect()
         
         # Set up fonts
-        self.title_font = pygame.font.SysFont(None, 64)
+        self.title_font = get_font(64)
         self.text_color = (255, 255, 255)
         
         # Create buttons
@@ -55,9 +57,28 @@ class GameplayScreen:
         self.screen_rect = screen.get_rect()
         
         # Set up fonts
-        self.normal_font = pygame.font.SysFont(None, 36)
+        self.normal_font = get_font(36)
+        self.message_font = get_font(48)
         self.text_color = (255, 255, 255)
         
+        # Set up cached HUD text: fixed labels are rendered once and numbers
+        # are composed from pre-rendered digits
+        self.text_cache = TextCache(self.normal_font, self.text_color)
+        self.message_cache = TextCache(self.message_font, (255, 255, 0))
+        atlas = DigitAtlas(self.normal_font, self.text_color)
+        self.wave_label = CounterLabel(self.normal_font, self.text_color, "Wave: ", atlas)
+        self.health_label = CounterLabel(self.normal_font, self.text_color, "Health: ", atlas)
+        self.gems_label = CounterLabel(self.normal_font, self.text_color, "Gems: ", atlas)
+        self.defense_label = CounterLabel(self.normal_font, self.text_color, "Defense Level: ", atlas)
+        self.speed_label = CounterLabel(self.normal_font, self.text_color, "Speed Level: ", atlas)
+        self.fire_rate_label = CounterLabel(self.normal_font, self.text_color, "Fire Rate Level: ", atlas)
+        self.cost_label = CounterLabel(self.normal_font, self.text_color, "Cost: ", atlas)
+        
+        # Create the message overlay background once
+        self.message_overlay = pygame.Surface((self.screen_rect.width, 60))
+        self.message_overlay.set_alpha(180)
+        self.message_overlay.fill((0, 0, 0))
+        
         # Create buttons
         button_width = 180
         button_height = 40
@@ -99,33 +120,34 @@ class GameplayScreen:
     def display(self, player, base, wave_number, resource_manager=None, game_state_manager=None):
         """Display the in-game UI."""
         # Draw wave number
-        wave_text = self.normal_font.render(f"Wave: {wave_number}", True, self.text_color)
-        self.screen.blit(wave_text, (20, 20))
+        self.wave_label.draw(self.screen, wave_number, (20, 20))
         
         # Draw player health
-        health_text = self.normal_font.render(f"Health: {player.health}", True, self.text_color)
-        self.screen.blit(health_text, (20, 60))
+        self.health_label.draw(self.screen, player.health, (20, 60))
         
         # Draw gems from resource manager
         if resource_manager:
-            gems_text = self.normal_font.render(f"Gems: {resource_manager.gems}", True, self.text_color)
-            self.screen.blit(gems_text, (20, 100))
+            self.gems_label.draw(self.screen, resource_manager.gems, (20, 100))
         
         # Draw base defense level
-        defense_text = self.normal_font.render(f"Defense Level: {base.defense_level}", True, self.text_color)
-        self.screen.blit(defense_text, (20, 140))
+        self.defense_label.draw(self.screen, base.defense_level, (20, 140))
         
         # Draw weapon info
-        weapon_text = self.normal_font.render(f"Weapon: {player.weapon.name} (Lvl {player.weapon.level})", True, self.text_color)
+        weapon_text = self.text_cache.render(
+            "weapon", f"Weapon: {player.weapon.name} (Lvl {player.weapon.level})")
         self.screen.blit(weapon_text, (20, 180))
         
         # Draw speed level
-        speed_text = self.normal_font.render(f"Speed Level: {player.speed_level}", True, self.text_color)
-        self.screen.blit(speed_text, (20, 220))
+        self.speed_label.draw(self.screen, player.speed_level, (20, 220))
         
         # Draw fire rate level
-        fire_rate_text = self.normal_font.render(f"Fire Rate Level: {player.fire_rate_level}", True, self.text_color)
-        self.screen.blit(fire_rate_text, (20, 260))
+        self.fire_rate_label.draw(self.screen, player.fire_rate_level, (20, 260))
+        
+        # Draw the upgrade the advisor suggests, if one is running
+        if game_state_manager and game_state_manager.upgrade_hint:
+            kind = game_state_manager.upgrade_hint.replace("_", " ").title()
+            hint_text = self.text_cache.render("hint", f"Suggested: Upgrade {kind}")
+            self.screen.blit(hint_text, (20, 300))
         
         # Draw upgrade costs if resource manager is available
         if resource_manager:
@@ -134,23 +156,19 @@ class GameplayScreen:
             
             # Defense upgrade cost
             defense_cost = resource_manager.get_upgrade_cost(base.defense_level)
-            defense_cost_text = self.normal_font.render(f"Cost: {defense_cost}", True, self.text_color)
-            self.screen.blit(defense_cost_text, (cost_x, self.upgrade_defense_button.rect.centery - 15))
+            self.cost_label.draw(self.screen, defense_cost, (cost_x, self.upgrade_defense_button.rect.centery - 15))
             
             # Weapon upgrade cost
             weapon_cost = resource_manager.get_upgrade_cost(player.weapon.level)
-            weapon_cost_text = self.normal_font.render(f"Cost: {weapon_cost}", True, self.text_color)
-            self.screen.blit(weapon_cost_text, (cost_x, self.upgrade_weapon_button.rect.centery - 15))
+            self.cost_label.draw(self.screen, weapon_cost, (cost_x, self.upgrade_weapon_button.rect.centery - 15))
             
             # Speed upgrade cost
             speed_cost = resource_manager.get_upgrade_cost(player.speed_level)
-            speed_cost_text = self.normal_font.render(f"Cost: {speed_cost}", True, self.text_color)
-            self.screen.blit(speed_cost_text, (cost_x, self.upgrade_speed_button.rect.centery - 15))
+            self.cost_label.draw(self.screen, speed_cost, (cost_x, self.upgrade_speed_button.rect.centery - 15))
             
             # Fire rate upgrade cost
             fire_rate_cost = resource_manager.get_upgrade_cost(player.fire_rate_level)
-            fire_rate_cost_text = self.normal_font.render(f"Cost: {fire_rate_cost}", True, self.text_color)
-            self.screen.blit(fire_rate_cost_text, (cost_x, self.upgrade_fire_rate_button.rect.centery - 15))
+            self.cost_label.draw(self.screen, fire_rate_cost, (cost_x, self.upgrade_fire_rate_button.rect.centery - 15))
         
         # Draw upgrade buttons
         self.upgrade_defense_button.draw()
@@ -165,6 +183,25 @@ class GameplayScreen:
         if game_state_manager and game_state_manager.show_upgrade_message:
             self.draw_message(game_state_manager.upgrade_message)
     
+    def get_hud_rects(self):
+        """Return the screen areas the HUD draws into."""
+        buttons = self.upgrade_defense_button.rect.unionall([
+            self.upgrade_weapon_button.rect,
+            self.upgrade_speed_button.rect,
+            self.upgrade_fire_rate_button.rect,
+        ])
+        return [
+            # Wave, health, gems and level read-outs, and the upgrade hint
+            pygame.Rect(0, 0, self.screen_rect.centerx - 150, 340),
+            # Base health bar
+            pygame.Rect(self.screen_rect.centerx - 150, 20, 300, 30),
+            # Upgrade costs and buttons
+            pygame.Rect(self.screen_rect.right - 220, buttons.top,
+                        220, buttons.height).union(buttons),
+            # Message overlay
+            pygame.Rect(0, self.screen_rect.centery - 30, self.screen_rect.width, 60),
+        ]
+    
     def check_buttons(self, mouse_pos):
         """Check if buttons are clicked."""
         if self.upgrade_defense_button.is_clicked(mouse_pos):
@@ -179,15 +216,11 @@ class GameplayScreen:
         
     def draw_message(self, message):
         """Draw a message overlay on the screen."""
-        # Create a semi-transparent background
-        overlay = pygame.Surface((self.screen_rect.width, 60))
-        overlay.set_alpha(180)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, self.screen_rect.centery - 30))
+        # Draw the semi-transparent background
+        self.screen.blit(self.message_overlay, (0, self.screen_rect.centery - 30))
         
         # Render and center the message
-        message_font = pygame.font.SysFont(None, 48)
-        message_text = message_font.render(message, True, (255, 255, 0))
+        message_text = self.message_cache.render("message", message)
         message_rect = message_text.get_rect()
         message_rect.center = self.screen_rect.center
         self.screen.blit(message_text, message_rect)
@@ -203,7 +236,7 @@ class GameOverScreen:
         self.screen_rect = screen.get_rect()
         
         # Set up fonts
-        self.title_font = pygame.font.SysFont(None, 64)
+        self.title_font = get_font(64)
         self.text_color = (255, 255, 255)
         
         # Create buttons
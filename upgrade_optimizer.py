@@ -0,0 +1,330 @@
+# Memoized upgrade-path optimizer
+#
+# Finds the best order to buy defense, weapon, speed and fire-rate upgrades
+# under a steady gem income per wave. Every combination of upgrade levels is
+# scored by playing seeded headless games with those levels and no further
+# purchases. Scores are cached in memory and in a JSON file, and planning is
+# a dynamic program over (gems, levels) tabulated for every gem amount, so
+# once the reachable levels are scored a query is a few table lookups.
+#
+#     python upgrade_optimizer.py --gems 100 --income 600 --waves 2
+#     python upgrade_optimizer.py --gems 400 --levels 1 2 1 1 --cache upgrade_scores.json
+#     python game.py --upgrade-hints upgrade_scores.json
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from math import gcd
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from settings import Settings
+from simulation import Simulation
+from autopilot import UPGRADES, UPGRADE_ACTIONS, GameView, make_policy
+from resources import ResourceManager
+
+START_LEVELS = (1,) * len(UPGRADES)
+
+def apply_levels(simulation, levels):
+    """Buy upgrades in a started game until it has `levels`, without spending its gems.
+
+    Levels are given in UPGRADES order. Each upgrade goes through the
+    game's own upgrade action, paid for with gems granted just for it.
+    """
+    game_state_manager = simulation.game_state_manager
+    resource_manager = game_state_manager.resource_manager
+    view = GameView(simulation)
+    for kind, level in zip(UPGRADES, levels):
+        while view.level(kind) < level:
+            resource_manager.earn_resources(view.upgrade_cost(kind))
+            game_state_manager.handle_action(UPGRADE_ACTIONS[kind])
+    game_state_manager.show_upgrade_message = False
+
+def score_levels(levels, games=1, ticks=12000, seed=0, policy_name="track", settings=None):
+    """Score upgrade levels by the games a policy plays with them.
+
+    Game `n` uses seed `seed + n` and starts with `levels` already bought.
+    Games are played in endless mode, so strong levels are not all capped
+    at the same victory. The score is the mean of the waves cleared plus
+    the fraction of base health left, so higher is better.
+    """
+    settings = (settings or Settings()).copy(endless_mode=True)
+    total = 0.0
+    for game in range(games):
+        simulation = Simulation(settings, seed=seed + game)
+        simulation.policy = make_policy(policy_name)
+        simulation.step("start_game")
+        apply_levels(simulation, levels)
+        summary = simulation.run(ticks - 1)
+        base = simulation.game_state_manager.base
+        total += summary["waves_cleared"] + summary["base_health"] / base.max_health
+    return total / games
+
+class ScoreCache:
+    """Level scores kept in memory and persisted to a JSON file.
+
+    `params` records how the scores were produced (games, ticks, seed and
+    policy). A file scored with other params is ignored; with no params
+    the file's own are adopted, which lets the game read any cache.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=None, params=None):
+        """Load the scores stored at `path`, if any."""
+        self.path = path
+        self.params = params
+        self.scores = {}
+        if path and os.path.exists(path):
+            with open(path) as cache_file:
+                data = json.load(cache_file)
+            if data.get("version") == self.VERSION and params in (None, data["params"]):
+                self.params = data["params"]
+                self.scores = {tuple(int(level) for level in key.split(",")): score
+                               for key, score in data["scores"].items()}
+
+    def __contains__(self, levels):
+        return levels in self.scores
+
+    def __len__(self):
+        return len(self.scores)
+
+    def get(self, levels):
+        return self.scores.get(levels)
+
+    def set(self, levels, score):
+        self.scores[levels] = score
+
+    def save(self, path=None):
+        """Write the scores as JSON, replacing the file in one step."""
+        path = path or self.path
+        data = {
+            "version": self.VERSION,
+            "params": self.params,
+            "scores": {",".join(map(str, levels)): score
+                       for levels, score in sorted(self.scores.items())},
+        }
+        temporary = path + ".tmp"
+        with open(temporary, "w") as cache_file:
+            json.dump(data, cache_file, indent=1)
+        os.replace(temporary, path)
+        return path
+
+class UpgradeOptimizer:
+    """Plans upgrade purchases that maximize the summed score of the levels played.
+
+    A plan covers `waves` waves. Before each wave any affordable upgrades
+    may be bought; the wave then adds the score of the levels it is played
+    with, and `income` gems arrive for the next one. Buying A then B
+    reaches the same (gems, levels) as B then A, so the best value of each
+    state, with the waves left, is tabulated once for every scored set of
+    levels. Costs and income are whole multiples of one gem unit, so gems
+    are counted in units, capped where nothing more can be bought; the
+    tables have a fixed size and a query is a handful of lookups.
+
+    `scorer(levels)` scores unseen levels and fills the cache. Without a
+    scorer only cached levels can be planned for.
+    """
+
+    def __init__(self, settings=None, cache=None, scorer=score_levels, income=600,
+                 waves=2, max_level=8):
+        """Initialize the optimizer."""
+        self.settings = settings or Settings()
+        self.cache = cache if cache is not None else ScoreCache()
+        self.scorer = scorer
+        self.income = income
+        self.waves = waves
+        self.max_level = max_level
+        self._resource_manager = ResourceManager(self.settings)
+        self._costs = [self.cost(level) for level in range(max_level)]  # Indexed by current level
+        self._gem_unit = gcd(self.settings.upgrade_cost, income) or 1
+        # Gems past the cost of maxing every upgrade can never be spent
+        self._gem_units = len(START_LEVELS) * sum(self._costs[1:]) // self._gem_unit + 1
+        self._tables = []  # Per waves left: best value by (*levels, gem units)
+        self._tabled = set()  # Levels the tables were built from
+        self._tabled_size = None  # Cache size when they were built
+
+    def cost(self, level):
+        """Gem cost of the upgrade from `level` to the next level."""
+        return self._resource_manager.get_upgrade_cost(level)
+
+    def score(self, levels):
+        """Return the score of `levels`, or None if it is unknown and cannot be scored."""
+        score = self.cache.get(levels)
+        if score is None and self.scorer is not None:
+            score = self.scorer(levels)
+            self.cache.set(levels, score)
+        return score
+
+    def _upgrades(self, gems, levels):
+        """Yield (kind index, cost, new levels) for each affordable upgrade."""
+        costs = self._costs
+        for index, level in enumerate(levels):
+            if level < self.max_level and costs[level] <= gems:
+                yield index, costs[level], levels[:index] + (level + 1,) + levels[index + 1:]
+
+    def units(self, gems):
+        """Return the table column for `gems`; queries in the same column get the same answer."""
+        return min(gems // self._gem_unit, self._gem_units - 1)
+
+    def prepare(self):
+        """Tabulate the best value of every cached state, unless the cache has not grown."""
+        if len(self.cache) == self._tabled_size:
+            return
+        kinds = len(START_LEVELS)
+        tabled = {levels for levels in self.cache.scores
+                  if len(levels) == kinds and all(1 <= level <= self.max_level for level in levels)}
+        units = self._gem_units
+        scores = np.full((self.max_level + 1,) * kinds, -np.inf)
+        for levels in tabled:
+            scores[levels] = self.cache.get(levels)
+        known = np.isfinite(scores)[..., None]
+        paid = np.minimum(np.arange(units) + self.income // self._gem_unit, units - 1)
+
+        tables = []
+        later = np.zeros(scores.shape + (units,))
+        for _ in range(self.waves):
+            # Play this wave as is, then buy upgrades while any state improves
+            value = np.where(known, scores[..., None] + later[..., paid], -np.inf)
+            while True:
+                before = value.copy()
+                for kind in range(kinds):
+                    for level in range(self.max_level - 1, 0, -1):
+                        cost = self._costs[level] // self._gem_unit
+                        here = (slice(None),) * kind + (level,)
+                        bought = (slice(None),) * kind + (level + 1,)
+                        # Unscored levels stay unreachable
+                        gain = np.where(known[here], value[bought][..., :units - cost], -np.inf)
+                        np.maximum(value[here][..., cost:], gain, out=value[here][..., cost:])
+                if np.array_equal(value, before):
+                    break
+            tables.append(value)
+            later = value
+        self._tables = tables
+        self._tabled = tabled
+        self._tabled_size = len(self.cache)
+
+    def _query(self, gems, levels):
+        """Return the best (value, first step) for a query, scoring what it can reach first."""
+        if self.scorer is not None:
+            for reached in self.reachable(gems, levels):
+                self.score(reached)
+        self.prepare()
+        return self._value(self.waves, gems, tuple(levels))
+
+    def _value(self, waves, gems, levels):
+        """Return the best (value, first step) from a state; a step is a kind index or None to play."""
+        best = (float("-inf"), None)
+        if levels in self._tabled:
+            later = 0.0
+            if waves > 1:
+                later = float(self._tables[waves - 2][levels + (self.units(gems + self.income),)])
+            best = (self.cache.get(levels) + later, None)
+        table = self._tables[waves - 1]
+        for index, cost, bought in self._upgrades(gems, levels):
+            if bought not in self._tabled:
+                continue  # Unscored; planning stays within the cache
+            value = float(table[bought + (self.units(gems - cost),)])
+            if value > best[0]:
+                best = (value, index)
+        return best
+
+    def plan(self, gems, levels=START_LEVELS):
+        """Return the best purchases per wave, the final levels and the plan's value.
+
+        Purchases are listed as upgrade kinds in buying order, one list per
+        wave. The value is None when no reachable levels have a score.
+        """
+        levels = tuple(levels)
+        value, _ = self._query(gems, levels)
+        if value == float("-inf"):
+            return {"purchases": [], "levels": dict(zip(UPGRADES, levels)), "gems_left": gems,
+                    "value": None}
+
+        purchases = [[]]
+        waves_left = self.waves
+        while True:
+            _, step = self._value(waves_left, gems, levels)
+            if step is None:
+                if waves_left == 1:
+                    break
+                waves_left -= 1
+                gems += self.income
+                purchases.append([])
+                continue
+            purchases[-1].append(UPGRADES[step])
+            gems -= self.cost(levels[step])
+            levels = levels[:step] + (levels[step] + 1,) + levels[step + 1:]
+        return {"purchases": purchases, "levels": dict(zip(UPGRADES, levels)),
+                "gems_left": gems, "value": round(value, 4)}
+
+    def suggest(self, gems, levels):
+        """Return the upgrade kind to buy now, or None to save the gems."""
+        _, step = self._query(gems, levels)
+        return None if step is None else UPGRADES[step]
+
+    def reachable(self, gems, levels=START_LEVELS):
+        """Return every set of levels a plan from here can afford."""
+        budget = gems + self.income * (self.waves - 1)
+        seen = {tuple(levels): budget}
+        frontier = [tuple(levels)]
+        while frontier:
+            current = frontier.pop()
+            for _, cost, bought in self._upgrades(seen[current], current):
+                left = seen[current] - cost
+                if seen.get(bought, -1) < left:
+                    seen[bought] = left
+                    frontier.append(bought)
+        return sorted(seen)
+
+def _score_job(job):
+    """Process pool entry point: score one set of levels."""
+    levels, params = job
+    return levels, score_levels(levels, **params)
+
+def fill_cache(cache, levels_list, workers=None):
+    """Score the levels missing from the cache across worker processes."""
+    missing = [levels for levels in levels_list if levels not in cache]
+    if not missing:
+        return 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for levels, score in executor.map(_score_job, [(levels, cache.params) for levels in missing]):
+            cache.set(levels, score)
+    return len(missing)
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Plan the best order of upgrade purchases")
+    parser.add_argument("--gems", type=int, default=Settings().initial_gems, help="gems to start with")
+    parser.add_argument("--levels", type=int, nargs=len(UPGRADES), default=list(START_LEVELS),
+                        metavar="LEVEL", help="starting levels of " + ", ".join(UPGRADES))
+    parser.add_argument("--income", type=int, default=600, help="gems earned per wave")
+    parser.add_argument("--waves", type=int, default=2, help="waves to plan for")
+    parser.add_argument("--max-level", type=int, default=8, help="highest level of any upgrade")
+    parser.add_argument("--cache", default="upgrade_scores.json", help="score cache JSON file")
+    parser.add_argument("--games", type=int, default=1, help="games played to score a set of levels")
+    parser.add_argument("--ticks", type=int, default=12000, help="maximum ticks per scoring game")
+    parser.add_argument("--seed", type=int, default=0, help="first scoring game seed")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (defaults to the CPU count)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    params = {"games": args.games, "ticks": args.ticks, "seed": args.seed, "policy_name": "track"}
+    cache = ScoreCache(args.cache, params)
+    optimizer = UpgradeOptimizer(cache=cache, scorer=partial(score_levels, **params),
+                                 income=args.income, waves=args.waves, max_level=args.max_level)
+    scored = fill_cache(cache, optimizer.reachable(args.gems, tuple(args.levels)), args.workers)
+    if scored:
+        cache.save()
+    plan = optimizer.plan(args.gems, args.levels)
+    plan["scored"] = scored
+    print(json.dumps(plan))
+    return plan
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # Helper functions for expansion
+import math
 import pygame
 import sys
 import random
@@ -8,4 +9,18 @@ import random
 # - InputHandler: handles user input and events
 # - Renderer: handles rendering to the screen
 # - CollisionHandler: handles collision detection and resolution
-# - StarfieldGenerator: handles starfield creation and animation 
\ No newline at end of file
+# - Starfield: handles starfield creation and animation
+
+def get_screen_rect(settings, screen=None):
+    """Return the screen's rect, or one sized from settings when there is no screen.
+    
+    Headless games can run without any surface; game objects then take
+    their bounds from the configured screen size.
+    """
+    if screen is not None:
+        return screen.get_rect()
+    return pygame.Rect(0, 0, settings.screen_width, settings.screen_height) 
+
+def round_half_away(value):
+    """Round to the nearest integer with halves away from zero, as pygame Rects do."""
+    return int(math.copysign(math.floor(abs(value) + 0.5), value))
@@ -1,117 +1,318 @@
 # Visual effects for the game
-import random
+import numpy as np
 import pygame
 
-class StarfieldGenerator:
-    """Generates and manages starfield backgrounds."""
+class Starfield:
+    """A scrolling starfield baked into a few wrap-around parallax layers.
     
-    @staticmethod
-    def create_stars(settings, screen, num_stars=50):
-        """Create a starfield background."""
-        stars = []
-        for _ in range(num_stars):
-            x = random.randint(0, settings.screen_width)
-            y = random.randint(0, settings.screen_height)
-            size = random.randint(1, 3)
-            brightness = random.randint(150, 255)
-            color = (brightness, brightness, brightness)
-            stars.append((x, y, size, color))
-        return stars
+    Star positions, sizes and brightness live in NumPy arrays. Each layer is
+    a full-screen surface with its stars drawn in once; scrolling a layer
+    costs two blits no matter how many stars it holds. Twinkling picks stars
+    with one batched random mask and rewrites only their pixels. The stars
+    that moved or twinkled since they were last presented are tracked so a
+    dirty-rect renderer can present just their areas.
+    """
     
-    @staticmethod
-    def update_stars(stars, settings):
-        """Update star positions for twinkling or movement effect."""
-        updated_stars = []
-        for x, y, size, color in stars:
-            # Move stars slightly downward to create a falling effect
-            y = (y + 1) % settings.screen_height
-            
-            # Randomly change brightness for twinkling effect
-            if random.random() < 0.05:  # 5% chance to change brightness
-                brightness = random.randint(150, 255)
-                color = (brightness, brightness, brightness)
-                
-            updated_stars.append((x, y, size, color))
-        
-        return updated_stars
-
-class UpgradeEffect:
-    """Class to create visual effects for upgrades."""
-    
-    def __init__(self, screen, x, y, color=(255, 215, 0)):
-        """Initialize the upgrade effect."""
-        self.screen = screen
-        self.x = x
-        self.y = y
-        self.color = color
-        self.particles = []
-        self.lifetime = 60  # Effect lasts for 60 frames (1 second at 60 FPS)
-        self.create_particles()
-        
-    def create_particles(self, num_particles=30):
-        """Create particles for the effect."""
-        for _ in range(num_particles):
-            # Random velocity
-            vx = random.uniform(-3, 3)
-            vy = random.uniform(-5, 0)
+    def __init__(self, settings, num_stars=None, num_layers=None, seed=None):
+        """Create the stars and bake them into their layers."""
+        self.settings = settings
+        self.width = settings.screen_width
+        self.height = settings.screen_height
+        num_stars = settings.star_count if num_stars is None else num_stars
+        num_layers = num_layers or settings.starfield_layers
+        self.rng = np.random.default_rng(seed)
+        
+        # Star attributes, one entry per star
+        self.x = self.rng.integers(0, self.width, num_stars)
+        self.y = self.rng.integers(0, self.height, num_stars)
+        self.size = self.rng.integers(1, 3, num_stars, endpoint=True)
+        self.brightness = self.rng.integers(150, 256, num_stars).astype(np.uint8)
+        self.layer = self.rng.integers(0, num_layers, num_stars)
+        
+        # Farther layers scroll more slowly
+        self.speeds = [settings.star_speed * (i + 1) / num_layers for i in range(num_layers)]
+        self.offsets = [0.0] * num_layers
+        self._presented_offsets = None  # Layer offsets at the last dirty_rects() call
+        self._twinkled = np.zeros(num_stars, dtype=bool)  # Stars rebaked since then
+        
+        self.layers = []
+        for i in range(num_layers):
+            layer = pygame.Surface((self.width, self.height))
+            layer.fill(settings.bg_color)
+            if i > 0:
+                # Only the back layer is opaque; it replaces the background fill
+                layer.set_colorkey(settings.bg_color)
+            self.layers.append(layer)
+        self._bake(np.arange(num_stars))
+        
+        if pygame.display.get_surface() is not None:
+            self.layers = [layer.convert() for layer in self.layers]
+        
+    def _bake(self, stars):
+        """Write the pixels of the given stars into their layer surfaces."""
+        for i, layer in enumerate(self.layers):
+            in_layer = stars[self.layer[stars] == i]
+            if not in_layer.size:
+                continue
+            pixels = pygame.surfarray.pixels3d(layer)
+            x = self.x[in_layer]
+            y = self.y[in_layer]
+            size = self.size[in_layer]
+            brightness = self.brightness[in_layer][:, None]
+            # Each star is a size x size square; paint it one offset at a time
+            for dx in range(3):
+                for dy in range(3):
+                    mask = size > max(dx, dy)
+                    pixels[(x[mask] + dx) % self.width,
+                           (y[mask] + dy) % self.height] = brightness[mask]
+            del pixels
             
-            # Random size
-            size = random.randint(2, 5)
+    def update(self):
+        """Scroll the layers and twinkle a random subset of stars."""
+        for i, speed in enumerate(self.speeds):
+            self.offsets[i] = (self.offsets[i] + speed) % self.height
             
-            # Random lifetime
-            lifetime = random.randint(30, 60)
+        twinkling = np.flatnonzero(
+            self.rng.random(self.x.size) < self.settings.star_twinkle_chance)
+        if twinkling.size:
+            self.brightness[twinkling] = self.rng.integers(150, 256, twinkling.size)
+            self._bake(twinkling)
+            self._twinkled[twinkling] = True
             
-            # Add particle
-            self.particles.append({
-                'x': self.x,
-                'y': self.y,
-                'vx': vx,
-                'vy': vy,
-                'size': size,
-                'lifetime': lifetime,
-                'max_lifetime': lifetime
-            })
-    
-    def update(self):
-        """Update the particles."""
-        self.lifetime -= 1
+    def draw(self, screen, rects=None):
+        """Draw the layers back to front, each wrapped with two blits.
         
-        for particle in self.particles[:]:
-            # Update position
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
+        With `rects`, only those screen areas are redrawn: the opaque back
+        layer is blitted into all of them and each layer in front of it only
+        into the areas that hold one of its stars.
+        """
+        if rects is not None:
+            self._draw_areas(screen, rects)
+            return
+        for layer, offset in zip(self.layers, self.offsets):
+            offset = int(offset)
+            screen.blit(layer, (0, offset))
+            screen.blit(layer, (0, offset - self.height))
             
-            # Apply gravity
-            particle['vy'] += 0.1
+    def _draw_areas(self, screen, rects):
+        """Redraw the starfield inside the given screen areas only."""
+        boxes = np.array([(rect.left, rect.top, rect.right, rect.bottom) for rect in rects],
+                         dtype=np.int64).reshape(-1, 4)
+        left = np.maximum(boxes[:, 0], 0)
+        right = np.minimum(boxes[:, 2], self.width)
+        for i, (layer, offset) in enumerate(zip(self.layers, self.offsets)):
+            offset = int(offset)
+            starred = True if i == 0 else self._starred(boxes, i, offset)
+            blits = []
+            for top in (offset, offset - self.height):
+                # Clip each area to the part of this layer copy it overlaps
+                area_top = np.maximum(boxes[:, 1] - top, 0)
+                area_bottom = np.minimum(boxes[:, 3] - top, self.height)
+                keep = starred & (right > left) & (area_bottom > area_top)
+                blits.extend((layer, (x, y + top), (x, y, w, h)) for x, y, w, h in zip(
+                    left[keep].tolist(), area_top[keep].tolist(),
+                    (right - left)[keep].tolist(), (area_bottom - area_top)[keep].tolist()))
+            screen.blits(blits, doreturn=False)
             
-            # Decrease lifetime
-            particle['lifetime'] -= 1
-            
-            # Remove dead particles
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-                
-        return self.lifetime > 0 and self.particles
-    
-    def draw(self):
-        """Draw the particles."""
-        for particle in self.particles:
-            # Calculate alpha based on remaining lifetime
-            alpha = int(255 * (particle['lifetime'] / particle['max_lifetime']))
+    def _starred(self, boxes, layer, offset):
+        """Return which of the (left, top, right, bottom) boxes hold a star of `layer`."""
+        in_layer = self.layer == layer
+        x = self.x[in_layer]
+        y = (self.y[in_layer] + offset) % self.height
+        size = self.size[in_layer]
+        # Stars crossing the right or bottom edge also show at the opposite one
+        wraps = x + size > self.width
+        x, y, size = (np.concatenate((x, x[wraps] - self.width)),
+                      np.concatenate((y, y[wraps])), np.concatenate((size, size[wraps])))
+        wraps = y + size > self.height
+        x, y, size = (np.concatenate((x, x[wraps])),
+                      np.concatenate((y, y[wraps] - self.height)), np.concatenate((size, size[wraps])))
+        return ((x < boxes[:, 2:3]) & (x + size > boxes[:, 0:1])
+                & (y < boxes[:, 3:4]) & (y + size > boxes[:, 1:2])).any(axis=1)
             
-            # Create a surface for the particle
-            particle_surface = pygame.Surface((particle['size'] * 2, particle['size'] * 2), pygame.SRCALPHA)
+    def dirty_rects(self):
+        """Return the screen areas whose stars moved or twinkled since the last call.
+        
+        Each changed star gets one rect spanning its old and new position,
+        plus wrapped copies where it crosses the right or bottom edge.
+        Returns None on the first call, or when the areas would cover more
+        than half the screen, meaning the whole frame should be presented.
+        """
+        offsets = [int(offset) for offset in self.offsets]
+        previous = self._presented_offsets
+        twinkled = self._twinkled
+        self._presented_offsets = offsets
+        self._twinkled = np.zeros_like(twinkled)
+        if previous is None:
+            return None
             
-            # Draw the particle with alpha
-            pygame.draw.circle(
-                particle_surface, 
-                (*self.color, alpha), 
-                (particle['size'], particle['size']), 
-                particle['size']
-            )
+        # Layers only move on screen when their whole-pixel offset changes
+        steps = np.array([(new - old) % self.height for new, old in zip(offsets, previous)])
+        step = steps[self.layer]
+        changed = np.flatnonzero((step > 0) | twinkled)
+        if not changed.size:
+            return []
+        size = self.size[changed]
+        step = step[changed]
+        height = size + step
+        if int((size * height).sum()) > self.width * self.height // 2:
+            return None
             
-            # Blit the particle surface to the screen
-            self.screen.blit(
-                particle_surface, 
-                (particle['x'] - particle['size'], particle['y'] - particle['size'])
-            ) 
\ No newline at end of file
+        top = (self.y[changed] + np.array(previous)[self.layer[changed]]) % self.height
+        rects = [pygame.Rect(x, y, w, h) for x, y, w, h in zip(
+            self.x[changed].tolist(), top.tolist(), size.tolist(), height.tolist())]
+        rects.extend([rect.move(-self.width, 0) for rect in rects if rect.right > self.width])
+        rects.extend([rect.move(0, -self.height) for rect in rects if rect.bottom > self.height])
+        return rects
+
+class ParticleSystem:
+    """Array-backed particle engine with a global particle budget.
+    
+    Every live particle occupies one slot in a set of NumPy arrays; slots
+    [0, count) are live. Dead particles are compacted by moving live ones
+    from the tail into their slots. Particles are drawn with pre-baked
+    sprites, one per size, color and alpha step, in a single blits() call.
+    """
+    
+    ALPHA_STEPS = 16
+    
+    def __init__(self, settings, budget=None, seed=None):
+        """Allocate arrays for up to `budget` particles."""
+        self.settings = settings
+        self.budget = budget or settings.particle_budget
+        self.gravity = settings.particle_gravity
+        self.rng = np.random.default_rng(seed)
+        
+        self.x = np.zeros(self.budget, dtype=np.float32)
+        self.y = np.zeros(self.budget, dtype=np.float32)
+        self.vx = np.zeros(self.budget, dtype=np.float32)
+        self.vy = np.zeros(self.budget, dtype=np.float32)
+        self.life = np.zeros(self.budget, dtype=np.int32)
+        self.max_life = np.ones(self.budget, dtype=np.int32)
+        self.size = np.zeros(self.budget, dtype=np.int32)
+        self.color = np.zeros(self.budget, dtype=np.int32)
+        self.count = 0
+        self.dropped = 0  # Particles refused because the budget was full
+        
+        self.colors = []  # Color index -> RGB
+        self._color_indices = {}
+        self._sprites = {}  # (color index, size) -> surfaces by alpha step
+        
+    def emit(self, x, y, count, color, speed_x=(-3, 3), speed_y=(-5, 0),
+             size=(2, 5), lifetime=(30, 60)):
+        """Emit up to `count` particles at (x, y) with random velocities."""
+        start = self.count
+        count_allowed = min(count, self.budget - start)
+        self.dropped += count - count_allowed
+        if count_allowed <= 0:
+            return 0
+        end = start + count_allowed
+        rng = self.rng
+        
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = rng.uniform(speed_x[0], speed_x[1], count_allowed)
+        self.vy[start:end] = rng.uniform(speed_y[0], speed_y[1], count_allowed)
+        self.size[start:end] = rng.integers(size[0], size[1], count_allowed, endpoint=True)
+        life = rng.integers(lifetime[0], lifetime[1], count_allowed, endpoint=True)
+        self.life[start:end] = life
+        self.max_life[start:end] = life
+        self.color[start:end] = self._color_index(color)
+        self.count = end
+        return count_allowed
+        
+    def emit_upgrade(self, x, y, color=(255, 215, 0)):
+        """Emit the fountain of sparks shown when an upgrade is bought."""
+        return self.emit(x, y, 30, color)
+        
+    def emit_explosion(self, x, y, color=(255, 0, 0)):
+        """Emit a small burst of debris where an alien was destroyed."""
+        return self.emit(x, y, self.settings.explosion_particles, color,
+                         speed_x=(-2, 2), speed_y=(-2, 2),
+                         size=(1, 3), lifetime=(15, 30))
+        
+    def _color_index(self, color):
+        """Return the index of a color, registering it on first use."""
+        index = self._color_indices.get(color)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(color)
+            self._color_indices[color] = index
+        return index
+        
+    def update(self):
+        """Move the particles, apply gravity and compact out dead ones."""
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += self.gravity
+        self.life[:n] -= 1
+        
+        dead = np.flatnonzero(self.life[:n] <= 0)
+        if not dead.size:
+            return
+        new_count = n - dead.size
+        # Dead slots below the new count are refilled from live tail slots
+        holes = dead[dead < new_count]
+        movers = new_count + np.flatnonzero(self.life[new_count:n] > 0)
+        for array in (self.x, self.y, self.vx, self.vy, self.life,
+                      self.max_life, self.size, self.color):
+            array[holes] = array[movers]
+        self.count = new_count
+        
+    def clear(self):
+        """Remove every particle."""
+        self.count = 0
+        
+    def _bake(self, color_index, size):
+        """Pre-render one circle sprite per alpha step."""
+        color = self.colors[color_index]
+        steps = self.ALPHA_STEPS
+        sprites = []
+        for step in range(steps):
+            alpha = round(255 * step / (steps - 1))
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*color, alpha), (size, size), size)
+            sprites.append(sprite)
+        self._sprites[(color_index, size)] = sprites
+        return sprites
+        
+    def draw(self, screen):
+        """Draw all live particles with one batched blit."""
+        n = self.count
+        if not n:
+            return
+        size = self.size[:n]
+        # Alpha fades with remaining lifetime
+        steps = (self.life[:n] * (self.ALPHA_STEPS - 1)) // self.max_life[:n]
+        left = (self.x[:n] - size).astype(np.int32)
+        top = (self.y[:n] - size).astype(np.int32)
+        
+        sprites = self._sprites
+        blits = []
+        for color_index, radius, step, x, y in zip(
+                self.color[:n].tolist(), size.tolist(), steps.tolist(),
+                left.tolist(), top.tolist()):
+            frames = sprites.get((color_index, radius))
+            if frames is None:
+                frames = self._bake(color_index, radius)
+            blits.append((frames[step], (x, y)))
+        screen.blits(blits, doreturn=False)
+        
+    def boxes(self):
+        """Return the left, top, right and bottom edges of every live particle as arrays."""
+        n = self.count
+        size = self.size[:n]
+        left = (self.x[:n] - size).astype(np.int32)
+        top = (self.y[:n] - size).astype(np.int32)
+        return left, top, left + 2 * size + 1, top + 2 * size + 1
+        
+    def bounding_rect(self):
+        """Return a rect enclosing all live particles, or None."""
+        if not self.count:
+            return None
+        left, top, right, bottom = self.boxes()
+        return pygame.Rect(int(left.min()), int(top.min()),
+                           int(right.max() - left.min()), int(bottom.max() - top.min()))
@@ -1,42 +1,39 @@
 # Introduces weapon mechanics
+from collections import deque
+
 import pygame
-from pygame.sprite import Sprite
+from pygame.sprite import Group, Sprite
 
 class Beam(Sprite):
     """A class to manage beams fired from the player's ship."""
     
-    def __init__(self, settings, screen, player):
-        """Create a beam object at the player's current position."""
+    def __init__(self, settings, screen, player=None):
+        """Create a beam object, at the player's position if one is given."""
         super().__init__()
         self.screen = screen
         self.settings = settings
         
-        # Create a beam rect at (0, 0) and then set correct position
+        # Create a beam rect at (0, 0); reset() moves it into place
         self.rect = pygame.Rect(0, 0, settings.player_beam_width, 15)
+        self.y = 0.0
+        self.damage = 10
+        self.color = settings.player_beam_color
+        self.speed_factor = settings.player_beam_speed
+        
+        if player is not None:
+            self.reset(player)
+        
+    def reset(self, player):
+        """Place the beam at the player's ship and take on its weapon stats."""
         self.rect.centerx = player.rect.centerx
         self.rect.top = player.rect.top
         
         # Store the beam's position as a decimal value
         self.y = float(self.rect.y)
         
-        # Get damage from player's weapon
-        self.damage = player.weapon.damage if hasattr(player, 'weapon') else 10
-        
-        # Customize color based on weapon level
-        if hasattr(player, 'weapon'):
-            level = player.weapon.level
-            if level <= 1:
-                self.color = settings.player_beam_color  # Green by default
-            elif level == 2:
-                self.color = (0, 200, 255)  # Blue
-            elif level == 3:
-                self.color = (255, 0, 255)  # Purple
-            else:
-                self.color = (255, 215, 0)  # Gold
-        else:
-            self.color = settings.player_beam_color
-            
-        self.speed_factor = settings.player_beam_speed
+        # Get damage and color from player's weapon
+        self.damage = player.weapon.damage
+        self.color = player.weapon.beam_color
         
     def update(self):
         """Move the beam up the screen."""
@@ -49,6 +46,118 @@ class Beam(Sprite):
         """Draw the beam to the screen."""
         pygame.draw.rect(self.screen, self.color, self.rect)
 
+class BeamPool:
+    """A fixed-capacity pool that recycles Beam sprites.
+    
+    All beams travel at the same speed, so they leave the screen in the
+    order they were fired. Active beams are kept in a deque in firing order
+    and retired from the front, which avoids scanning every beam each frame.
+    Beams destroyed by a hit can die out of order; they are reclaimed from
+    the middle of the deque only when the pool runs dry.
+    """
+    
+    def __init__(self, settings, screen, capacity=None):
+        """Preallocate the pool's beams."""
+        self.capacity = settings.beam_pool_size if capacity is None else capacity
+        self.beams = Group()  # Beams currently in flight
+        self._free = [Beam(settings, screen) for _ in range(self.capacity)]
+        self._active = deque()  # Slots in use, oldest first
+        
+        # Pool statistics
+        self.high_water = 0
+        self.recycled = 0
+        
+    def _acquire(self):
+        """Take a free beam, recycling the oldest one if the pool is exhausted."""
+        if not self._free:
+            self.retire()
+        if not self._free:
+            self._reclaim()
+        if self._free:
+            return self._free.pop()
+        # Pool exhausted: reuse the oldest beam, which is the highest up
+        beam = self._active.popleft()
+        beam.kill()
+        self.recycled += 1
+        return beam
+        
+    def fire(self, player):
+        """Activate a pooled beam at the player's position; an empty pool fires nothing."""
+        if not self.capacity:
+            return None
+        beam = self._acquire()
+        beam.reset(player)
+        self.beams.add(beam)
+        self._active.append(beam)
+        if len(self.beams) > self.high_water:
+            self.high_water = len(self.beams)
+        return beam
+        
+    def active_beams(self):
+        """Return the beams in use in firing order.
+
+        Beams destroyed since the last retire() are included; they are no
+        longer alive() and return to the pool once they reach the front.
+        """
+        return list(self._active)
+        
+    def restore(self, beams):
+        """Replace the beams in use from (x, y, damage, color, alive) states.
+
+        States are given in firing order, as active_beams() returns them;
+        x and y are the beam's rect position and exact height.
+        """
+        self.clear()
+        for x, y, damage, color, alive in beams:
+            beam = self._acquire()
+            beam.rect.x = x
+            beam.y = y
+            beam.rect.y = y
+            beam.damage = damage
+            beam.color = color
+            if alive:
+                self.beams.add(beam)
+            self._active.append(beam)
+        
+    def retire(self):
+        """Return beams that were destroyed or left the screen to the pool."""
+        active = self._active
+        free = self._free
+        while active:
+            beam = active[0]
+            if beam.alive() and beam.rect.bottom > 0:
+                break
+            active.popleft()
+            beam.kill()
+            free.append(beam)
+            
+    def _reclaim(self):
+        """Return dead beams from anywhere in the deque to the pool, keeping firing order."""
+        live = deque()
+        free = self._free
+        for beam in self._active:
+            if beam.alive() and beam.rect.bottom > 0:
+                live.append(beam)
+            else:
+                beam.kill()
+                free.append(beam)
+        self._active = live
+            
+    def clear(self):
+        """Deactivate every beam."""
+        self.beams.empty()
+        self._free.extend(self._active)
+        self._active.clear()
+        
+    def stats(self):
+        """Return the pool's usage counters."""
+        return {
+            "capacity": self.capacity,
+            "active": len(self.beams),
+            "high_water": self.high_water,
+            "recycled": self.recycled,
+        }
+
 class Weapon:
     def __init__(self, settings):
         """Initialize weapon attributes."""
@@ -56,19 +165,23 @@ class Weapon:
         self.level = 1
         self.damage = 10 * self.level
         self.name = "Basic Laser"
+        self.beam_color = settings.player_beam_color  # Green by default
         
     def upgrade(self):
         """Upgrade the weapon to the next level."""
         self.level += 1
         self.damage = 10 * self.level
         
-        # Update weapon name based on level
+        # Update weapon name and beam color based on level
         if self.level == 2:
             self.name = "Dual Laser"
+            self.beam_color = (0, 200, 255)  # Blue
         elif self.level == 3:
             self.name = "Plasma Cannon"
+            self.beam_color = (255, 0, 255)  # Purple
         elif self.level >= 4:
             self.name = "Quantum Beam"
+            self.beam_color = (255, 215, 0)  # Gold
             
         return self.level
 